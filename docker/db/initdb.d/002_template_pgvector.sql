@@ -0,0 +1,3 @@
+-- Databases created later, such as Django's test database, inherit the extension from template1.
+\connect template1
+CREATE EXTENSION IF NOT EXISTS vector;
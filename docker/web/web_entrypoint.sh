@@ -1,6 +1,12 @@
 #!/bin/sh
 set -e
 
+# Samples left by this container's previous processes would be added to the new ones' counts.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 python manage.py migrate --noinput
 python manage.py collectstatic --noinput
 
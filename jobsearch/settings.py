@@ -62,7 +62,7 @@ WSGI_APPLICATION = "jobsearch.wsgi.application"
 ASGI_APPLICATION = "jobsearch.asgi.application"
 
 
-def _database_config_from_url(database_url: str) -> dict[str, str]:
+def _database_config_from_url(database_url: str) -> dict[str, object]:
     parsed = urlparse(database_url)
     if parsed.scheme not in {"postgres", "postgresql"}:
         raise ValueError("Only PostgreSQL URLs are currently supported")
@@ -73,6 +73,11 @@ def _database_config_from_url(database_url: str) -> dict[str, str]:
         "PASSWORD": parsed.password or os.getenv("POSTGRES_PASSWORD", ""),
         "HOST": parsed.hostname or os.getenv("POSTGRES_HOST", "localhost"),
         "PORT": str(parsed.port or os.getenv("POSTGRES_PORT", 5432)),
+        # Keep connections open between requests; the async search view reuses them from its thread pool.
+        "CONN_MAX_AGE": int(os.getenv("DATABASE_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": True,
+        # Bounds opening a connection, so an unreachable database fails requests and /ready/ quickly.
+        "OPTIONS": {"connect_timeout": int(os.getenv("DATABASE_CONNECT_TIMEOUT", 5))},
     }
 
 
@@ -107,16 +112,106 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 DATA_DIRECTORY = Path(os.getenv("DATA_DIRECTORY", BASE_DIR / "data")).resolve()
 EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", "768"))
 
+# ANN index on ResumeDocument.embedding. HNSW needs pgvector >= 0.5; older servers fall back to IVFFlat.
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "hnsw").lower()
+VECTOR_HNSW_M = int(os.getenv("VECTOR_HNSW_M", 16))
+VECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("VECTOR_HNSW_EF_CONSTRUCTION", 64))
+VECTOR_IVFFLAT_LISTS = int(os.getenv("VECTOR_IVFFLAT_LISTS", 100))
+# Query-time recall/speed knobs, applied with SET LOCAL around each search.
+VECTOR_HNSW_EF_SEARCH = int(os.getenv("VECTOR_HNSW_EF_SEARCH", 40))
+VECTOR_IVFFLAT_PROBES = int(os.getenv("VECTOR_IVFFLAT_PROBES", 10))
+# Metadata-filtered searches keep scanning the index until enough rows pass the filter (pgvector >= 0.8):
+# "relaxed_order" (fastest, results re-sorted afterwards), "strict_order" (HNSW only) or "off".
+VECTOR_ITERATIVE_SCAN = os.getenv("VECTOR_ITERATIVE_SCAN", "relaxed_order").lower()
+
+# Two-phase search over compressed embeddings (pgvector >= 0.7): "half" runs the ANN pass on a halfvec index of
+# the embedding, "binary" on a Hamming index of its sign bits; EMBEDDING_RERANK_FACTOR x the requested rows are
+# then re-ranked by exact cosine distance. "full" searches the float32 embedding directly.
+EMBEDDING_PRECISION = os.getenv("EMBEDDING_PRECISION", "full").lower()
+EMBEDDING_RERANK_FACTOR = int(os.getenv("EMBEDDING_RERANK_FACTOR", 4))
+# Re-embedding with another model (EmbeddingModel): resumes per backfill chunk task, and how often search
+# processes re-read which model is active.
+EMBEDDING_BACKFILL_CHUNK_SIZE = int(os.getenv("EMBEDDING_BACKFILL_CHUNK_SIZE", 200))
+EMBEDDING_MODEL_REFRESH_SECONDS = float(os.getenv("EMBEDDING_MODEL_REFRESH_SECONDS", 5))
+# "local" answers unfiltered vector searches from an in-process NumPy index (pipeline.local_index) instead of
+# pgvector. It maps the snapshot in LOCAL_INDEX_PATH when one was built (else loads from the database) and
+# polls for changed resumes every LOCAL_INDEX_REFRESH_SECONDS.
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "pgvector").lower()
+LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "")
+LOCAL_INDEX_DTYPE = os.getenv("LOCAL_INDEX_DTYPE", "float32").lower()
+LOCAL_INDEX_REFRESH_SECONDS = float(os.getenv("LOCAL_INDEX_REFRESH_SECONDS", 5))
+
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
 CELERY_TASK_DEFAULT_QUEUE = os.getenv("CELERY_TASK_DEFAULT_QUEUE", "resume_ingestion")
 CELERY_TASK_TIME_LIMIT = int(os.getenv("CELERY_TASK_TIME_LIMIT", 600))
+# Text extraction runs in a process pool sized to the available cores; each file gets a hard timeout.
+_available_cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+INGESTION_EXTRACT_WORKERS = int(os.getenv("INGESTION_EXTRACT_WORKERS", _available_cores))
+INGESTION_EXTRACT_TIMEOUT = int(os.getenv("INGESTION_EXTRACT_TIMEOUT", 120))
+# Text extracted from PDFs, cached on disk by file hash (pipeline.text_cache) so unchanged bytes are never
+# parsed twice; least recently read entries are evicted past TEXT_CACHE_MAX_BYTES of compressed text.
+TEXT_CACHE_ENABLED = os.getenv("TEXT_CACHE_ENABLED", "True").lower() in {"1", "true", "yes"}
+TEXT_CACHE_PATH = Path(os.getenv("TEXT_CACHE_PATH", BASE_DIR / "cache" / "extracted_text.sqlite3"))
+TEXT_CACHE_MAX_BYTES = int(os.getenv("TEXT_CACHE_MAX_BYTES", 512 * 1024 * 1024))
+# Rows per bulk INSERT ... ON CONFLICT issued by the ingestion writer.
+INGESTION_DB_BATCH_SIZE = int(os.getenv("INGESTION_DB_BATCH_SIZE", 500))
+# Passage-level embeddings stored as ResumeChunk rows: windows of N words overlapping by M words.
+RESUME_CHUNKS_ENABLED = os.getenv("RESUME_CHUNKS_ENABLED", "True").lower() in {"1", "true", "yes"}
+RESUME_CHUNK_WORDS = int(os.getenv("RESUME_CHUNK_WORDS", 200))
+RESUME_CHUNK_OVERLAP_WORDS = int(os.getenv("RESUME_CHUNK_OVERLAP_WORDS", 50))
+# Files per chunk task when ingestion is fanned out across Celery workers.
+INGESTION_CHUNK_SIZE = int(os.getenv("INGESTION_CHUNK_SIZE", 50))
 
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://ollama:11434")
 OLLAMA_EMBED_MODEL = os.getenv("OLLAMA_EMBED_MODEL", "nomic-embed-text")
-OLLAMA_REQUEST_TIMEOUT = int(os.getenv("OLLAMA_REQUEST_TIMEOUT", 180))
+# Per-attempt timeout of an ingestion embedding request; failed attempts are retried (pipeline.embedding_client).
+OLLAMA_REQUEST_TIMEOUT = int(os.getenv("OLLAMA_REQUEST_TIMEOUT", 60))
 EMBEDDINGS_ENDPOINT = os.getenv("EMBEDDINGS_ENDPOINT", "/api/embeddings")
 
+# Async search path (/search/async/): keep-alive connections to Ollama and threads running ORM queries.
+OLLAMA_MAX_CONNECTIONS = int(os.getenv("OLLAMA_MAX_CONNECTIONS", 100))
+SEARCH_DB_THREADS = int(os.getenv("SEARCH_DB_THREADS", 16))
+
+# Search pagination: page sizes for the JSON responses, and the row cap for NDJSON streaming exports.
+SEARCH_DEFAULT_PAGE_SIZE = int(os.getenv("SEARCH_DEFAULT_PAGE_SIZE", 10))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", 100))
+SEARCH_EXPORT_MAX_ROWS = int(os.getenv("SEARCH_EXPORT_MAX_ROWS", 10000))
+# Queries accepted by one /search/batch/ request.
+SEARCH_BATCH_MAX_QUERIES = int(os.getenv("SEARCH_BATCH_MAX_QUERIES", 500))
+
+# Query embedding cache: in-process LRU backed by the shared Redis instance.
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://redis:6379/1")
+CACHE_REDIS_TIMEOUT = float(os.getenv("CACHE_REDIS_TIMEOUT", 0.25))
+CACHE_REDIS_RETRY_SECONDS = int(os.getenv("CACHE_REDIS_RETRY_SECONDS", 30))
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "True").lower() in {"1", "true", "yes"}
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", 1024))
+EMBEDDING_CACHE_TTL = int(os.getenv("EMBEDDING_CACHE_TTL", 60 * 60 * 24))
+# Whole search pages cached in Redis, invalidated by a corpus version bumped on every ingestion write.
+SEARCH_RESULT_CACHE_ENABLED = os.getenv("SEARCH_RESULT_CACHE_ENABLED", "True").lower() in {"1", "true", "yes"}
+SEARCH_RESULT_CACHE_TTL = int(os.getenv("SEARCH_RESULT_CACHE_TTL", 300))
+# Ingestion embeds through the multi-input endpoint, keeping several batches in flight at once.
+EMBED_BATCH_ENDPOINT = os.getenv("EMBED_BATCH_ENDPOINT", "/api/embed")
+OLLAMA_EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", 16))
+OLLAMA_EMBED_CONCURRENCY = int(os.getenv("OLLAMA_EMBED_CONCURRENCY", 4))
+# Embedding client (pipeline.embedding_client). Concurrency adapts below OLLAMA_EMBED_CONCURRENCY (ingestion) and
+# OLLAMA_MAX_CONNECTIONS (search), halving once latency exceeds OLLAMA_LATENCY_TOLERANCE x its recent best.
+# Search gets a short timeout and few attempts; ingestion retries with jittered exponential backoff. After
+# OLLAMA_BREAKER_THRESHOLD consecutive failures requests stop for OLLAMA_BREAKER_RESET_SECONDS.
+OLLAMA_SEARCH_TIMEOUT = float(os.getenv("OLLAMA_SEARCH_TIMEOUT", 10))
+OLLAMA_SEARCH_ATTEMPTS = int(os.getenv("OLLAMA_SEARCH_ATTEMPTS", 2))
+OLLAMA_RETRY_ATTEMPTS = int(os.getenv("OLLAMA_RETRY_ATTEMPTS", 5))
+OLLAMA_RETRY_BASE_SECONDS = float(os.getenv("OLLAMA_RETRY_BASE_SECONDS", 0.5))
+OLLAMA_LATENCY_TOLERANCE = float(os.getenv("OLLAMA_LATENCY_TOLERANCE", 2.0))
+OLLAMA_BREAKER_THRESHOLD = int(os.getenv("OLLAMA_BREAKER_THRESHOLD", 5))
+OLLAMA_BREAKER_RESET_SECONDS = float(os.getenv("OLLAMA_BREAKER_RESET_SECONDS", 10))
+
+# Readiness endpoint (/ready/): per-dependency probe timeout in seconds.
+READINESS_TIMEOUT = float(os.getenv("READINESS_TIMEOUT", 2.0))
+# Directory whose multiprocess sample files /metrics/ merges, searched recursively. Each container writes to
+# its own PROMETHEUS_MULTIPROC_DIR below it, since process ids repeat across containers.
+METRICS_MULTIPROC_ROOT = os.getenv("METRICS_MULTIPROC_ROOT") or os.getenv("PROMETHEUS_MULTIPROC_DIR", "")
+
 LOGGING = DEFAULT_LOGGING
 LOGGING['handlers']['console'] = {
     'class': 'logging.StreamHandler',
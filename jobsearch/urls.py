@@ -1,18 +1,35 @@
 from __future__ import annotations
 
 from django.contrib import admin
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 from django.urls import path
 
-from pipeline.views import CandidateSearchView
+from pipeline.cache import cache_stats
+from pipeline.metrics import probe_dependencies, render_metrics
+from pipeline.views import AsyncCandidateSearchView, BatchCandidateSearchView, CandidateSearchView
 
 
 def healthcheck(_request):
-    return JsonResponse({"status": "ok"})
+    return JsonResponse({"status": "ok", "embedding_cache": cache_stats()})
+
+
+def readiness(_request):
+    checks = probe_dependencies()
+    ready = all(check["ok"] for check in checks.values())
+    return JsonResponse({"status": "ok" if ready else "unavailable", "checks": checks}, status=200 if ready else 503)
+
+
+def metrics(_request):
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("health/", healthcheck, name="healthcheck"),
+    path("ready/", readiness, name="readiness"),
+    path("metrics/", metrics, name="metrics"),
     path("search/", CandidateSearchView.as_view(), name="candidate-search"),
+    path("search/async/", AsyncCandidateSearchView.as_view(), name="candidate-search-async"),
+    path("search/batch/", BatchCandidateSearchView.as_view(), name="candidate-search-batch"),
 ]
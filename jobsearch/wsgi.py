@@ -3,8 +3,15 @@ from __future__ import annotations
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "jobsearch.settings")
 
 application = get_wsgi_application()
+
+if settings.SEARCH_BACKEND == "local":
+    # Load the in-process vector index before the first request instead of during it.
+    from pipeline.local_index import get_local_index
+
+    get_local_index()
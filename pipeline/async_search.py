@@ -0,0 +1,72 @@
+"""
+Async building blocks for the search endpoint: a shared keep-alive httpx client for Ollama and a
+bounded thread pool for ORM queries, so one uvicorn process can hold many searches in flight.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+
+import httpx
+from django.conf import settings
+from django.db import close_old_connections
+
+from pipeline.cache import acached_embedding
+from pipeline.embedding_client import get_embedding_client
+
+_client: httpx.AsyncClient | None = None
+_client_loop: asyncio.AbstractEventLoop | None = None
+_db_executor = ThreadPoolExecutor(max_workers=settings.SEARCH_DB_THREADS, thread_name_prefix="search-db")
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Client shared by every request on the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=settings.OLLAMA_BASE_URL.rstrip("/"),
+            timeout=settings.OLLAMA_SEARCH_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_MAX_CONNECTIONS,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def _request_embedding(text: str, model: str | None = None) -> list[float]:
+    payload = {"model": model or settings.OLLAMA_EMBED_MODEL, "prompt": text}
+
+    async def send(timeout: float):
+        response = await get_async_client().post(settings.EMBEDDINGS_ENDPOINT, json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("embedding")
+
+    # Shares the breaker with the sync paths and fails fast the same way.
+    embedding = await get_embedding_client("search_async").acall(send)
+    if not embedding:
+        raise ValueError(f"No embedding returned from Ollama for model {payload['model']}")
+    return [float(value) for value in embedding]
+
+
+async def agenerate_embedding(text: str, model: str | None = None) -> list[float]:
+    return await acached_embedding(text, partial(_request_embedding, model=model), model)
+
+
+def _run_with_connection(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    # Pool threads outlive requests, so apply CONN_MAX_AGE/health checks as a request cycle would.
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run_db(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking ORM call on the search DB pool without tying up the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, partial(_run_with_connection, func, *args, **kwargs))
@@ -0,0 +1,191 @@
+"""
+Helpers for the benchmark commands: a deterministic local stand-in for the Ollama embedding model
+(also served over HTTP as a mock Ollama), synthetic resume corpora, and latency statistics.
+
+The stand-in hashes each word onto a signed dimension and L2-normalizes the result, so texts that
+share vocabulary land close together and search results stay meaningful without a model host.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+from django.conf import settings
+
+from pipeline.models import ResumeDocument
+
+SYNTHETIC_PREFIX = "synthetic-"
+_WORD_PATTERN = re.compile(r"[a-z0-9+#]+")
+
+TITLES = [
+    "Software Engineer", "Data Scientist", "Backend Developer", "Frontend Developer", "DevOps Engineer",
+    "Product Manager", "QA Analyst", "Machine Learning Engineer", "Database Administrator", "Security Analyst",
+    "Accountant", "Sales Manager", "HR Specialist", "Registered Nurse", "Teacher", "Project Manager",
+]
+SKILLS = [
+    "python", "django", "postgres", "celery", "redis", "java", "spring", "kotlin", "javascript", "react",
+    "typescript", "node", "aws", "gcp", "azure", "docker", "kubernetes", "terraform", "sql", "spark",
+    "pandas", "pytorch", "tensorflow", "excel", "salesforce", "recruiting", "payroll", "nursing", "curriculum",
+    "budgeting", "agile", "scrum", "linux", "go", "rust", "c++", "tableau", "airflow", "kafka", "graphql",
+]
+LOCATIONS = ["New York", "Chicago", "Austin", "Seattle", "Remote", "Boston", "Denver", "Atlanta"]
+SENIORITY = ["junior", "mid", "senior", "lead", "principal"]
+
+DEFAULT_QUERIES = [
+    "senior python developer with django and postgres",
+    "machine learning engineer pytorch spark",
+    "frontend react typescript engineer",
+    "devops kubernetes terraform aws",
+    "data scientist pandas sql tableau",
+    "java spring backend microservices kafka",
+    "registered nurse with patient care experience",
+    "teacher curriculum development",
+    "accountant payroll budgeting excel",
+    "sales manager salesforce pipeline",
+    "5+ years python, celery, redis, docker",
+    "security analyst linux incident response",
+    "project manager agile scrum delivery",
+    "go rust systems programming",
+    "database administrator postgres tuning",
+    "graphql node typescript api",
+    "airflow spark data pipelines",
+    "hr specialist recruiting onboarding",
+    "cloud engineer gcp azure",
+    "qa analyst test automation",
+]
+
+
+def fake_embedding(text: str, dimensions: int | None = None) -> list[float]:
+    """Deterministic bag-of-words embedding used instead of Ollama in benchmarks."""
+    dimensions = dimensions or settings.EMBEDDING_DIMENSION
+    vector = [0.0] * dimensions
+    for word in _WORD_PATTERN.findall(text.lower()):
+        digest = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "big")
+        vector[digest % dimensions] += 1.0 if (digest >> 32) & 1 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector))
+    if not norm:
+        vector[0] = 1.0
+        return vector
+    return [value / norm for value in vector]
+
+
+class _MockEmbeddingHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        if self.path == settings.EMBED_BATCH_ENDPOINT:
+            texts = body.get("input") or []
+            texts = [texts] if isinstance(texts, str) else texts
+            payload = {"model": body.get("model"), "embeddings": [fake_embedding(text) for text in texts]}
+        else:
+            payload = {"embedding": fake_embedding(body.get("prompt") or "")}
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockEmbeddingServer:
+    """
+    Local HTTP server answering Ollama's embedding endpoints with fake_embedding vectors, after an
+    optional fixed delay per request to emulate model time. Use as a context manager; `base_url`
+    is what OLLAMA_BASE_URL should point to.
+    """
+
+    def __init__(self, latency_ms: float = 0.0):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _MockEmbeddingHandler)
+        self._server.daemon_threads = True
+        self._server.latency = latency_ms / 1000
+        self.base_url = f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self) -> "MockEmbeddingServer":
+        threading.Thread(target=self._server.serve_forever, name="mock-embeddings", daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def synthetic_resume(index: int) -> dict[str, object]:
+    rng = random.Random(index)
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, k=rng.randint(4, 9))
+    years = rng.randint(1, 20)
+    location = rng.choice(LOCATIONS)
+    seniority = rng.choice(SENIORITY)
+    paragraphs = [
+        f"{title.upper()}",
+        f"Summary\n{seniority.title()} {title.lower()} with {years} years of experience based in {location}.",
+        "Skills\n" + ", ".join(skills),
+    ]
+    for job in range(rng.randint(2, 5)):
+        used = rng.sample(skills, k=min(3, len(skills)))
+        paragraphs.append(
+            f"Experience\n{rng.choice(TITLES)} at Company {rng.randint(1, 5000)} for {rng.randint(1, 6)} years, "
+            f"delivering projects with {', '.join(used)} and mentoring a team of {rng.randint(2, 12)}."
+        )
+    return {
+        "file_name": f"{SYNTHETIC_PREFIX}{index:07d}.txt",
+        "content": "\n".join(paragraphs),
+        "metadata": {"source": "synthetic", "skills": skills, "location": location, "seniority": seniority},
+    }
+
+
+def synthetic_records(start: int, stop: int, with_passages: bool = False) -> Iterator[dict[str, object]]:
+    from pipeline.tasks import chunk_text
+
+    for index in range(start, stop):
+        record = synthetic_resume(index)
+        record["embedding"] = fake_embedding(record["content"])
+        if with_passages:
+            record["chunks"] = [(passage, fake_embedding(passage)) for passage in chunk_text(record["content"])]
+        yield record
+
+
+def synthetic_count() -> int:
+    return ResumeDocument.objects.filter(file_name__startswith=SYNTHETIC_PREFIX).count()
+
+
+def delete_synthetic_corpus() -> int:
+    # Count only the resumes; the total also includes their cascaded embeddings and chunks.
+    _, deleted = ResumeDocument.objects.filter(file_name__startswith=SYNTHETIC_PREFIX).delete()
+    return deleted.get(ResumeDocument._meta.label, 0)
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    position = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[position]
+
+
+def load_queries(path: str | None) -> list[str]:
+    """Read one query per line; JSON lines use their "query" (or "title") field."""
+    if not path:
+        return list(DEFAULT_QUERIES)
+    queries = []
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                line = (record.get("query") or record.get("title") or "").strip()
+            if line:
+                queries.append(line)
+    return queries
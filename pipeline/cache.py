@@ -0,0 +1,342 @@
+"""
+Two-tier cache for query embeddings: a per-process LRU in front of the shared Redis instance.
+
+Keys include the embedding model name, so changing OLLAMA_EMBED_MODEL never serves vectors from
+the previous model. Redis is optional at runtime: when it is unreachable the cache degrades to the
+local tier and retries Redis after CACHE_REDIS_RETRY_SECONDS.
+
+Whole search results are cached in Redis only, tagged with the corpus version they were computed
+at. Every committed write to the corpus increments that version, so a lookup (one MGET of the
+entry and the current version) never returns results from before the write.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_redis_client: redis.Redis | None = None
+_async_redis_client: redis.asyncio.Redis | None = None
+_redis_retry_at = 0.0
+_stats_lock = threading.Lock()
+_stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "redis_errors": 0, "result_hits": 0, "result_misses": 0}
+_embedding_cache = LRUCache(settings.EMBEDDING_CACHE_SIZE, settings.EMBEDDING_CACHE_TTL)
+CORPUS_VERSION_KEY = "search:corpus_version"
+
+
+def _count(counter: str) -> None:
+    with _stats_lock:
+        _stats[counter] += 1
+
+
+def get_redis(ignore_backoff: bool = False) -> redis.Redis | None:
+    """Shared Redis client, or None while a previous failure is backing off."""
+    global _redis_client
+    if time.monotonic() < _redis_retry_at and not ignore_backoff:
+        return None
+    if _redis_client is None:
+        _redis_client = redis.Redis.from_url(
+            settings.CACHE_REDIS_URL,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+    return _redis_client
+
+
+def get_async_redis() -> redis.asyncio.Redis | None:
+    global _async_redis_client
+    if time.monotonic() < _redis_retry_at:
+        return None
+    if _async_redis_client is None:
+        _async_redis_client = redis.asyncio.Redis.from_url(
+            settings.CACHE_REDIS_URL,
+            socket_timeout=settings.CACHE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.CACHE_REDIS_TIMEOUT,
+        )
+    return _async_redis_client
+
+
+def _redis_failed(exc: Exception) -> None:
+    global _redis_retry_at
+    _count("redis_errors")
+    _redis_retry_at = time.monotonic() + settings.CACHE_REDIS_RETRY_SECONDS
+    logger.warning("Redis cache unavailable, using local cache only: %s", exc)
+
+
+def normalize_query(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def embedding_cache_key(text: str, model: str) -> str:
+    digest = hashlib.sha256(normalize_query(text).encode("utf-8")).hexdigest()
+    return f"embedding:{model}:{digest}"
+
+
+def cached_embedding(text: str, compute: Callable[[str], list[float]], model: str | None = None) -> list[float]:
+    """
+    Return the `model` (default OLLAMA_EMBED_MODEL) embedding for `text`, calling `compute` only
+    when neither cache tier has it.
+    """
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return compute(text)
+
+    key = embedding_cache_key(text, model or settings.OLLAMA_EMBED_MODEL)
+    embedding = _embedding_cache.get(key)
+    if embedding is not None:
+        _count("local_hits")
+        return embedding
+
+    client = get_redis()
+    if client is not None:
+        try:
+            raw = client.get(key)
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+            raw = None
+        if raw:
+            embedding = array("f", raw).tolist()
+            _embedding_cache.set(key, embedding)
+            _count("redis_hits")
+            return embedding
+
+    _count("misses")
+    embedding = compute(text)
+    _embedding_cache.set(key, embedding)
+    client = get_redis()
+    if client is not None:
+        try:
+            client.set(key, array("f", embedding).tobytes(), ex=settings.EMBEDDING_CACHE_TTL)
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+    return embedding
+
+
+def cached_embeddings(
+    texts: list[str], compute: Callable[[list[str]], list[list[float]]], model: str | None = None
+) -> list[list[float]]:
+    """
+    Embeddings for several texts, in order. Both tiers are checked first (Redis with one MGET), and
+    the remaining texts go to a single `compute` call.
+    """
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return compute(texts)
+
+    keys = [embedding_cache_key(text, model or settings.OLLAMA_EMBED_MODEL) for text in texts]
+    embeddings: list[list[float] | None] = [_embedding_cache.get(key) for key in keys]
+    for embedding in embeddings:
+        if embedding is not None:
+            _count("local_hits")
+    missing = [position for position, embedding in enumerate(embeddings) if embedding is None]
+    client = get_redis()
+    if missing and client is not None:
+        try:
+            raws = client.mget([keys[position] for position in missing])
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+            raws = [None] * len(missing)
+        for position, raw in zip(missing, raws):
+            if raw:
+                embeddings[position] = array("f", raw).tolist()
+                _embedding_cache.set(keys[position], embeddings[position])
+                _count("redis_hits")
+        missing = [position for position in missing if embeddings[position] is None]
+
+    # Identical texts are embedded once.
+    unique = list(dict.fromkeys(keys[position] for position in missing))
+    if unique:
+        texts_by_key = {keys[position]: texts[position] for position in missing}
+        computed = dict(zip(unique, compute([texts_by_key[key] for key in unique])))
+        for key, embedding in computed.items():
+            _count("misses")
+            _embedding_cache.set(key, embedding)
+        for position in missing:
+            embeddings[position] = computed[keys[position]]
+        client = get_redis()
+        if client is not None:
+            try:
+                with client.pipeline(transaction=False) as pipe:
+                    for key, embedding in computed.items():
+                        pipe.set(key, array("f", embedding).tobytes(), ex=settings.EMBEDDING_CACHE_TTL)
+                    pipe.execute()
+            except redis.RedisError as exc:
+                _redis_failed(exc)
+    return embeddings
+
+
+async def acached_embedding(
+    text: str, compute: Callable[[str], Awaitable[list[float]]], model: str | None = None
+) -> list[float]:
+    """Async counterpart of cached_embedding for the async search view."""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return await compute(text)
+
+    key = embedding_cache_key(text, model or settings.OLLAMA_EMBED_MODEL)
+    embedding = _embedding_cache.get(key)
+    if embedding is not None:
+        _count("local_hits")
+        return embedding
+
+    client = get_async_redis()
+    if client is not None:
+        try:
+            raw = await client.get(key)
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+            raw = None
+        if raw:
+            embedding = array("f", raw).tolist()
+            _embedding_cache.set(key, embedding)
+            _count("redis_hits")
+            return embedding
+
+    _count("misses")
+    embedding = await compute(text)
+    _embedding_cache.set(key, embedding)
+    client = get_async_redis()
+    if client is not None:
+        try:
+            await client.set(key, array("f", embedding).tobytes(), ex=settings.EMBEDDING_CACHE_TTL)
+        except redis.RedisError as exc:
+            _redis_failed(exc)
+    return embedding
+
+
+def bump_corpus_version() -> None:
+    """
+    Invalidate every cached search result. Register it with transaction.on_commit after writes that
+    change what searches return, so no reader can cache pre-commit results under the new version.
+    """
+    # Tried even while reads back off: a missed bump would leave other processes serving stale pages.
+    client = get_redis(ignore_backoff=True)
+    try:
+        client.incr(CORPUS_VERSION_KEY)
+    except redis.RedisError as exc:
+        _redis_failed(exc)
+
+
+def result_cache_key(method: str, query: str, params: dict[str, Any]) -> str:
+    """Key for one page of results; `params` holds everything else that shapes the page."""
+    raw = json.dumps({"query": normalize_query(query), "params": params}, sort_keys=True, cls=DjangoJSONEncoder)
+    return f"search:{method}:{hashlib.sha256(raw.encode('utf-8')).hexdigest()}"
+
+
+def _cached_entry(raw: bytes | None, version: bytes | None) -> list[dict[str, Any]] | None:
+    if raw:
+        entry = json.loads(raw)
+        if entry["version"] == int(version or 0):
+            _count("result_hits")
+            return entry["results"]
+    _count("result_misses")
+    return None
+
+
+def _result_entry(results: list[dict[str, Any]], version: bytes | None) -> str:
+    return json.dumps({"version": int(version or 0), "results": results}, cls=DjangoJSONEncoder)
+
+
+def cached_results(key: str, compute: Callable[[], list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    """
+    Search results for `key` from Redis, or from `compute` (stored for SEARCH_RESULT_CACHE_TTL).
+    A miss is stored under the version read before computing, so a write that lands meanwhile
+    already makes it stale.
+    """
+    client = get_redis() if settings.SEARCH_RESULT_CACHE_ENABLED else None
+    if client is None:
+        return compute()
+    try:
+        raw, version = client.mget(key, CORPUS_VERSION_KEY)
+    except redis.RedisError as exc:
+        _redis_failed(exc)
+        return compute()
+    results = _cached_entry(raw, version)
+    if results is not None:
+        return results
+
+    results = compute()
+    try:
+        client.set(key, _result_entry(results, version), ex=settings.SEARCH_RESULT_CACHE_TTL)
+    except redis.RedisError as exc:
+        _redis_failed(exc)
+    return results
+
+
+async def acached_results(key: str, compute: Callable[[], Awaitable[list[dict[str, Any]]]]) -> list[dict[str, Any]]:
+    """Async counterpart of cached_results for the async search view."""
+    client = get_async_redis() if settings.SEARCH_RESULT_CACHE_ENABLED else None
+    if client is None:
+        return await compute()
+    try:
+        raw, version = await client.mget(key, CORPUS_VERSION_KEY)
+    except redis.RedisError as exc:
+        _redis_failed(exc)
+        return await compute()
+    results = _cached_entry(raw, version)
+    if results is not None:
+        return results
+
+    results = await compute()
+    try:
+        await client.set(key, _result_entry(results, version), ex=settings.SEARCH_RESULT_CACHE_TTL)
+    except redis.RedisError as exc:
+        _redis_failed(exc)
+    return results
+
+
+def cache_stats() -> dict[str, Any]:
+    with _stats_lock:
+        stats: dict[str, Any] = dict(_stats)
+    lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+    stats["hit_rate"] = (stats["local_hits"] + stats["redis_hits"]) / lookups if lookups else 0.0
+    stats["local_size"] = len(_embedding_cache)
+    return stats
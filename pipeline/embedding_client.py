@@ -0,0 +1,315 @@
+"""
+The one path to Ollama's embedding endpoints, shared by ingestion and search: pooled connections, an
+adaptive concurrency limit, jittered retries and a circuit breaker per process.
+
+The limit follows AIMD on observed latency. It grows by one request per round trip while latency
+stays within OLLAMA_LATENCY_TOLERANCE x the best recent latency. It halves when latency rises past
+that, or on a timeout or overload response. After OLLAMA_BREAKER_THRESHOLD consecutive failures the
+breaker opens. Requests are then refused for OLLAMA_BREAKER_RESET_SECONDS, after which a single trial
+request decides whether it closes again.
+
+The two profiles react to overload differently. Search fails fast: a query that finds the limit
+reached or the breaker open raises EmbeddingUnavailable at once, and the views answer 503. Ingestion
+applies backpressure: it waits for a slot or for the breaker to allow a trial, and gives up only
+after OLLAMA_RETRY_ATTEMPTS attempts.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from pipeline.metrics import EMBEDDING_REQUESTS, EMBEDDING_SECONDS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# The limit is cut at most once per this many seconds, so one slow burst halves it once rather than
+# once per request in flight.
+DECREASE_INTERVAL = 1.0
+# Share of a slower observation folded into the latency baseline; faster ones replace it outright.
+BASELINE_SMOOTHING = 0.05
+# Upper bound of a single jittered retry delay, in seconds.
+RETRY_MAX_DELAY = 30.0
+
+
+class EmbeddingUnavailable(Exception):
+    """Ollama is overloaded or failing; `retry_after` is a hint in seconds for the caller."""
+
+    def __init__(self, message: str, retry_after: float = 1.0):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdaptiveLimit:
+    """Concurrency limit adjusted by additive increase and multiplicative decrease on latency."""
+
+    def __init__(self, maximum: int, minimum: int = 1):
+        self.maximum = max(minimum, maximum)
+        self.minimum = minimum
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._baseline: float | None = None
+        self._decreased_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self, block: bool) -> bool:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                if not block:
+                    return False
+                self._condition.wait()
+            self.in_flight += 1
+            return True
+
+    def cancel(self) -> None:
+        """Free a slot whose request was never sent."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def release(self, latency: float | None) -> None:
+        """Free a slot; `latency` is None when the request timed out or Ollama reported overload."""
+        with self._condition:
+            self.in_flight -= 1
+            slow = latency is None or (
+                self._baseline is not None and latency > self._baseline * settings.OLLAMA_LATENCY_TOLERANCE
+            )
+            now = time.monotonic()
+            if slow:
+                if now - self._decreased_at >= DECREASE_INTERVAL:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._decreased_at = now
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            if latency is not None:
+                if self._baseline is None or latency < self._baseline:
+                    self._baseline = latency
+                else:
+                    self._baseline += (latency - self._baseline) * BASELINE_SMOOTHING
+            self._condition.notify_all()
+
+
+class CircuitBreaker:
+    def __init__(self):
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """Seconds until a request may be sent; 0 means send now (and claims the half-open trial)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            remaining = self._opened_at + settings.OLLAMA_BREAKER_RESET_SECONDS - time.monotonic()
+            if remaining > 0:
+                return remaining
+            if self._trial:
+                # Another request is probing whether Ollama recovered.
+                return min(1.0, settings.OLLAMA_BREAKER_RESET_SECONDS)
+            self._trial = True
+            return 0.0
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Ollama recovered; embedding circuit closed")
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            # A failed trial reopens at once; a closed breaker opens after the threshold.
+            if self._trial or (self._opened_at is None and self.failures >= settings.OLLAMA_BREAKER_THRESHOLD):
+                if not self._trial:
+                    logger.warning("Ollama failed %s requests in a row; embedding circuit open", self.failures)
+                self._opened_at = time.monotonic()
+            self._trial = False
+
+
+@dataclass(frozen=True)
+class Profile:
+    source: str
+    timeout: float
+    attempts: int
+    # Wait for a slot or for the breaker (backpressure) instead of raising EmbeddingUnavailable.
+    block: bool
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout, httpx.TransportError)):
+        return True
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def _is_overload(exc: Exception) -> bool:
+    if isinstance(exc, (requests.Timeout, httpx.TimeoutException)):
+        return True
+    return getattr(getattr(exc, "response", None), "status_code", None) in {429, 503}
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter: concurrent callers that failed together do not retry in lockstep.
+    return random.uniform(0, min(RETRY_MAX_DELAY, settings.OLLAMA_RETRY_BASE_SECONDS * 2**attempt))
+
+
+class EmbeddingClient:
+    def __init__(self, profile: Profile, limit: AdaptiveLimit, breaker: CircuitBreaker):
+        self.profile = profile
+        self.limit = limit
+        self.breaker = breaker
+        self._session: requests.Session | None = None
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.limit.maximum)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def _admit(self) -> None:
+        """Take a concurrency slot, then pass the breaker; waits for both or, failing fast, refuses."""
+        if not self.limit.acquire(self.profile.block):
+            EMBEDDING_REQUESTS.labels(self.profile.source, "rejected").inc()
+            raise EmbeddingUnavailable("Embedding service is at its concurrency limit")
+        # The slot is taken first: a refused request must not hold the breaker's half-open trial.
+        while (wait := self.breaker.wait_time()) > 0:
+            if not self.profile.block:
+                self.limit.cancel()
+                EMBEDDING_REQUESTS.labels(self.profile.source, "rejected").inc()
+                raise EmbeddingUnavailable("Embedding service is failing; circuit open", retry_after=wait)
+            time.sleep(wait)
+
+    def _settle(self, started: float, exc: Exception | None) -> None:
+        if exc is None:
+            self.limit.release(time.perf_counter() - started)
+            self.breaker.record_success()
+        elif _is_transient(exc):
+            self.limit.release(None if _is_overload(exc) else time.perf_counter() - started)
+            self.breaker.record_failure()
+        else:
+            # The request reached a healthy Ollama that rejected it (bad model name, malformed reply).
+            self.limit.release(time.perf_counter() - started)
+            self.breaker.record_success()
+
+    def _check_retry(self, exc: Exception, attempt: int) -> None:
+        """Count a failed attempt, raising unless it is transient and attempts remain."""
+        if not _is_transient(exc):
+            EMBEDDING_REQUESTS.labels(self.profile.source, "error").inc()
+            raise exc
+        if attempt + 1 >= self.profile.attempts:
+            EMBEDDING_REQUESTS.labels(self.profile.source, "error").inc()
+            raise EmbeddingUnavailable(f"Embedding request failed after {attempt + 1} attempts: {exc}") from exc
+        EMBEDDING_REQUESTS.labels(self.profile.source, "retry").inc()
+
+    def call(self, send: Callable[[float], T]) -> T:
+        """Run `send(timeout)` under the limit and breaker, retrying transient failures with jitter."""
+        attempt = 0
+        while True:
+            self._admit()
+            started = time.perf_counter()
+            try:
+                with EMBEDDING_SECONDS.labels(self.profile.source).time():
+                    result = send(self.profile.timeout)
+            except Exception as exc:
+                self._settle(started, exc)
+                self._check_retry(exc, attempt)
+                time.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+            self._settle(started, None)
+            EMBEDDING_REQUESTS.labels(self.profile.source, "ok").inc()
+            return result
+
+    async def acall(self, send: Callable[[float], Awaitable[T]]) -> T:
+        """`call` for coroutines; only for fail-fast profiles, since waiting would block the event loop."""
+        attempt = 0
+        while True:
+            self._admit()
+            started = time.perf_counter()
+            try:
+                with EMBEDDING_SECONDS.labels(self.profile.source).time():
+                    result = await send(self.profile.timeout)
+            except Exception as exc:
+                self._settle(started, exc)
+                self._check_retry(exc, attempt)
+                await asyncio.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+            self._settle(started, None)
+            EMBEDDING_REQUESTS.labels(self.profile.source, "ok").inc()
+            return result
+
+    def embed(self, texts: list[str], model: str | None = None) -> list[list[float]]:
+        """Embed a batch with one request to the multi-input endpoint; vectors are not validated here."""
+        url = f"{settings.OLLAMA_BASE_URL.rstrip('/')}{settings.EMBED_BATCH_ENDPOINT}"
+        payload = {"model": model or settings.OLLAMA_EMBED_MODEL, "input": texts}
+
+        def send(timeout: float) -> list[list[float]]:
+            response = self.session.post(url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response.json().get("embeddings") or []
+
+        embeddings = self.call(send)
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Ollama returned {len(embeddings)} embeddings for a batch of {len(texts)} inputs")
+        return embeddings
+
+    def embed_one(self, text: str, model: str | None = None) -> list[float]:
+        url = f"{settings.OLLAMA_BASE_URL.rstrip('/')}{settings.EMBEDDINGS_ENDPOINT}"
+        payload = {"model": model or settings.OLLAMA_EMBED_MODEL, "prompt": text}
+
+        def send(timeout: float) -> list[float]:
+            response = self.session.post(url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response.json().get("embedding")
+
+        embedding = self.call(send)
+        if not embedding:
+            raise ValueError(f"No embedding returned from Ollama for model {payload['model']}")
+        return embedding
+
+
+_breaker = CircuitBreaker()
+_clients: dict[str, EmbeddingClient] = {}
+_clients_lock = threading.Lock()
+
+
+def _profile(source: str) -> tuple[Profile, int]:
+    if source == "ingestion":
+        profile = Profile(source, settings.OLLAMA_REQUEST_TIMEOUT, settings.OLLAMA_RETRY_ATTEMPTS, block=True)
+        return profile, settings.OLLAMA_EMBED_CONCURRENCY
+    profile = Profile(source, settings.OLLAMA_SEARCH_TIMEOUT, settings.OLLAMA_SEARCH_ATTEMPTS, block=False)
+    return profile, settings.OLLAMA_MAX_CONNECTIONS
+
+
+def get_embedding_client(source: str) -> EmbeddingClient:
+    """
+    The process's client for `source`: "ingestion" applies backpressure, "search" and
+    "search_async" fail fast. Every client shares the process's circuit breaker.
+    """
+    client = _clients.get(source)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(source)
+            if client is None:
+                profile, maximum = _profile(source)
+                client = _clients[source] = EmbeddingClient(profile, AdaptiveLimit(maximum), _breaker)
+    return client
@@ -0,0 +1,107 @@
+"""
+Versioned embeddings: resumes re-embedded with another model live in ResumeEmbedding next to the
+primary OLLAMA_EMBED_MODEL vectors, and search switches to a model only once its backfill is done.
+
+Activation flips `EmbeddingModel.is_active` in one transaction. Search processes re-read the active
+model every EMBEDDING_MODEL_REFRESH_SECONDS and each request resolves it once, so a query is always
+embedded and ranked with the same model and the old vectors keep serving until the switch.
+"""
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.contrib.postgres.indexes import OpClass
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from pgvector.django import HnswIndex, IvfflatIndex
+
+from pipeline.models import EmbeddingModel, ResumeDocument, ResumeEmbedding
+from pipeline.search_utils import create_index_concurrently, pgvector_version
+
+# (expires_at, active model) as last read from the database by this process.
+_active: tuple[float, EmbeddingModel | None] = (0.0, None)
+
+
+def active_embedding_model() -> EmbeddingModel | None:
+    """The model search should use, or None for the primary OLLAMA_EMBED_MODEL."""
+    global _active
+    expires_at, model = _active
+    if time.monotonic() >= expires_at:
+        model = EmbeddingModel.objects.filter(is_active=True).first()
+        _active = (time.monotonic() + settings.EMBEDDING_MODEL_REFRESH_SECONDS, model)
+    return model
+
+
+def register_embedding_model(name: str, dimensions: int) -> EmbeddingModel:
+    if name == settings.OLLAMA_EMBED_MODEL:
+        raise ValueError(f"{name} is the primary embedding model; its vectors live in ResumeDocument.embedding")
+    if dimensions < 1:
+        raise ValueError("dimensions must be positive")
+    model, _ = EmbeddingModel.objects.get_or_create(name=name, defaults={"dimensions": dimensions})
+    if model.dimensions != dimensions:
+        raise ValueError(f"{name} is registered with {model.dimensions} dimensions, not {dimensions}")
+    return model
+
+
+def pending_documents(model: EmbeddingModel):
+    """Resumes without a vector for `model`, or whose content changed after it was embedded."""
+    current = ResumeEmbedding.objects.filter(
+        document=OuterRef("pk"), model=model, document_updated_at=OuterRef("updated_at")
+    )
+    return ResumeDocument.objects.filter(~Exists(current))
+
+
+def model_index_name(model: EmbeddingModel) -> str:
+    return f"resume_embedding_model_{model.pk}_idx"
+
+
+def build_model_index(model: EmbeddingModel) -> str:
+    """Build the partial ANN index over `model`'s vectors (a no-op when a valid one exists) and return its name."""
+    name = model_index_name(model)
+    if connection.vendor != "postgresql":
+        return name
+    expression = OpClass(model.vector(), name="vector_cosine_ops")
+    if settings.VECTOR_INDEX_TYPE == "hnsw" and pgvector_version() >= (0, 5):
+        index = HnswIndex(
+            expression,
+            name=name,
+            m=settings.VECTOR_HNSW_M,
+            ef_construction=settings.VECTOR_HNSW_EF_CONSTRUCTION,
+            condition=Q(model=model),
+        )
+    else:
+        index = IvfflatIndex(expression, name=name, lists=settings.VECTOR_IVFFLAT_LISTS, condition=Q(model=model))
+    create_index_concurrently(index, ResumeEmbedding)
+    return name
+
+
+def activate_embedding_model(name: str, force: bool = False) -> EmbeddingModel | None:
+    """
+    Make `name` the model search uses; the primary model's name deactivates every other model.
+    Refuses a model whose backfill has not finished or that has pending resumes unless `force`.
+    """
+    global _active
+    with transaction.atomic():
+        current = EmbeddingModel.objects.select_for_update().filter(is_active=True)
+        if name == settings.OLLAMA_EMBED_MODEL:
+            current.update(is_active=False)
+            model = None
+        else:
+            try:
+                model = EmbeddingModel.objects.select_for_update().get(name=name)
+            except EmbeddingModel.DoesNotExist:
+                raise ValueError(f"No embedding model named {name}") from None
+            if not force:
+                if model.backfilled_at is None:
+                    raise ValueError(f"{name} has not finished its backfill")
+                pending = pending_documents(model).count()
+                if pending:
+                    raise ValueError(f"{name} is missing vectors for {pending} resumes")
+            current.exclude(pk=model.pk).update(is_active=False)
+            model.is_active = True
+            model.activated_at = timezone.now()
+            model.save(update_fields=["is_active", "activated_at"])
+    _active = (0.0, None)
+    return model
@@ -0,0 +1,265 @@
+"""
+In-process exact vector index for SEARCH_BACKEND="local": every resume embedding as one row of a
+NumPy matrix (float32 or float16), ranked with a single matrix-vector product per query, so vector
+search never leaves the web worker.
+
+The matrix is memory-mapped from a snapshot written by `manage.py build_local_index`, or read from
+the database when no snapshot exists. Changes since the snapshot are polled every
+LOCAL_INDEX_REFRESH_SECONDS by `updated_at` into an in-memory overlay that shadows the snapshot
+rows, and deletions are found by comparing row counts. The result rows (file name, metadata and
+preview) are held next to the vectors, so a query needs no database round-trip at all.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+from django.conf import settings
+from django.db.models.functions import Left
+from django.utils import timezone
+
+from pipeline.models import ResumeDocument
+
+logger = logging.getLogger(__name__)
+
+LOCAL_INDEX_DTYPES = ("float32", "float16")
+# Rows updated this long before the watermark are polled again, covering transactions that
+# committed after a later poll had already run.
+DELTA_OVERLAP = timedelta(seconds=30)
+# Rows scored per step when the matrix is float16, to bound the float32 copy.
+SCORE_BLOCK_ROWS = 65536
+# The overlay is folded into the base matrix once it holds this share of its rows.
+COMPACT_RATIO = 0.1
+# Result fields kept per row: (file_name, metadata, preview).
+Row = tuple[str, dict, str]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    # Unit rows turn cosine similarity into a dot product; zero vectors stay zero.
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def _documents(since: datetime | None = None, batch_size: int = 2000) -> Iterator[tuple[int, list[float], Row]]:
+    # Imported here: search_utils imports this module.
+    from pipeline.search_utils import PREVIEW_LENGTH
+
+    documents = ResumeDocument.objects.annotate(preview=Left("content", PREVIEW_LENGTH + 1)).order_by("id")
+    if since is not None:
+        documents = documents.filter(updated_at__gte=since)
+    fields = ("id", "embedding", "file_name", "metadata", "preview")
+    for candidate_id, embedding, file_name, metadata, preview in documents.values_list(*fields).iterator(
+        chunk_size=batch_size
+    ):
+        yield candidate_id, embedding, (file_name, metadata, preview)
+
+
+def _vectors(embeddings: list, dtype: str) -> np.ndarray:
+    if not embeddings:
+        return np.empty((0, settings.EMBEDDING_DIMENSION), dtype=dtype)
+    return _normalize(np.asarray(embeddings, dtype=np.float32)).astype(dtype)
+
+
+def write_snapshot(path: Path, dtype: str = "float32") -> int:
+    """Write every resume's normalized embedding and result row under `path`; returns the row count."""
+    if dtype not in LOCAL_INDEX_DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(LOCAL_INDEX_DTYPES)}")
+    path.mkdir(parents=True, exist_ok=True)
+    watermark = timezone.now()
+    ids: list[int] = []
+    embeddings: list = []
+    rows: list[Row] = []
+    for candidate_id, embedding, row in _documents():
+        ids.append(candidate_id)
+        embeddings.append(embedding)
+        rows.append(row)
+
+    # Files are renamed into place, so a worker starting meanwhile never maps a half-written matrix.
+    staged = {
+        "embeddings.npy": lambda handle: np.save(handle, _vectors(embeddings, dtype)),
+        "ids.npy": lambda handle: np.save(handle, np.asarray(ids, dtype=np.int64)),
+        "rows.json": lambda handle: handle.write(json.dumps(rows).encode("utf-8")),
+        "manifest.json": lambda handle: handle.write(
+            json.dumps(
+                {"watermark": watermark.isoformat(), "dtype": dtype, "dimensions": settings.EMBEDDING_DIMENSION}
+            ).encode("utf-8")
+        ),
+    }
+    for name, write in staged.items():
+        with open(path / f"{name}.tmp", "wb") as handle:
+            write(handle)
+    for name in staged:
+        os.replace(path / f"{name}.tmp", path / name)
+    return len(ids)
+
+
+@dataclass
+class _State:
+    """One consistent view of the index; refreshes build a new one instead of mutating it."""
+
+    matrix: np.ndarray
+    ids: np.ndarray
+    rows: list[Row]
+    # Base rows deleted or superseded by the overlay.
+    masked: np.ndarray
+    overlay: dict[int, tuple[np.ndarray, Row]] = field(default_factory=dict)
+    overlay_matrix: np.ndarray | None = None
+    overlay_ids: np.ndarray | None = None
+    overlay_rows: list[Row] = field(default_factory=list)
+
+
+class LocalVectorIndex:
+    def __init__(self, path: Path | None = None, dtype: str | None = None):
+        self.path = path
+        self.dtype = dtype or settings.LOCAL_INDEX_DTYPE
+        self._lock = threading.Lock()
+        self._state: _State | None = None
+        self._watermark: datetime | None = None
+        self._next_refresh = 0.0
+        self._positions: dict[int, int] = {}
+
+    def load(self) -> None:
+        if self.path is not None and (self.path / "manifest.json").exists():
+            manifest = json.loads((self.path / "manifest.json").read_text())
+            if manifest["dimensions"] != settings.EMBEDDING_DIMENSION:
+                raise ValueError(f"Snapshot in {self.path} holds {manifest['dimensions']}-dim embeddings")
+            matrix = np.load(self.path / "embeddings.npy", mmap_mode="r")
+            ids = np.load(self.path / "ids.npy")
+            rows = [tuple(row) for row in json.loads((self.path / "rows.json").read_text())]
+            self._watermark = datetime.fromisoformat(manifest["watermark"])
+            logger.info("Mapped local vector index snapshot of %s resumes from %s", len(ids), self.path)
+        else:
+            self._watermark = timezone.now()
+            ids_list, embeddings, rows = [], [], []
+            for candidate_id, embedding, row in _documents():
+                ids_list.append(candidate_id)
+                embeddings.append(embedding)
+                rows.append(row)
+            matrix = _vectors(embeddings, self.dtype)
+            ids = np.asarray(ids_list, dtype=np.int64)
+            logger.info("Loaded %s resume embeddings into the local vector index", len(ids))
+        self._positions = {int(candidate_id): position for position, candidate_id in enumerate(ids)}
+        self._state = _State(matrix, ids, rows, np.zeros(len(ids), dtype=bool))
+        self._next_refresh = time.monotonic() + settings.LOCAL_INDEX_REFRESH_SECONDS
+        self._apply_changes()
+
+    def refresh(self, force: bool = False) -> None:
+        """Poll the database for changes once LOCAL_INDEX_REFRESH_SECONDS have passed since the last poll."""
+        if not force and time.monotonic() < self._next_refresh:
+            return
+        # One thread polls; the others keep searching the current state.
+        if not self._lock.acquire(blocking=force):
+            return
+        try:
+            self._next_refresh = time.monotonic() + settings.LOCAL_INDEX_REFRESH_SECONDS
+            self._apply_changes()
+        finally:
+            self._lock.release()
+
+    def _apply_changes(self) -> None:
+        state = self._state
+        polled_at = timezone.now()
+        overlay = dict(state.overlay)
+        masked = state.masked.copy()
+        changed = 0
+        for candidate_id, embedding, row in _documents(since=self._watermark - DELTA_OVERLAP):
+            overlay[candidate_id] = (_vectors([embedding], self.dtype)[0], row)
+            position = self._positions.get(candidate_id)
+            if position is not None:
+                masked[position] = True
+            changed += 1
+
+        # updated_at cannot reveal deletions; a count mismatch triggers a diff of the ids.
+        expected = int(len(state.ids) - masked.sum()) + len(overlay)
+        if ResumeDocument.objects.count() != expected:
+            present = set(ResumeDocument.objects.values_list("id", flat=True).iterator(chunk_size=10000))
+            for candidate_id in [candidate_id for candidate_id in overlay if candidate_id not in present]:
+                del overlay[candidate_id]
+            missing = ~np.isin(state.ids, np.fromiter(present, dtype=np.int64, count=len(present)))
+            masked |= missing
+
+        if changed or not np.array_equal(masked, state.masked) or len(overlay) != len(state.overlay):
+            self._state = self._build_state(state, masked, overlay)
+        self._watermark = polled_at
+
+    def _build_state(self, state: _State, masked: np.ndarray, overlay: dict[int, tuple[np.ndarray, Row]]) -> _State:
+        if len(overlay) > COMPACT_RATIO * max(1, len(state.ids)):
+            keep = np.flatnonzero(~masked)
+            overlay_ids = list(overlay)
+            matrix = np.concatenate([np.asarray(state.matrix[keep]), np.stack([overlay[i][0] for i in overlay_ids])])
+            ids = np.concatenate([state.ids[keep], np.asarray(overlay_ids, dtype=np.int64)])
+            rows = [state.rows[position] for position in keep] + [overlay[i][1] for i in overlay_ids]
+            self._positions = {int(candidate_id): position for position, candidate_id in enumerate(ids)}
+            return _State(matrix, ids, rows, np.zeros(len(ids), dtype=bool))
+        new_state = _State(state.matrix, state.ids, state.rows, masked, overlay)
+        if overlay:
+            new_state.overlay_ids = np.asarray(list(overlay), dtype=np.int64)
+            new_state.overlay_matrix = np.stack([overlay[i][0] for i in overlay])
+            new_state.overlay_rows = [overlay[i][1] for i in overlay]
+        return new_state
+
+    def _scores(self, matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+        if matrix.dtype == np.float32:
+            return matrix @ query
+        return np.concatenate(
+            [
+                np.asarray(matrix[start : start + SCORE_BLOCK_ROWS], dtype=np.float32) @ query
+                for start in range(0, len(matrix), SCORE_BLOCK_ROWS)
+            ]
+            or [np.empty(0, dtype=np.float32)]
+        )
+
+    def search(
+        self, query_embedding: list[float], limit: int, after: tuple[float, int] | None = None
+    ) -> list[tuple[int, float, Row]]:
+        """
+        The `limit` most similar resumes as (id, cosine similarity, row), ordered by similarity
+        descending then id, starting after the (score, id) position `after`.
+        """
+        self.refresh()
+        state = self._state
+        query = _normalize(np.asarray([query_embedding], dtype=np.float32))[0]
+        scores = self._scores(state.matrix, query).astype(np.float64)
+        scores[state.masked] = -np.inf
+        ids = state.ids
+        rows = state.rows
+        if state.overlay_matrix is not None:
+            scores = np.concatenate([scores, self._scores(state.overlay_matrix, query).astype(np.float64)])
+            ids = np.concatenate([ids, state.overlay_ids])
+            rows = rows + state.overlay_rows
+        eligible = scores > -np.inf
+        if after is not None:
+            after_score, after_id = after
+            eligible &= (scores < after_score) | ((scores == after_score) & (ids > after_id))
+        candidates = np.flatnonzero(eligible)
+        if len(candidates) > limit:
+            # Keep every row tied with the cut-off so the id tie-break below sees all of them.
+            threshold = np.partition(scores[candidates], len(candidates) - limit)[len(candidates) - limit]
+            candidates = candidates[scores[candidates] >= threshold]
+        order = candidates[np.lexsort((ids[candidates], -scores[candidates]))][:limit]
+        return [(int(ids[position]), float(scores[position]), rows[position]) for position in order]
+
+
+_index: LocalVectorIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalVectorIndex:
+    """This process's index, loaded on first use (or at worker start, see jobsearch/asgi.py)."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = Path(settings.LOCAL_INDEX_PATH) if settings.LOCAL_INDEX_PATH else None
+                index = LocalVectorIndex(path)
+                index.load()
+                _index = index
+    return _index
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.embedding_models import activate_embedding_model, pending_documents
+from pipeline.models import EmbeddingModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Switch search to a re-embedded model in one transaction, or back to the primary "
+        "OLLAMA_EMBED_MODEL by naming it. Search processes pick the change up within "
+        "EMBEDDING_MODEL_REFRESH_SECONDS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", nargs="?", help="Model to activate; the primary model's name reverts to it")
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Activate even though the backfill is unfinished; resumes without a vector drop out of search",
+        )
+        parser.add_argument("--list", action="store_true", help="List registered models and their backfill state")
+
+    def handle(self, *args, **options):
+        if options["list"] or not options["model"]:
+            self._list()
+            return
+
+        try:
+            embedding_model = activate_embedding_model(options["model"], force=options["force"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        name = embedding_model.name if embedding_model else settings.OLLAMA_EMBED_MODEL
+        self.stdout.write(self.style.SUCCESS(f"Search now uses {name}"))
+
+    def _list(self) -> None:
+        active = EmbeddingModel.objects.filter(is_active=True).exists()
+        self.stdout.write(f"{'*' if not active else ' '} {settings.OLLAMA_EMBED_MODEL} (primary)")
+        for embedding_model in EmbeddingModel.objects.all():
+            backfilled = embedding_model.backfilled_at.isoformat() if embedding_model.backfilled_at else "never"
+            self.stdout.write(
+                f"{'*' if embedding_model.is_active else ' '} {embedding_model.name} "
+                f"({embedding_model.dimensions} dims, {pending_documents(embedding_model).count()} pending, "
+                f"backfilled {backfilled})"
+            )
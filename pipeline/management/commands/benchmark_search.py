@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from pipeline.benchmarking import (
+    delete_synthetic_corpus,
+    fake_embedding,
+    load_queries,
+    percentile,
+    synthetic_count,
+    synthetic_records,
+)
+from pipeline.models import ResumeDocument
+from pipeline.search_utils import ann_search_session
+from pipeline.tasks import ResumeWriter
+from pipeline.views import run_search
+
+METHODS = ("vector", "hybrid", "rrf", "bm25", "passage")
+
+
+def _parse_list(raw: str, cast=str) -> list:
+    try:
+        return [cast(value.strip()) for value in raw.split(",") if value.strip()]
+    except ValueError as exc:
+        raise CommandError(f"Could not parse {raw!r} as a comma separated list") from exc
+
+
+def _result_ids(method: str, query: str, embedding: list[float], exact: bool = False) -> list[int]:
+    if exact:
+        with ann_search_session(exact=True):
+            results = run_search(method, query, embedding)
+    else:
+        results = run_search(method, query, embedding)
+    return [result["candidate_id"] for result in results]
+
+
+def _timed_run(method: str, workload: list[tuple[str, list[float]]]) -> tuple[list[float], float, float]:
+    """
+    Run a slice of the workload on this thread. Returns per-query latencies in ms and the start and
+    end of the timed region, which excludes opening the thread's database connection.
+    """
+    latencies = []
+    try:
+        connection.ensure_connection()
+        started_at = time.perf_counter()
+        for query, embedding in workload:
+            started = time.perf_counter()
+            run_search(method, query, embedding)
+            latencies.append((time.perf_counter() - started) * 1000)
+        finished_at = time.perf_counter()
+    finally:
+        connections.close_all()
+    return latencies, started_at, finished_at
+
+
+class Command(BaseCommand):
+    help = (
+        "Replay a query set against each search method over synthetic resume corpora and report "
+        "p50/p95/p99 latency, QPS at several concurrency levels and recall@k against exact search. "
+        "Query embeddings come from a deterministic local stand-in, so Ollama is not needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--corpus-sizes",
+            type=str,
+            default="10000",
+            help="Comma separated synthetic corpus sizes, run in ascending order (e.g. 10000,100000,1000000)",
+        )
+        parser.add_argument(
+            "--methods",
+            type=str,
+            default=",".join(METHODS),
+            help=f"Comma separated search methods to benchmark (default {','.join(METHODS)})",
+        )
+        parser.add_argument(
+            "--queries",
+            type=str,
+            default=None,
+            help="File with one query per line, or JSON lines with a query/title field; defaults to a built-in set",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=str,
+            default="1,4,16",
+            help="Comma separated numbers of concurrent clients for the throughput runs",
+        )
+        parser.add_argument(
+            "--rounds",
+            type=int,
+            default=3,
+            help="Times the query set is replayed in each throughput run (default 3)",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows written per synthetic insert")
+        parser.add_argument(
+            "--no-populate",
+            action="store_true",
+            help="Benchmark the rows already stored instead of generating synthetic resumes",
+        )
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Keep the synthetic resumes for later runs instead of deleting them when the benchmark finishes",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The search benchmark needs PostgreSQL with pgvector")
+
+        methods = _parse_list(options["methods"])
+        unknown = set(methods) - set(METHODS)
+        if unknown:
+            raise CommandError(f"Unknown search methods: {', '.join(sorted(unknown))}")
+        concurrency_levels = _parse_list(options["concurrency"], int)
+        queries = load_queries(options["queries"])
+        if not queries:
+            raise CommandError("The query set is empty")
+        workload = [(query, fake_embedding(query)) for query in queries]
+
+        sizes = [None] if options["no_populate"] else sorted(_parse_list(options["corpus_sizes"], int))
+        try:
+            for size in sizes:
+                if size is not None:
+                    self._populate(size, options["batch_size"], with_passages="passage" in methods)
+                self._run_size(methods, workload, concurrency_levels, max(1, options["rounds"]))
+        finally:
+            # The synthetic rows live next to real resumes and would show up in searches.
+            if not options["no_populate"] and not options["keep"]:
+                self.stdout.write(f"Deleted {delete_synthetic_corpus()} synthetic resumes")
+
+    def _populate(self, size: int, batch_size: int, with_passages: bool) -> None:
+        existing = synthetic_count()
+        if existing >= size:
+            return
+        self.stdout.write(f"Generating synthetic resumes {existing}..{size}")
+        errors: list[str] = []
+        started = time.perf_counter()
+        with ResumeWriter(errors, batch_size=batch_size) as writer:
+            for record in synthetic_records(existing, size, with_passages=with_passages):
+                writer.add(record)
+        if errors:
+            raise CommandError(f"Failed to store synthetic resumes: {errors[0]}")
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE pipeline_resumedocument")
+            if with_passages:
+                cursor.execute("ANALYZE pipeline_resumechunk")
+        self.stdout.write(f"Stored {writer.written} resumes in {time.perf_counter() - started:.1f} s")
+
+    def _run_size(self, methods, workload, concurrency_levels, rounds) -> None:
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(f"Corpus: {ResumeDocument.objects.count()} resumes, {len(workload)} queries")
+        )
+        for method in methods:
+            # Warm the caches and collect the approximate and exact result sets.
+            recalls = []
+            for query, embedding in workload:
+                approximate = _result_ids(method, query, embedding)
+                exact = _result_ids(method, query, embedding, exact=True)
+                if exact:
+                    recalls.append(len(set(exact).intersection(approximate)) / len(exact))
+
+            latencies = sorted(_timed_run(method, workload)[0])
+            line = (
+                f"{method:<8} p50 {percentile(latencies, 0.50):7.1f} ms  "
+                f"p95 {percentile(latencies, 0.95):7.1f} ms  p99 {percentile(latencies, 0.99):7.1f} ms  "
+                f"recall@10 {statistics.fmean(recalls) if recalls else 0.0:.3f}"
+            )
+            for clients in concurrency_levels:
+                line += f"  {self._throughput(method, workload * rounds, clients):7.1f} qps@{clients}"
+            self.stdout.write(self.style.SUCCESS(line))
+
+    def _throughput(self, method: str, workload: list[tuple[str, list[float]]], clients: int) -> float:
+        clients = max(1, clients)
+        slices = [workload[offset::clients] for offset in range(clients)]
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            runs = list(pool.map(lambda part: _timed_run(method, part), slices))
+        completed = sum(len(latencies) for latencies, _, _ in runs)
+        elapsed = max(end for _, _, end in runs) - min(start for _, start, _ in runs)
+        return completed / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.local_index import LOCAL_INDEX_DTYPES, write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Write a snapshot of every resume embedding (normalized, as a NumPy matrix) and its result row "
+        "for SEARCH_BACKEND=local. Web workers memory-map it at start and poll the database only for "
+        "resumes changed since it was written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            type=str,
+            default=None,
+            help="Snapshot directory (defaults to LOCAL_INDEX_PATH)",
+        )
+        parser.add_argument(
+            "--dtype",
+            choices=LOCAL_INDEX_DTYPES,
+            default=None,
+            help="Matrix precision; float16 halves memory (defaults to LOCAL_INDEX_DTYPE)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.LOCAL_INDEX_PATH
+        if not path:
+            raise CommandError("Pass --path or set LOCAL_INDEX_PATH")
+        dtype = options["dtype"] or settings.LOCAL_INDEX_DTYPE
+        try:
+            count = write_snapshot(Path(path), dtype)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} {dtype} embeddings to {path}"))
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pipeline.cache import bump_corpus_version
+from pipeline.models import ResumeDocument
+from pipeline.tasks import chunk_text, embed_texts, replace_chunks
+
+
+class Command(BaseCommand):
+    help = (
+        "Split stored resume content into overlapping passages and embed them as ResumeChunk rows, "
+        "without re-reading the source files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Re-chunk every resume instead of only those without passages",
+        )
+        parser.add_argument("--batch-size", type=int, default=64, help="Resumes chunked per round (default 64)")
+
+    def handle(self, *args, **options):
+        documents = ResumeDocument.objects.only("id", "file_name", "content").order_by("id")
+        if not options["rebuild"]:
+            documents = documents.filter(chunks__isnull=True)
+
+        batch_size = max(1, options["batch_size"])
+        last_id = 0
+        chunked = 0
+        failed = 0
+        while batch := list(documents.filter(id__gt=last_id)[:batch_size]):
+            last_id = batch[-1].id
+            passages = [chunk_text(doc.content) for doc in batch]
+            vectors = embed_texts([passage for doc_passages in passages for passage in doc_passages])
+
+            ready = []
+            offset = 0
+            for doc, doc_passages in zip(batch, passages):
+                doc_vectors = vectors[offset : offset + len(doc_passages)]
+                offset += len(doc_passages)
+                failure = next((vector for vector in doc_vectors if isinstance(vector, Exception)), None)
+                if failure is not None:
+                    failed += 1
+                    self.stderr.write(self.style.ERROR(f"Failed to embed passages of {doc.file_name}: {failure}"))
+                    continue
+                ready.append((doc, list(zip(doc_passages, doc_vectors))))
+
+            with transaction.atomic():
+                replace_chunks(ready)
+                transaction.on_commit(bump_corpus_version)
+            chunked += len(ready)
+            self.stdout.write(f"Chunked {chunked} resumes")
+
+        self.stdout.write(self.style.SUCCESS(f"Chunked {chunked} resumes, {failed} failed"))
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from pgvector.django import CosineDistance
+
+from pipeline.models import ResumeDocument
+from pipeline.search_utils import ann_search_session, generate_embedding
+
+INDEX_NAME = "resume_embedding_ann_idx"
+
+
+def _parse_int_list(raw: str) -> list[int]:
+    try:
+        return [int(value) for value in raw.split(",") if value.strip()]
+    except ValueError as exc:
+        raise CommandError(f"Expected a comma separated list of integers, got {raw!r}") from exc
+
+
+def _nearest_ids(query_embedding: list[float], k: int, **session_options) -> tuple[list[int], float]:
+    started = time.perf_counter()
+    with ann_search_session(k, **session_options):
+        ids = list(
+            ResumeDocument.objects.annotate(distance=CosineDistance("embedding", query_embedding))
+            .order_by("distance")
+            .values_list("id", flat=True)[:k]
+        )
+    return ids, (time.perf_counter() - started) * 1000
+
+
+def _index_method() -> str | None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT am.amname FROM pg_class c JOIN pg_am am ON am.oid = c.relam WHERE c.relname = %s",
+            [INDEX_NAME],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure recall@k and latency of the ANN index on resume embeddings against an exact scan, "
+        "sweeping hnsw.ef_search or ivfflat.probes to pick a speed/recall tradeoff."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--k", type=int, default=10, help="Number of neighbours to compare (default 10)")
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=50,
+            help="Number of stored resume embeddings sampled as queries (default 50)",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            default=[],
+            help="Free-text query to embed with Ollama and evaluate; may be repeated. Replaces sampling.",
+        )
+        parser.add_argument(
+            "--ef-search",
+            type=str,
+            default="20,40,80,160,320",
+            help="Comma separated hnsw.ef_search values to sweep",
+        )
+        parser.add_argument(
+            "--probes",
+            type=str,
+            default="1,5,10,20,50",
+            help="Comma separated ivfflat.probes values to sweep",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("ANN recall can only be evaluated against PostgreSQL with pgvector")
+
+        k = options["k"]
+        method = _index_method()
+        if method is None:
+            raise CommandError(f"Index {INDEX_NAME} does not exist; run migrations first")
+
+        if options["query"]:
+            queries = [generate_embedding(text) for text in options["query"]]
+        else:
+            queries = list(
+                ResumeDocument.objects.order_by("?").values_list("embedding", flat=True)[: options["samples"]]
+            )
+        if not queries:
+            raise CommandError("No resumes stored; ingest data before evaluating recall")
+
+        if method == "hnsw":
+            sweep = [("ef_search", value) for value in _parse_int_list(options["ef_search"])]
+        else:
+            sweep = [("probes", value) for value in _parse_int_list(options["probes"])]
+
+        exact_results = []
+        exact_latencies = []
+        for query_embedding in queries:
+            ids, elapsed = _nearest_ids(query_embedding, k, exact=True)
+            exact_results.append(set(ids))
+            exact_latencies.append(elapsed)
+
+        self.stdout.write(
+            f"Index {INDEX_NAME} ({method}), {ResumeDocument.objects.count()} resumes, "
+            f"{len(queries)} queries, k={k}"
+        )
+        self.stdout.write(f"exact scan: mean {statistics.fmean(exact_latencies):.1f} ms")
+        for parameter, value in sweep:
+            recalls = []
+            latencies = []
+            for query_embedding, expected in zip(queries, exact_results):
+                ids, elapsed = _nearest_ids(query_embedding, k, **{parameter: value})
+                recalls.append(len(expected.intersection(ids)) / max(1, len(expected)))
+                latencies.append(elapsed)
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            line = (
+                f"{parameter}={value:<5} recall@{k} {statistics.fmean(recalls):.3f}  "
+                f"mean {statistics.fmean(latencies):.1f} ms  p95 {p95:.1f} ms"
+            )
+            self.stdout.write(self.style.SUCCESS(line))
+
+        current = (
+            f"hnsw.ef_search={settings.VECTOR_HNSW_EF_SEARCH}"
+            if method == "hnsw"
+            else f"ivfflat.probes={settings.VECTOR_IVFFLAT_PROBES}"
+        )
+        self.stdout.write(f"Configured value: {current}")
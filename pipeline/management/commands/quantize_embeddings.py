@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.postgres.indexes import OpClass
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models.functions import Cast
+from pgvector.django import HalfVectorField, HnswIndex
+
+from pipeline.cache import bump_corpus_version
+from pipeline.models import ResumeDocument
+from pipeline.search_utils import (
+    COMPRESSED_INDEX_VERSION,
+    binary_quantize,
+    create_index_concurrently,
+    pgvector_version,
+)
+
+INDEX_NAMES = {"half": "resume_embedding_half_ann_idx", "binary": "resume_embedding_binary_ann_idx"}
+
+
+def compressed_index(precision: str) -> HnswIndex:
+    """HNSW index serving the coarse pass of the given precision, matching the expressions search_utils queries."""
+    options = {"m": settings.VECTOR_HNSW_M, "ef_construction": settings.VECTOR_HNSW_EF_CONSTRUCTION}
+    if precision == "binary":
+        return HnswIndex(
+            name=INDEX_NAMES["binary"], fields=["embedding_binary"], opclasses=["bit_hamming_ops"], **options
+        )
+    half = Cast("embedding", HalfVectorField(dimensions=settings.EMBEDDING_DIMENSION))
+    return HnswIndex(OpClass(half, name="halfvec_cosine_ops"), name=INDEX_NAMES["half"], **options)
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill ResumeDocument.embedding_binary for rows stored before binary quantization, and build the HNSW "
+        "index used by the coarse pass of EMBEDDING_PRECISION=half or binary searches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Rows quantized per UPDATE (default 500)")
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Re-quantize every row instead of only those without a binary embedding",
+        )
+        parser.add_argument(
+            "--build-index",
+            choices=sorted(INDEX_NAMES),
+            default=None,
+            help="Also build the ANN index for this precision (needs pgvector >= 0.7)",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Quantized embeddings need PostgreSQL with pgvector")
+        precision = options["build_index"]
+        if precision and pgvector_version() < COMPRESSED_INDEX_VERSION:
+            raise CommandError("halfvec and bit HNSW indexes need pgvector >= 0.7 on the database server")
+
+        documents = ResumeDocument.objects.only("id", "embedding").order_by("id")
+        if not options["rebuild"]:
+            documents = documents.filter(embedding_binary__isnull=True)
+        batch_size = max(1, options["batch_size"])
+        last_id = 0
+        quantized = 0
+        while batch := list(documents.filter(id__gt=last_id)[:batch_size]):
+            last_id = batch[-1].id
+            for document in batch:
+                document.embedding_binary = binary_quantize(document.embedding)
+            ResumeDocument.objects.bulk_update(batch, ["embedding_binary"])
+            bump_corpus_version()
+            quantized += len(batch)
+            self.stdout.write(f"Quantized {quantized} embeddings")
+        self.stdout.write(self.style.SUCCESS(f"Quantized {quantized} embeddings"))
+
+        if precision:
+            index = compressed_index(precision)
+            create_index_concurrently(index, ResumeDocument)
+            self.stdout.write(self.style.SUCCESS(f"Built {index.name}; set EMBEDDING_PRECISION={precision} to use it"))
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.embedding_models import pending_documents, register_embedding_model
+from pipeline.tasks import backfill_embedding_model, reembed_resumes_task
+
+
+class Command(BaseCommand):
+    help = (
+        "Register an embedding model and re-embed the stored resume content with it, next to the "
+        "vectors search is using. Source files are not parsed again, and an interrupted run resumes "
+        "with the resumes still missing a current vector. Switch search over with activate_embedding_model."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="Ollama model name, e.g. mxbai-embed-large")
+        parser.add_argument(
+            "--dimensions",
+            type=int,
+            required=True,
+            help="Length of the vectors the model returns",
+        )
+        parser.add_argument(
+            "--async",
+            dest="use_async",
+            action="store_true",
+            help="Fan the backfill out to Celery workers instead of running inline",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Resumes embedded per round inline (defaults to EMBEDDING_BACKFILL_CHUNK_SIZE)",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            embedding_model = register_embedding_model(options["model"], options["dimensions"])
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["use_async"]:
+            result = reembed_resumes_task.delay(embedding_model.pk)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Enqueued re-embedding task {result.id} for {embedding_model.name}. It fans pending resumes "
+                    "out to chunk tasks and builds the model's index when they are done."
+                )
+            )
+            return
+
+        pending = pending_documents(embedding_model).count()
+        self.stdout.write(f"{pending} resumes to embed with {embedding_model.name}")
+        result = backfill_embedding_model(
+            embedding_model,
+            options["batch_size"],
+            progress=lambda processed: self.stdout.write(f"Embedded {processed} of {pending} resumes"),
+        )
+        for err in result["errors"]:
+            self.stderr.write(self.style.ERROR(err))
+        summary = f"Embedded {result['processed']} resumes with {embedding_model.name}, {len(result['errors'])} failed"
+        if result["complete"]:
+            self.stdout.write(self.style.SUCCESS(f"{summary}; backfill complete and index built"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{summary}; rerun to retry the remaining resumes"))
@@ -3,9 +3,20 @@ from __future__ import annotations
 from pathlib import Path
 
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
 
-from pipeline.tasks import ingest_directory, ingest_resumes_task
+from pipeline.benchmarking import MockEmbeddingServer
+from pipeline.models import EmbeddingModel, ResumeDocument
+from pipeline.sources import is_stream_source
+from pipeline.tasks import (
+    backfill_embedding_model,
+    ingest_directory,
+    ingest_resumes_task,
+    ingest_source,
+    list_resume_files,
+)
 
 
 class Command(BaseCommand):
@@ -27,22 +38,139 @@ class Command(BaseCommand):
             action="store_true",
             help="Enqueue the ingestion Celery task instead of running inline",
         )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete stored resumes whose source file no longer exists in the directory",
+        )
+        parser.add_argument(
+            "--source",
+            type=str,
+            default=None,
+            help="Stream records from a JSONL, zip or tar.gz export instead of walking a directory",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            type=str,
+            default=None,
+            help="With --source: file recording the committed offset; an existing checkpoint resumes the run",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="With --source: records parsed and committed per batch (defaults to INGESTION_DB_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help=(
+                "Ingest every file against a local mock embedding server inside a transaction that is "
+                "rolled back, then print a per-stage timing breakdown"
+            ),
+        )
+        parser.add_argument(
+            "--mock-latency-ms",
+            type=float,
+            default=0.0,
+            help="Delay the mock embedding server adds to each request in --benchmark mode (default 0)",
+        )
 
     def handle(self, *args, **options):
+        if options["source"]:
+            if options.get("use_async") or options["prune"] or options["benchmark"]:
+                raise CommandError("--source cannot be combined with --async, --prune or --benchmark")
+            self._ingest_source(Path(options["source"]), options["checkpoint"], options["batch_size"])
+            return
+
         directory = Path(options.get("directory") or settings.DATA_DIRECTORY)
+        if options["benchmark"]:
+            if options.get("use_async") or options["prune"]:
+                raise CommandError("--benchmark cannot be combined with --async or --prune")
+            self._benchmark(directory, options["mock_latency_ms"])
+            return
+
         if options.get("use_async"):
-            result = ingest_resumes_task.delay(str(directory))
+            result = ingest_resumes_task.delay(str(directory), prune_missing=options["prune"])
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"Enqueued ingestion task {result.id} for directory {directory}. Use celery backend to monitor."
+                    f"Enqueued ingestion task {result.id} for directory {directory}. It fans the files out to "
+                    "chunk tasks; use celery backend to monitor the summary task it reports."
                 )
             )
             return
 
-        result = ingest_directory(directory)
+        result = ingest_directory(directory, prune_missing=options["prune"])
         processed = result["processed"]
         errors = result["errors"]
         if errors:
             for err in errors:
                 self.stderr.write(self.style.ERROR(err))
-        self.stdout.write(self.style.SUCCESS(f"Processed {processed} files from {directory}"))
+        summary = f"Processed {processed} files from {directory}, skipped {result['skipped']} unchanged"
+        if options["prune"]:
+            summary += f", deleted {result.get('deleted', 0)} removed"
+        self.stdout.write(self.style.SUCCESS(summary))
+        self._backfill_embedding_models()
+
+    def _ingest_source(self, source: Path, checkpoint: str | None, batch_size: int | None) -> None:
+        if not is_stream_source(source):
+            raise CommandError(f"{source} is not a JSONL, zip or tar.gz file")
+        try:
+            result = ingest_source(source, Path(checkpoint) if checkpoint else None, batch_size)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        for err in result["errors"]:
+            self.stderr.write(self.style.ERROR(err))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {result['processed']} records from {source} (offsets {result['start_offset']}"
+                f"..{result['offset']}), skipped {result['skipped']} unchanged"
+            )
+        )
+        self._backfill_embedding_models()
+
+    def _backfill_embedding_models(self) -> None:
+        # The Celery path schedules this from its summary task; inline runs catch up here.
+        for embedding_model in EmbeddingModel.objects.all():
+            result = backfill_embedding_model(embedding_model)
+            for err in result["errors"]:
+                self.stderr.write(self.style.ERROR(err))
+            self.stdout.write(f"Re-embedded {result['processed']} new or changed resumes with {embedding_model.name}")
+
+    def _benchmark(self, directory: Path, latency_ms: float) -> None:
+        if not directory.exists():
+            raise CommandError(f"Data directory {directory} does not exist")
+
+        # The text cache is bypassed so extraction measures PyPDF2 and the run leaves no cache entries behind.
+        with MockEmbeddingServer(latency_ms) as server, override_settings(
+            OLLAMA_BASE_URL=server.base_url, TEXT_CACHE_ENABLED=False
+        ):
+            with transaction.atomic():
+                # Drop the stored copies first so every stage does real work; the rollback restores them.
+                names = [file_path.name for file_path in list_resume_files(directory)]
+                ResumeDocument.objects.filter(file_name__in=names).delete()
+                result = ingest_directory(directory)
+                transaction.set_rollback(True)
+
+        for err in result["errors"]:
+            self.stderr.write(self.style.ERROR(err))
+        stats = result["stats"]
+        elapsed = stats["elapsed_seconds"] or 1e-9
+        self.stdout.write(
+            f"Ingested {result['processed']} of {len(names)} files from {directory} in {stats['elapsed_seconds']:.2f} s "
+            f"({stats['files_per_second']:.1f} files/s, {stats['pages_per_second']:.1f} pages/s); changes rolled back"
+        )
+        for stage, seconds in stats["stages"].items():
+            self.stdout.write(f"  {stage:<16} {seconds:8.2f} s  {seconds / elapsed:6.1%}")
+
+        embedding = stats["embedding"]
+        self.stdout.write(
+            f"Embedding: {embedding['requests']} requests, {embedding['texts']} texts, "
+            f"mean {embedding['latency_ms_mean']:.1f} ms per request"
+        )
+        for bucket, count in embedding["latency_ms_histogram"].items():
+            if count:
+                self.stdout.write(f"  {bucket:>8} ms  {count}")
+        slowest = max(stats["stages"], key=stats["stages"].get)
+        self.stdout.write(self.style.SUCCESS(f"Slowest stage: {slowest}"))
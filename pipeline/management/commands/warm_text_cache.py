@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from pipeline.tasks import extract_resumes, list_resume_files, warm_text_cache_file
+from pipeline.text_cache import text_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Extract every PDF under the data directory into the extracted-text cache in parallel, so the "
+        "next ingestion or rebuild reads text from the cache instead of parsing the files again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--directory",
+            type=str,
+            default=None,
+            help="Override the directory containing resume files (defaults to settings.DATA_DIRECTORY)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Extraction processes (defaults to INGESTION_EXTRACT_WORKERS)",
+        )
+
+    def handle(self, *args, **options):
+        if not settings.TEXT_CACHE_ENABLED:
+            raise CommandError("TEXT_CACHE_ENABLED is off")
+        directory = Path(options["directory"] or settings.DATA_DIRECTORY)
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory")
+
+        pdfs = [path for path in list_resume_files(directory) if path.suffix.lower() == ".pdf"]
+        counts = {"cached": 0, "extracted": 0, "failed": 0}
+        for file_path, result, error in extract_resumes(pdfs, options["workers"], gather=warm_text_cache_file):
+            if error is not None:
+                counts["failed"] += 1
+                self.stderr.write(self.style.ERROR(f"{file_path.name}: {error}"))
+            else:
+                counts["cached" if result["cached"] else "extracted"] += 1
+
+        stats = text_cache_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Extracted {counts['extracted']} PDFs, {counts['cached']} already cached, {counts['failed']} failed; "
+                f"cache holds {stats['entries']} entries in {stats['bytes']} bytes"
+            )
+        )
@@ -0,0 +1,197 @@
+"""
+Prometheus metrics for the search and ingestion hot paths, plus the dependency probes behind the
+readiness endpoint.
+
+Counters and histograms are recorded where the work happens (embedding calls, search queries,
+ingestion runs). Celery queue depth and embedding cache stats are read at scrape time by custom
+collectors. When PROMETHEUS_MULTIPROC_DIR is set (several uvicorn workers, or Celery workers that
+write to a volume shared with the web container), /metrics aggregates every process's samples found
+under METRICS_MULTIPROC_ROOT.
+"""
+from __future__ import annotations
+
+import glob
+import os
+import time
+from typing import Any
+
+import redis
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from pipeline.cache import cache_stats
+
+EMBEDDING_SECONDS = Histogram(
+    "resume_embedding_request_seconds",
+    "Latency of embedding requests to Ollama",
+    ["source"],
+)
+EMBEDDING_REQUESTS = Counter(
+    "resume_embedding_requests_total",
+    "Embedding request attempts to Ollama, by outcome (ok, retry, error, rejected)",
+    ["source", "outcome"],
+)
+SEARCH_QUERY_SECONDS = Histogram(
+    "resume_search_query_seconds",
+    "Database time of a candidate search, by search method",
+    ["method"],
+)
+SEARCH_REQUEST_SECONDS = Histogram(
+    "resume_search_request_seconds",
+    "End-to-end latency of search requests, including embedding and formatting",
+    ["endpoint"],
+)
+DEPENDENCY_PROBE_SECONDS = Histogram(
+    "resume_dependency_probe_seconds",
+    "Latency of readiness probes against backing services",
+    ["dependency"],
+)
+INGESTED_FILES = Counter(
+    "resume_ingestion_files_total",
+    "Files handled by ingestion, by outcome",
+    ["outcome"],
+)
+INGESTED_PAGES = Counter("resume_ingestion_pages_total", "Pages extracted by ingestion")
+INGESTION_STAGE_SECONDS = Counter(
+    "resume_ingestion_stage_seconds_total",
+    "Wall time spent in each ingestion stage",
+    ["stage"],
+)
+
+
+def record_ingestion(result: dict[str, Any]) -> None:
+    INGESTED_FILES.labels("processed").inc(result.get("processed", 0))
+    INGESTED_FILES.labels("skipped").inc(result.get("skipped", 0))
+    INGESTED_FILES.labels("failed").inc(len(result.get("errors", [])))
+    stats = result.get("stats") or {}
+    INGESTED_PAGES.inc(stats.get("pages", 0))
+    for stage, seconds in stats.get("stages", {}).items():
+        INGESTION_STAGE_SECONDS.labels(stage).inc(seconds)
+
+
+class CeleryQueueCollector:
+    """Reports the length of the ingestion queue on the Redis broker at scrape time."""
+
+    def __init__(self):
+        self._client: redis.Redis | None = None
+
+    def collect(self):
+        gauge = GaugeMetricFamily("resume_celery_queue_length", "Tasks waiting in the Celery queue", labels=["queue"])
+        queue = settings.CELERY_TASK_DEFAULT_QUEUE
+        if settings.CELERY_BROKER_URL.startswith(("redis://", "rediss://")):
+            if self._client is None:
+                self._client = redis.Redis.from_url(
+                    settings.CELERY_BROKER_URL,
+                    socket_timeout=settings.READINESS_TIMEOUT,
+                    socket_connect_timeout=settings.READINESS_TIMEOUT,
+                )
+            try:
+                gauge.add_metric([queue], self._client.llen(queue))
+            except redis.RedisError:
+                pass
+        yield gauge
+
+
+class EmbeddingCacheCollector:
+    """Exposes this process's embedding and search result cache counters from pipeline.cache."""
+
+    def collect(self):
+        stats = cache_stats()
+        lookups = CounterMetricFamily(
+            "resume_embedding_cache_lookups", "Query embedding cache lookups, by result", labels=["result"]
+        )
+        for result in ("local_hits", "redis_hits", "misses"):
+            lookups.add_metric([result], stats[result])
+        yield lookups
+        yield CounterMetricFamily(
+            "resume_embedding_cache_redis_errors", "Redis errors seen by the embedding cache", value=stats["redis_errors"]
+        )
+        yield GaugeMetricFamily(
+            "resume_embedding_cache_hit_ratio", "Share of lookups served from either cache tier", value=stats["hit_rate"]
+        )
+        yield GaugeMetricFamily(
+            "resume_embedding_cache_local_entries", "Entries in the in-process cache", value=stats["local_size"]
+        )
+        results = CounterMetricFamily(
+            "resume_search_result_cache_lookups", "Search result cache lookups, by result", labels=["result"]
+        )
+        results.add_metric(["hit"], stats["result_hits"])
+        results.add_metric(["miss"], stats["result_misses"])
+        yield results
+
+
+class SharedMultiProcessCollector:
+    """Merges the sample files of every process under METRICS_MULTIPROC_ROOT, subdirectories included."""
+
+    def collect(self):
+        files = glob.glob(os.path.join(settings.METRICS_MULTIPROC_ROOT, "**", "*.db"), recursive=True)
+        return MultiProcessCollector.merge(files, accumulate=True)
+
+
+_scrape_collectors = (CeleryQueueCollector(), EmbeddingCacheCollector())
+for _collector in _scrape_collectors:
+    REGISTRY.register(_collector)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if settings.METRICS_MULTIPROC_ROOT:
+        registry = CollectorRegistry()
+        registry.register(SharedMultiProcessCollector())
+        for collector in _scrape_collectors:
+            registry.register(collector)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _probe_database() -> None:
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"SET LOCAL statement_timeout = {max(1, int(settings.READINESS_TIMEOUT * 1000))}")
+        cursor.execute("SELECT 1")
+
+
+_readiness_redis: redis.Redis | None = None
+
+
+def _probe_redis() -> None:
+    # Not the cache's client: that one skips Redis while backing off and uses the shorter cache timeout.
+    global _readiness_redis
+    if _readiness_redis is None:
+        _readiness_redis = redis.Redis.from_url(
+            settings.CACHE_REDIS_URL,
+            socket_timeout=settings.READINESS_TIMEOUT,
+            socket_connect_timeout=settings.READINESS_TIMEOUT,
+        )
+    _readiness_redis.ping()
+
+
+def _probe_ollama() -> None:
+    response = requests.get(
+        f"{settings.OLLAMA_BASE_URL.rstrip('/')}/api/tags", timeout=settings.READINESS_TIMEOUT
+    )
+    response.raise_for_status()
+
+
+PROBES = {"database": _probe_database, "redis": _probe_redis, "ollama": _probe_ollama}
+
+
+def probe_dependencies() -> dict[str, dict[str, Any]]:
+    """Run every probe, returning {"dependency": {"ok", "latency_ms"[, "error"]}}."""
+    checks: dict[str, dict[str, Any]] = {}
+    for name, probe in PROBES.items():
+        started = time.perf_counter()
+        try:
+            probe()
+            check: dict[str, Any] = {"ok": True}
+        except Exception as exc:
+            check = {"ok": False, "error": str(exc)}
+        elapsed = time.perf_counter() - started
+        DEPENDENCY_PROBE_SECONDS.labels(name).observe(elapsed)
+        check["latency_ms"] = round(elapsed * 1000, 1)
+        checks[name] = check
+    return checks
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import migrations
+from pgvector.django import HnswIndex, IvfflatIndex
+
+INDEX_NAME = "resume_embedding_ann_idx"
+
+
+def _pgvector_version(schema_editor) -> tuple[int, ...]:
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        row = cursor.fetchone()
+    if not row:
+        return ()
+    return tuple(int(part) for part in row[0].split(".") if part.isdigit())
+
+
+def create_ann_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    model = apps.get_model("pipeline", "ResumeDocument")
+    use_hnsw = settings.VECTOR_INDEX_TYPE == "hnsw" and _pgvector_version(schema_editor) >= (0, 5)
+    if use_hnsw:
+        index = HnswIndex(
+            name=INDEX_NAME,
+            fields=["embedding"],
+            m=settings.VECTOR_HNSW_M,
+            ef_construction=settings.VECTOR_HNSW_EF_CONSTRUCTION,
+            opclasses=["vector_cosine_ops"],
+        )
+    else:
+        # IVFFlat clusters the rows that exist at build time; rebuild it after large ingestions.
+        index = IvfflatIndex(
+            name=INDEX_NAME,
+            fields=["embedding"],
+            lists=settings.VECTOR_IVFFLAT_LISTS,
+            opclasses=["vector_cosine_ops"],
+        )
+    schema_editor.add_index(model, index)
+
+
+def drop_ann_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(INDEX_NAME)}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pipeline", "0002_resume_file_name_idx"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name="resumedocument",
+                    index=HnswIndex(
+                        name=INDEX_NAME,
+                        fields=["embedding"],
+                        m=16,
+                        ef_construction=64,
+                        opclasses=["vector_cosine_ops"],
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_ann_index, drop_ann_index),
+            ],
+        ),
+    ]
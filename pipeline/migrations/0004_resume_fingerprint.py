@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pipeline", "0003_resume_embedding_ann_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resumedocument",
+            name="content_hash",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="resumedocument",
+            name="file_size",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="resumedocument",
+            name="file_mtime",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="resumedocument",
+            index=models.Index(fields=["content_hash"], name="resume_content_hash_idx"),
+        ),
+    ]
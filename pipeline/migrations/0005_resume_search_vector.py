@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import CombinedSearchVector, SearchConfig, SearchVector, SearchVectorField
+from django.db import migrations, models
+from django.db.models.fields.json import KeyTextTransform
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pipeline", "0004_resume_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resumedocument",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=CombinedSearchVector(
+                    SearchVector(KeyTextTransform("skills", "metadata"), config="english", weight="A"),
+                    "||",
+                    SearchVector("content", config="english", weight="B"),
+                    SearchConfig("english"),
+                ),
+                output_field=SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resumedocument",
+            index=GinIndex(fields=["search_vector"], name="resume_search_vector_idx"),
+        ),
+    ]
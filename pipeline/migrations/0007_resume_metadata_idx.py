@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.contrib.postgres.indexes import GinIndex
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pipeline", "0006_resume_chunk"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="resumedocument",
+            index=GinIndex(fields=["metadata"], name="resume_metadata_idx", opclasses=["jsonb_path_ops"]),
+        ),
+    ]
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import migrations
+import pgvector.django
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pipeline", "0007_resume_metadata_idx"),
+    ]
+
+    # The column is filled by ingestion and, for existing rows, by `manage.py quantize_embeddings`, which
+    # also builds the Hamming index once the server's pgvector supports it.
+    operations = [
+        migrations.AddField(
+            model_name="resumedocument",
+            name="embedding_binary",
+            field=pgvector.django.BitField(blank=True, length=settings.EMBEDDING_DIMENSION, null=True),
+        ),
+    ]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import django.db.models.deletion
+from django.db import migrations, models
+import pgvector.django
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("pipeline", "0008_resume_embedding_binary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmbeddingModel",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=255, unique=True)),
+                ("dimensions", models.PositiveIntegerField()),
+                ("is_active", models.BooleanField(default=False)),
+                ("backfilled_at", models.DateTimeField(blank=True, null=True)),
+                ("activated_at", models.DateTimeField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["name"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("is_active", True)),
+                        fields=("is_active",),
+                        name="single_active_embedding_model",
+                    ),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ResumeEmbedding",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("embedding", pgvector.django.VectorField()),
+                ("document_updated_at", models.DateTimeField()),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="model_embeddings",
+                        to="pipeline.resumedocument",
+                    ),
+                ),
+                (
+                    "model",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="embeddings",
+                        to="pipeline.embeddingmodel",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(fields=("document", "model"), name="resume_embedding_model_uniq"),
+                ],
+            },
+        ),
+    ]
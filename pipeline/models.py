@@ -1,6 +1,11 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
-from pgvector.django import VectorField
+from django.db.models import Q
+from django.db.models.fields.json import KeyTextTransform
+from django.db.models.functions import Cast
+from pgvector.django import BitField, HnswIndex, VectorField
 
 
 class ResumeDocument(models.Model):
@@ -8,12 +13,118 @@ class ResumeDocument(models.Model):
     content = models.TextField()
     metadata = models.JSONField(default=dict, blank=True)
     embedding = VectorField(dimensions=getattr(settings, "EMBEDDING_DIMENSION", 384))
+    # Sign bits of `embedding`, searched by Hamming distance when EMBEDDING_PRECISION is "binary".
+    embedding_binary = BitField(length=getattr(settings, "EMBEDDING_DIMENSION", 384), null=True, blank=True)
+    # Source file manifest used by ingestion to skip unchanged files before extraction.
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    file_size = models.BigIntegerField(null=True, blank=True)
+    file_mtime = models.FloatField(null=True, blank=True)
+    # Maintained by Postgres on every insert/update; skills listed in the metadata outrank body text.
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector(KeyTextTransform("skills", "metadata"), config="english", weight="A")
+            + SearchVector("content", config="english", weight="B")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["file_name"]
-        indexes = [models.Index(fields=["file_name"], name="resume_file_name_idx")]
+        indexes = [
+            models.Index(fields=["file_name"], name="resume_file_name_idx"),
+            models.Index(fields=["content_hash"], name="resume_content_hash_idx"),
+            GinIndex(fields=["search_vector"], name="resume_search_vector_idx"),
+            # Serves the metadata @> {...} containment filters of the search API.
+            GinIndex(fields=["metadata"], name="resume_metadata_idx", opclasses=["jsonb_path_ops"]),
+            # Built by migration 0003 as HNSW, or IVFFlat when the server's pgvector predates HNSW.
+            HnswIndex(
+                name="resume_embedding_ann_idx",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
+        ]
 
     def __str__(self):
         return self.file_name
+
+
+class ResumeChunk(models.Model):
+    """Overlapping passage of a resume with its own embedding, used for passage-level retrieval."""
+
+    document = models.ForeignKey(ResumeDocument, on_delete=models.CASCADE, related_name="chunks")
+    chunk_index = models.PositiveIntegerField()
+    content = models.TextField()
+    embedding = VectorField(dimensions=getattr(settings, "EMBEDDING_DIMENSION", 384))
+
+    class Meta:
+        ordering = ["document", "chunk_index"]
+        constraints = [
+            models.UniqueConstraint(fields=["document", "chunk_index"], name="resume_chunk_position_uniq"),
+        ]
+        indexes = [
+            HnswIndex(
+                name="resume_chunk_embedding_ann_idx",
+                fields=["embedding"],
+                m=16,
+                ef_construction=64,
+                opclasses=["vector_cosine_ops"],
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.document_id}:{self.chunk_index}"
+
+
+class EmbeddingModel(models.Model):
+    """
+    An embedding model other than OLLAMA_EMBED_MODEL (whose vectors live in ResumeDocument.embedding)
+    that resumes are re-embedded with. At most one row is active; while none is, search uses the
+    primary model.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    dimensions = models.PositiveIntegerField()
+    is_active = models.BooleanField(default=False)
+    # Set when a backfill finished with every resume embedded and the model's ANN index built.
+    backfilled_at = models.DateTimeField(null=True, blank=True)
+    activated_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["name"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["is_active"], condition=Q(is_active=True), name="single_active_embedding_model"
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    def vector(self, field: str = "embedding") -> Cast:
+        """`field` cast to this model's dimensions: the expression its ANN index is built on."""
+        return Cast(field, VectorField(dimensions=self.dimensions))
+
+
+class ResumeEmbedding(models.Model):
+    """A resume's vector under a non-primary EmbeddingModel; dimensions vary per model."""
+
+    document = models.ForeignKey(ResumeDocument, on_delete=models.CASCADE, related_name="model_embeddings")
+    model = models.ForeignKey(EmbeddingModel, on_delete=models.CASCADE, related_name="embeddings")
+    # Each model gets a partial HNSW index over embedding::vector(dimensions), built after its backfill.
+    embedding = VectorField()
+    # The document's updated_at when its content was embedded; any other value marks the vector stale.
+    document_updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["document", "model"], name="resume_embedding_model_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.document_id}:{self.model_id}"
@@ -0,0 +1,120 @@
+"""
+Per-stage timers and counters for resume ingestion.
+
+Stage times are wall-clock seconds spent by the ingesting thread, measured exclusively (time in a
+nested stage is not also charged to the enclosing one), so they add up to roughly the elapsed time
+and the largest stage is the one limiting throughput. Embedding requests run on worker threads and
+are recorded separately as a latency histogram.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+STAGES = ("listing", "manifest", "extraction", "existence_check", "embedding", "db_write")
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_DONE = object()
+
+
+def _bucket_label(bound: float) -> str:
+    return f"<={bound}" if bound != float("inf") else "+Inf"
+
+
+class IngestionStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = dict.fromkeys(STAGES, 0.0)
+        self.files = 0
+        self.pages = 0
+        self.embedding_requests = 0
+        self.embedded_texts = 0
+        self.embedding_latency_ms = 0.0
+        self.latency_histogram = dict.fromkeys(map(_bucket_label, (*LATENCY_BUCKETS_MS, float("inf"))), 0)
+        self._lock = threading.Lock()
+        self._nested: list[float] = []
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        self._nested.append(0.0)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            child_time = self._nested.pop()
+            self.stages[stage] = self.stages.get(stage, 0.0) + elapsed - child_time
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def timed(self, iterable: Iterable[T], stage: str) -> Iterator[T]:
+        """Yield from `iterable`, charging the time spent waiting for each item to `stage`."""
+        iterator = iter(iterable)
+        while True:
+            with self.timer(stage):
+                item = next(iterator, _DONE)
+            if item is _DONE:
+                return
+            yield item
+
+    def count_document(self, data: dict[str, object]) -> None:
+        """Count an extracted file; PDFs contribute their page count, other files one page."""
+        self.files += 1
+        metadata = data.get("metadata")
+        page_count = metadata.get("page_count") if isinstance(metadata, dict) else None
+        self.pages += page_count if isinstance(page_count, int) else 1
+
+    def observe_embedding(self, seconds: float, texts: int) -> None:
+        latency_ms = seconds * 1000
+        label = next((_bucket_label(bound) for bound in LATENCY_BUCKETS_MS if latency_ms <= bound), "+Inf")
+        with self._lock:
+            self.embedding_requests += 1
+            self.embedded_texts += texts
+            self.embedding_latency_ms += latency_ms
+            self.latency_histogram[label] += 1
+
+    def absorb(self, summary: dict[str, object]) -> None:
+        """Add the raw counters of another summary produced by as_dict (e.g. from a chunk task)."""
+        for stage, seconds in summary.get("stages", {}).items():
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+        self.files += summary.get("files", 0)
+        self.pages += summary.get("pages", 0)
+        embedding = summary.get("embedding", {})
+        self.embedding_requests += embedding.get("requests", 0)
+        self.embedded_texts += embedding.get("texts", 0)
+        self.embedding_latency_ms += embedding.get("latency_ms_total", 0.0)
+        for label, count in embedding.get("latency_ms_histogram", {}).items():
+            self.latency_histogram[label] = self.latency_histogram.get(label, 0) + count
+
+    def as_dict(self, elapsed: float | None = None) -> dict[str, object]:
+        elapsed = time.perf_counter() - self.started if elapsed is None else elapsed
+        requests = self.embedding_requests
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "files": self.files,
+            "pages": self.pages,
+            "files_per_second": round(self.files / elapsed, 2) if elapsed > 0 else 0.0,
+            "pages_per_second": round(self.pages / elapsed, 2) if elapsed > 0 else 0.0,
+            "stages": {stage: round(seconds, 3) for stage, seconds in self.stages.items()},
+            "db_write_seconds": round(self.stages["db_write"], 3),
+            "embedding": {
+                "requests": requests,
+                "texts": self.embedded_texts,
+                "latency_ms_total": round(self.embedding_latency_ms, 3),
+                "latency_ms_mean": round(self.embedding_latency_ms / requests, 2) if requests else 0.0,
+                "latency_ms_histogram": dict(self.latency_histogram),
+            },
+        }
+
+
+def merge_stats(summaries: Iterable[dict[str, object]], elapsed: float | None = None) -> dict[str, object]:
+    """Combine per-chunk stats; rates are computed over `elapsed` wall time when it is given."""
+    merged = IngestionStats()
+    total_elapsed = 0.0
+    for summary in summaries:
+        merged.absorb(summary)
+        total_elapsed += summary.get("elapsed_seconds", 0.0)
+    return merged.as_dict(elapsed if elapsed is not None else total_elapsed)
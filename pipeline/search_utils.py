@@ -1,37 +1,258 @@
 import re
 import json
-import requests
-from typing import Any
+import base64
+import binascii
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache, partial, reduce
+from operator import add, and_, or_
+from typing import Any, Iterator
 
 from django.conf import settings
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
-from pipeline.models import ResumeDocument
+from django.core.exceptions import ImproperlyConfigured
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection, transaction
+from django.db.models import ExpressionWrapper, F, FilteredRelation, FloatField, Index, IntegerField, Model, Q, Value
+from django.db.models.functions import Cast, Left, Length, Lower, Replace
+from pipeline.cache import cached_embedding, cached_embeddings
+from pipeline.embedding_client import get_embedding_client
+from pipeline.local_index import get_local_index
+from pipeline.models import EmbeddingModel, ResumeChunk, ResumeDocument, ResumeEmbedding
+from pgvector import Vector
 from pgvector.django import CosineDistance
 
 
-def _format_result(doc, similarity: float | None, html_format=True) -> dict[str, Any]:
-    content_preview = (doc.content[:300] + "...") if len(doc.content) > 300 else doc.content
+PREVIEW_LENGTH = 300
+# Columns a search result needs; the content body and the embedding are never transferred.
+RESULT_FIELDS = ("id", "file_name", "metadata")
+# pgvector caps hnsw.ef_search at 1000; deeper result sets need an exact scan.
+HNSW_MAX_EF_SEARCH = 1000
+STREAM_FETCH_SIZE = 500
+# Iterative index scans (which keep scanning until enough rows pass a filter) arrived in pgvector 0.8.
+ITERATIVE_SCAN_VERSION = (0, 8)
+EMBEDDING_PRECISIONS = ("full", "half", "binary")
+SEARCH_BACKENDS = ("pgvector", "local")
+# halfvec, bit HNSW indexes and the <~> (Hamming) operator arrived in pgvector 0.7.
+COMPRESSED_INDEX_VERSION = (0, 7)
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    Keyset position of the last row served: its ranking `score` and `id`, plus the number of rows
+    already served (`depth`), which sizes the candidate pools of the next page. Pages are ordered by
+    score descending, then id ascending.
+    """
+
+    score: float
+    id: int
+    depth: int
+
+    def encode(self, method: str) -> str:
+        raw = json.dumps([method, self.score, self.id, self.depth]).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @classmethod
+    def decode(cls, token: str, method: str) -> "PageCursor":
+        try:
+            cursor_method, score, candidate_id, depth = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            cursor = cls(float(score), int(candidate_id), int(depth))
+        except (binascii.Error, UnicodeError, ValueError, TypeError) as exc:
+            raise ValueError("Invalid cursor.") from exc
+        if cursor_method != method:
+            raise ValueError(f"Cursor was issued for method {cursor_method!r}, not {method!r}.")
+        return cursor
+
+
+def next_cursor(results: list[dict[str, Any]], limit: int, after: PageCursor | None = None) -> PageCursor | None:
+    """Cursor for the page after `results`, or None when this page was the last one."""
+    if not results or len(results) < limit:
+        return None
+    last = results[-1]
+    return PageCursor(last["score"], last["candidate_id"], (after.depth if after else 0) + len(results))
+
+
+def _after_filter(after: PageCursor | None, score: str = "score") -> Q:
+    if after is None:
+        return Q()
+    return Q(**{f"{score}__lt": after.score}) | Q(**{score: after.score, "id__gt": after.id})
+
+
+def _keyset_sql(after: PageCursor | None, score: str, candidate_id: str, params: dict[str, Any]) -> str:
+    """SQL condition selecting rows ranked after the cursor; adds the cursor values to `params`."""
+    if after is None:
+        return "TRUE"
+    params.update(after_score=after.score, after_id=after.id)
+    return (
+        f"({score} < %(after_score)s::float8 "
+        f"OR ({score} = %(after_score)s::float8 AND {candidate_id} > %(after_id)s))"
+    )
+
+
+def metadata_filter(filters: dict[str, Any] | None) -> Q:
+    """
+    Containment test (`metadata @> {key: value}`) per filter key. Scalars must match exactly and
+    list values must all be present in the stored list. One clause per key lets the planner use the
+    jsonb_path_ops GIN index, or a partial ANN index built for that key and value.
+    """
+    return reduce(and_, (Q(metadata__contains={key: value}) for key, value in sorted((filters or {}).items())), Q())
+
+
+def _metadata_filter_sql(filters: dict[str, Any] | None, column: str, params: dict[str, Any]) -> str:
+    """SQL form of metadata_filter for the raw queries; adds the filter documents to `params`."""
+    clauses = []
+    for position, (key, value) in enumerate(sorted((filters or {}).items())):
+        params[f"filter_{position}"] = json.dumps({key: value})
+        clauses.append(f"{column} @> %(filter_{position})s::jsonb")
+    return " AND ".join(clauses) or "TRUE"
+
+
+def result_queryset():
+    """ResumeDocument rows restricted to RESULT_FIELDS plus a DB-side `preview` of the content."""
+    return ResumeDocument.objects.only(*RESULT_FIELDS).annotate(preview=Left("content", PREVIEW_LENGTH + 1))
+
+
+@lru_cache(maxsize=4096)
+def _preview_text(preview: str, html_format: bool, max_length: int | None = PREVIEW_LENGTH) -> str:
+    content_preview = preview
+    if max_length is not None and len(preview) > max_length:
+        content_preview = preview[:max_length] + "..."
     if html_format:
         content_preview = re.sub(r"\n+", "<br>", content_preview)
+    return content_preview
+
+
+def _format_row(
+    candidate_id: int,
+    file_name: str,
+    metadata: dict,
+    preview: str,
+    similarity: float | None,
+    html_format=True,
+    max_length: int | None = PREVIEW_LENGTH,
+    score: float | None = None,
+) -> dict[str, Any]:
+    content_preview = _preview_text(preview, html_format, max_length)
 
     return {
-        "candidate_id": doc.id,
-        "file_name": doc.file_name,
-        "metadata": doc.metadata,
+        "candidate_id": candidate_id,
+        "file_name": file_name,
+        "metadata": metadata,
         "content_preview": content_preview,
         "similarity": similarity,
+        "score": similarity if score is None else score,
     }
 
 
-def generate_embedding(text: str) -> list[float]:
-    url = f"{settings.OLLAMA_BASE_URL}{settings.EMBEDDINGS_ENDPOINT}"
-    payload = {"model": settings.OLLAMA_EMBED_MODEL, "prompt": text}
-    response = requests.post(url, json=payload, timeout=settings.OLLAMA_REQUEST_TIMEOUT)
-    response.raise_for_status()
-    embedding = response.json().get("embedding")
-    if not embedding:
-        raise ValueError(f"No embedding returned from Ollama for model {settings.OLLAMA_EMBED_MODEL}")
-    return [float(value) for value in embedding]
+def _format_result(doc, similarity: float | None, html_format=True, score: float | None = None) -> dict[str, Any]:
+    return _format_row(
+        doc.id, doc.file_name, doc.metadata, doc.preview, similarity, html_format=html_format, score=score
+    )
+
+
+def generate_embedding(text: str, model: str | None = None) -> list[float]:
+    """Query embedding from `model`, by default OLLAMA_EMBED_MODEL."""
+    return cached_embedding(text, partial(_request_embedding, model=model), model)
+
+
+def generate_embeddings(texts: list[str], model: str | None = None) -> list[list[float]]:
+    """Query embeddings for several texts; those not cached are embedded in batched requests."""
+    return cached_embeddings(texts, partial(_request_embeddings, model=model), model)
+
+
+def _request_embeddings(texts: list[str], model: str | None = None) -> list[list[float]]:
+    # Sent in ingestion-sized requests, so each one fits within the search profile's timeout however
+    # many queries a batch search carries.
+    client = get_embedding_client("search")
+    size = max(1, settings.OLLAMA_EMBED_BATCH_SIZE)
+    embeddings = []
+    for start in range(0, len(texts), size):
+        embeddings.extend(client.embed(texts[start : start + size], model))
+    return [[float(value) for value in embedding] for embedding in embeddings]
+
+
+def _request_embedding(text: str, model: str | None = None) -> list[float]:
+    return [float(value) for value in get_embedding_client("search").embed_one(text, model)]
+
+
+@lru_cache(maxsize=1)
+def pgvector_version() -> tuple[int, ...]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        row = cursor.fetchone()
+    if not row:
+        return ()
+    return tuple(int(part) for part in row[0].split(".") if part.isdigit())
+
+
+def create_index_concurrently(index: Index, model: type[Model]) -> None:
+    """
+    Build `index` on `model`'s table with CREATE INDEX CONCURRENTLY unless a valid index of that name
+    exists. A concurrent build that failed or was interrupted leaves an INVALID index behind that the
+    planner never uses; it is dropped and built again.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(%s)",
+            [connection.ops.quote_name(index.name)],
+        )
+        row = cursor.fetchone()
+    if row is not None and row[0]:
+        return
+    with connection.schema_editor(atomic=False) as schema_editor:
+        if row is not None:
+            schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(index.name)}")
+        sql = str(index.create_sql(model, schema_editor, concurrently=True))
+        # IF NOT EXISTS still guards against another process building the same index meanwhile.
+        schema_editor.execute(sql.replace("CREATE INDEX CONCURRENTLY", "CREATE INDEX CONCURRENTLY IF NOT EXISTS"))
+
+
+@contextmanager
+def ann_search_session(
+    limit: int = 0,
+    ef_search: int | None = None,
+    probes: int | None = None,
+    exact: bool = False,
+    filtered: bool = False,
+) -> Iterator[None]:
+    """
+    Apply pgvector query-time settings to the queries evaluated inside the block.
+
+    HNSW never returns more than `hnsw.ef_search` rows, so it is raised to at least `limit`; past
+    HNSW_MAX_EF_SEARCH the block runs exact. With `exact=True` index scans are disabled and the
+    ordering falls back to an exact scan.
+
+    `filtered=True` marks queries whose WHERE clause drops rows the index returns. They use
+    iterative index scans (VECTOR_ITERATIVE_SCAN) so a selective filter still fills `limit`; on
+    pgvector before 0.8 ef_search is raised to its maximum instead.
+    """
+    if connection.vendor != "postgresql":
+        yield
+        return
+
+    exact = exact or limit > HNSW_MAX_EF_SEARCH
+    ef_search = min(max(ef_search or settings.VECTOR_HNSW_EF_SEARCH, limit), HNSW_MAX_EF_SEARCH)
+    probes = probes or settings.VECTOR_IVFFLAT_PROBES
+    iterative = filtered and not exact and settings.VECTOR_ITERATIVE_SCAN != "off"
+    if iterative and pgvector_version() < ITERATIVE_SCAN_VERSION:
+        iterative = False
+        ef_search = HNSW_MAX_EF_SEARCH
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('hnsw.ef_search', %s, true), set_config('ivfflat.probes', %s, true)",
+                [str(ef_search), str(probes)],
+            )
+            if iterative:
+                # IVFFlat only implements relaxed ordering; callers re-sort their results anyway.
+                cursor.execute(
+                    "SELECT set_config('hnsw.iterative_scan', %s, true), "
+                    "set_config('ivfflat.iterative_scan', 'relaxed_order', true)",
+                    [settings.VECTOR_ITERATIVE_SCAN],
+                )
+            if exact:
+                cursor.execute("SELECT set_config('enable_indexscan', 'off', true)")
+        yield
 
 
 def parse_json_block(raw_text: str) -> dict[str, Any]:
@@ -72,65 +293,583 @@ def parse_json_block(raw_text: str) -> dict[str, Any]:
 #     }
 
 
-def search_candidates(query_embedding: list[float], limit: int = 10) -> list[dict[str, Any]]:
-    documents = (
-        ResumeDocument.objects.annotate(distance=CosineDistance("embedding", query_embedding))
-        .order_by("distance")[:limit]
+def _vector_queryset(query_embedding: list[float], embedding_model: EmbeddingModel | None = None):
+    """Results annotated with distance and score, against `embedding_model`'s vectors when given."""
+    queryset = result_queryset()
+    column = "embedding"
+    if embedding_model is not None:
+        # Unique per (document, model), so the join never multiplies rows; resumes without a vector drop out.
+        queryset = queryset.annotate(
+            model_embedding=FilteredRelation("model_embeddings", condition=Q(model_embeddings__model=embedding_model))
+        ).filter(model_embedding__isnull=False)
+        column = "model_embedding__embedding"
+    distance = CosineDistance(column, query_embedding)
+    return queryset.annotate(
+        distance=distance, score=ExpressionWrapper(Value(1.0) - distance, output_field=FloatField())
     )
-    results: list[dict[str, Any]] = []
-    for doc in documents:
-        distance = getattr(doc, "distance", None)
-        similarity = 1 - float(distance) if distance is not None else None
-        results.append(_format_result(doc, similarity))
+
+
+def binary_quantize(embedding) -> str:
+    """Sign bits of an embedding as a bit string, as pgvector's binary_quantize() computes them."""
+    return "".join("1" if value > 0 else "0" for value in embedding)
+
+
+def search_precision() -> str:
+    precision = settings.EMBEDDING_PRECISION
+    if precision not in EMBEDDING_PRECISIONS:
+        raise ImproperlyConfigured(f"EMBEDDING_PRECISION must be one of {', '.join(EMBEDDING_PRECISIONS)}")
+    if precision != "full" and pgvector_version() < COMPRESSED_INDEX_VERSION:
+        raise ImproperlyConfigured(f"EMBEDDING_PRECISION={precision} needs pgvector >= 0.7 on the database server")
+    return precision
+
+
+def search_backend() -> str:
+    backend = settings.SEARCH_BACKEND
+    if backend not in SEARCH_BACKENDS:
+        raise ImproperlyConfigured(f"SEARCH_BACKEND must be one of {', '.join(SEARCH_BACKENDS)}")
+    return backend
+
+
+def _ann_depth(pool: int, embedding_model: EmbeddingModel | None = None) -> int:
+    """Rows the ANN index has to return for `pool` results: compressed passes over-fetch for re-ranking."""
+    if embedding_model is not None or search_precision() == "full":
+        return pool
+    return pool * settings.EMBEDDING_RERANK_FACTOR
+
+
+def _model_semantic_sql(
+    embedding_model: EmbeddingModel, filters: dict[str, Any] | None, params: dict[str, Any], query_vector: str
+) -> str:
+    """Nearest-resume SQL over a re-embedding model's vectors, shaped to use its partial ANN index."""
+    table = connection.ops.quote_name(ResumeEmbedding._meta.db_table)
+    params["embedding_model"] = embedding_model.pk
+    in_filtered = ""
+    if filters:
+        document_table = connection.ops.quote_name(ResumeDocument._meta.db_table)
+        in_filtered = (
+            f"AND document_id IN (SELECT id FROM {document_table} "
+            f"WHERE {_metadata_filter_sql(filters, 'metadata', params)})"
+        )
+    return f"""
+        SELECT document_id AS id, embedding::vector({embedding_model.dimensions}) <=> {query_vector} AS distance
+        FROM {table}
+        WHERE model_id = %(embedding_model)s {in_filtered}
+        ORDER BY distance
+        LIMIT %(pool)s
+    """
+
+
+def _semantic_sql(
+    query_embedding: list[float] | None,
+    filters: dict[str, Any] | None,
+    params: dict[str, Any],
+    embedding_model: EmbeddingModel | None = None,
+    query_vector: str | None = None,
+) -> str:
+    """
+    SQL selecting (id, distance) of the `%(pool)s` resumes nearest to the query. With a compressed
+    EMBEDDING_PRECISION the index pass runs on the halfvec or binary form over `_ann_depth(pool)` rows,
+    which are re-ranked by exact cosine distance on the full embedding. A re-embedding model's
+    vectors are always searched at full precision. `query_vector` replaces the bound query
+    embedding with an SQL expression, such as a column of an outer query.
+    """
+    table = connection.ops.quote_name(ResumeDocument._meta.db_table)
+    if query_vector is None:
+        params["embedding"] = Vector(query_embedding).to_text()
+        query_vector = "%(embedding)s::vector"
+    if embedding_model is not None:
+        return _model_semantic_sql(embedding_model, filters, params, query_vector)
+    matches_filters = _metadata_filter_sql(filters, "metadata", params)
+    precision = search_precision()
+    if precision == "full":
+        return f"""
+            SELECT id, embedding <=> {query_vector} AS distance
+            FROM {table}
+            WHERE {matches_filters}
+            ORDER BY distance
+            LIMIT %(pool)s
+        """
+    dimensions = settings.EMBEDDING_DIMENSION
+    if precision == "binary":
+        if query_embedding is not None:
+            params["embedding_bits"] = binary_quantize(query_embedding)
+            coarse = f"embedding_binary <~> %(embedding_bits)s::bit({dimensions})"
+        else:
+            coarse = f"embedding_binary <~> binary_quantize({query_vector})::bit({dimensions})"
+    else:
+        coarse = f"embedding::halfvec({dimensions}) <=> ({query_vector})::halfvec({dimensions})"
+    params["coarse_pool"] = _ann_depth(params["pool"])
+    return f"""
+        SELECT id, embedding <=> {query_vector} AS distance
+        FROM (
+            SELECT id, embedding
+            FROM {table}
+            WHERE {matches_filters}
+            ORDER BY {coarse}
+            LIMIT %(coarse_pool)s
+        ) coarse
+        ORDER BY distance
+        LIMIT %(pool)s
+    """
+
+
+def _nearest_ids(
+    query_embedding: list[float],
+    pool: int,
+    filters: dict[str, Any] | None,
+    embedding_model: EmbeddingModel | None = None,
+):
+    """
+    Ids of the `pool` nearest resumes matching `filters`, as a subquery when the full-precision
+    index answers directly, or fetched through the two-phase (compressed, then exact) query.
+    """
+    if embedding_model is not None:
+        nearest = ResumeEmbedding.objects.filter(model=embedding_model)
+        if filters:
+            nearest = nearest.filter(document__in=ResumeDocument.objects.filter(metadata_filter(filters)).values("id"))
+        return nearest.order_by(CosineDistance(embedding_model.vector(), query_embedding)).values("document_id")[:pool]
+    if search_precision() == "full":
+        return (
+            ResumeDocument.objects.filter(metadata_filter(filters))
+            .order_by(CosineDistance("embedding", query_embedding))
+            .values("id")[:pool]
+        )
+    params: dict[str, Any] = {"pool": pool}
+    sql = _semantic_sql(query_embedding, filters, params)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT id FROM ({sql}) nearest", params)
+        return [candidate_id for candidate_id, in cursor.fetchall()]
+
+
+def search_candidates(
+    query_embedding: list[float],
+    limit: int = 10,
+    after: PageCursor | None = None,
+    filters: dict[str, Any] | None = None,
+    embedding_model: EmbeddingModel | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Nearest resumes by cosine similarity. The ANN index can only order by distance, so the nearest
+    `depth + 2 * limit` ids are taken from it and the page is ordered by (score, id) among those;
+    the slack keeps rows with equal scores from straddling a page boundary. `filters` restrict the
+    metadata (see metadata_filter) inside the index scan. `embedding_model` searches that model's
+    vectors instead of the primary embedding; the query must have been embedded with it.
+
+    With SEARCH_BACKEND="local", unfiltered primary-model searches are answered by the in-process
+    index (an exact scan) without querying the database.
+    """
+    if search_backend() == "local" and not filters and embedding_model is None:
+        matches = get_local_index().search(query_embedding, limit, (after.score, after.id) if after else None)
+        return [
+            _format_row(candidate_id, file_name, metadata, preview, score)
+            for candidate_id, score, (file_name, metadata, preview) in matches
+        ]
+
+    pool = (after.depth if after else 0) + 2 * limit
+    with ann_search_session(_ann_depth(pool, embedding_model), filtered=bool(filters)):
+        documents = list(
+            _vector_queryset(query_embedding, embedding_model)
+            .filter(id__in=_nearest_ids(query_embedding, pool, filters, embedding_model))
+            .filter(_after_filter(after))
+            .order_by("-score", "id")[:limit]
+        )
+    return [_format_result(doc, float(doc.score)) for doc in documents]
+
+
+def batch_search_candidates(
+    query_embeddings: list[list[float]],
+    limit: int = 10,
+    filters: dict[str, Any] | None = None,
+    embedding_model: EmbeddingModel | None = None,
+) -> list[list[dict[str, Any]]]:
+    """
+    Top `limit` resumes by cosine similarity for each of several query embeddings, in one statement:
+    the queries are a VALUES list and each row drives its own index-ordered nearest-neighbour scan
+    through a LATERAL join. Returns one result list per query, in input order.
+    """
+    if not query_embeddings:
+        return []
+    table = connection.ops.quote_name(ResumeDocument._meta.db_table)
+    params: dict[str, Any] = {"pool": limit, "preview": PREVIEW_LENGTH + 1}
+    rows = []
+    for position, embedding in enumerate(query_embeddings):
+        params[f"query_{position}"] = Vector(embedding).to_text()
+        rows.append(f"({position}, %(query_{position})s::vector)")
+    nearest = _semantic_sql(None, filters, params, embedding_model, query_vector="queries.embedding")
+    sql = f"""
+        WITH queries (position, embedding) AS (VALUES {", ".join(rows)})
+        SELECT queries.position, doc.id, doc.file_name, doc.metadata, LEFT(doc.content, %(preview)s),
+               1 - nearest.distance AS similarity, 1 - nearest.distance AS score
+        FROM queries
+        CROSS JOIN LATERAL ({nearest}) nearest
+        JOIN {table} doc ON doc.id = nearest.id
+        ORDER BY queries.position, nearest.distance, doc.id
+    """
+    with ann_search_session(_ann_depth(limit, embedding_model), filtered=bool(filters)):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+    results: list[list[dict[str, Any]]] = [[] for _ in query_embeddings]
+    for position, *row in rows:
+        results[position].append(_format_rrf_row(row))
     return results
 
 
+def _keyword_hits(keywords: list[str]):
+    """
+    Non-overlapping occurrences of each keyword in the lower-cased content, summed in SQL
+    (what str.count does), so resume bodies never leave the database.
+    """
+    if not keywords:
+        return Value(0, output_field=IntegerField())
+    lowered = Lower("content")
+    counts = [
+        (Length(lowered) - Length(Replace(lowered, Value(keyword), Value("")))) / len(keyword) for keyword in keywords
+    ]
+    return ExpressionWrapper(reduce(add, counts), output_field=IntegerField())
+
+
 def hybrid_search_candidates(
-    query_text: str, query_embedding: list[float], limit: int = 10, shortlist: int = 30, lexical_weight: float = 0.35
+    query_text: str,
+    query_embedding: list[float],
+    limit: int = 10,
+    shortlist: int = 30,
+    lexical_weight: float = 0.35,
+    after: PageCursor | None = None,
+    filters: dict[str, Any] | None = None,
+    embedding_model: EmbeddingModel | None = None,
 ) -> list[dict[str, Any]]:
     """
     Two-stage hybrid search:
     1. Vector shortlist using cosine distance.
     2. Re-rank shortlist by combining vector similarity with simple lexical overlap.
+    The shortlist depends only on the page size, so all pages of a query re-rank the same rows.
     """
     keywords = [tok.lower() for tok in query_text.replace(",", " ").split() if len(tok.strip()) > 2]
+    shortlist = max(shortlist, limit)
 
-    candidates = (
-        ResumeDocument.objects.annotate(distance=CosineDistance("embedding", query_embedding))
-        .order_by("distance")[:shortlist]
-    )
+    with ann_search_session(_ann_depth(shortlist, embedding_model), filtered=bool(filters)):
+        candidates = list(
+            _vector_queryset(query_embedding, embedding_model)
+            .filter(id__in=_nearest_ids(query_embedding, shortlist, filters, embedding_model))
+            .annotate(lexical_hits=_keyword_hits(keywords))
+        )
 
     scored = []
     for doc in candidates:
         distance = getattr(doc, "distance", None)
         base_similarity = 1 - float(distance) if distance is not None else 0.0
 
-        lexical_hits = 0
-        if keywords:
-            content_lower = doc.content.lower()
-            lexical_hits = sum(content_lower.count(kw) for kw in keywords)
+        lexical_hits = doc.lexical_hits
         lexical_score = min(1.0, lexical_hits / max(1, len(keywords)))
 
         combined_score = (base_similarity * (1 - lexical_weight)) + (lexical_score * lexical_weight)
-        scored.append((combined_score, _format_result(doc, base_similarity)))
+        if after is None or (combined_score, -doc.id) < (after.score, -after.id):
+            scored.append((combined_score, doc.id, _format_result(doc, base_similarity, score=combined_score)))
 
-    scored.sort(key=lambda item: item[0], reverse=True)
-    return [item[1] for item in scored[:limit]]
+    scored.sort(key=lambda item: (-item[0], item[1]))
+    return [item[2] for item in scored[:limit]]
 
 
-def bm25_search_candidates(query_text: str, limit: int = 10) -> list[dict[str, Any]]:
-    """
-    Lexical/BM25-style search using PostgreSQL full-text ranking.
-    """
-    vector = SearchVector("content", config="english")
+def _bm25_queryset(query_text: str, filters: dict[str, Any] | None = None):
     query = SearchQuery(query_text, search_type="plain", config="english")
-    documents = (
-        ResumeDocument.objects.annotate(rank=SearchRank(vector, query))
+    # Ranking uses the plain (AND) query as before; the index filter matches any of the terms.
+    any_term = reduce(or_, (SearchQuery(term, config="english") for term in query_text.split()), query)
+    return (
+        result_queryset()
+        .filter(search_vector=any_term)
+        .filter(metadata_filter(filters))
+        # ts_rank returns real; as double the value round-trips exactly through a page cursor.
+        .annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
         .filter(rank__gt=0)
-        .order_by("-rank")[:limit]
+        .order_by("-rank", "id")
     )
+
+
+def bm25_search_candidates(
+    query_text: str, limit: int = 10, after: PageCursor | None = None, filters: dict[str, Any] | None = None
+) -> list[dict[str, Any]]:
+    """
+    Lexical/BM25-style search using PostgreSQL full-text ranking over the stored, GIN-indexed
+    `search_vector` column, so matching is an index lookup instead of a parse of every resume.
+    """
+    documents = _bm25_queryset(query_text, filters).filter(_after_filter(after, "rank"))[:limit]
     results = []
     for doc in documents:
         rank = getattr(doc, "rank", None)
         results.append(_format_result(doc, rank, html_format=True))
     return results
+
+
+def _rrf_sql(
+    query_text: str,
+    query_embedding: list[float],
+    limit: int | None,
+    candidate_pool: int,
+    rrf_k: int,
+    semantic_weight: float,
+    lexical_weight: float,
+    after: PageCursor | None,
+    filters: dict[str, Any] | None,
+    embedding_model: EmbeddingModel | None = None,
+) -> tuple[str, dict[str, Any]]:
+    table = connection.ops.quote_name(ResumeDocument._meta.db_table)
+    params = {
+        "text": query_text,
+        "pool": candidate_pool,
+        "limit": limit,
+        "rrf_k": float(rrf_k),
+        "semantic_weight": float(semantic_weight),
+        "lexical_weight": float(lexical_weight),
+        "preview": PREVIEW_LENGTH + 1,
+    }
+    keyset = _keyset_sql(after, "score", "id", params)
+    matches_filters = _metadata_filter_sql(filters, "metadata", params)
+    semantic = _semantic_sql(query_embedding, filters, params, embedding_model)
+    vector = "doc.embedding"
+    if embedding_model is not None:
+        vector = (
+            f"(SELECT embedding FROM {connection.ops.quote_name(ResumeEmbedding._meta.db_table)} "
+            "WHERE document_id = doc.id AND model_id = %(embedding_model)s)"
+        )
+    sql = f"""
+        WITH semantic AS (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY distance, id) AS rank
+            FROM ({semantic}) nearest
+        ),
+        lexical AS (
+            SELECT id, ROW_NUMBER() OVER (ORDER BY score DESC, id) AS rank
+            FROM (
+                SELECT id, ts_rank(search_vector, plainto_tsquery('english', %(text)s)) AS score
+                FROM {table}
+                -- match any of the query terms, as bm25_search_candidates does
+                WHERE search_vector @@ replace(plainto_tsquery('english', %(text)s)::text, '&', '|')::tsquery
+                    AND {matches_filters}
+                ORDER BY score DESC, id
+                LIMIT %(pool)s
+            ) matched
+        ),
+        fused AS (
+            SELECT
+                COALESCE(semantic.id, lexical.id) AS id,
+                -- float8 rather than numeric, so scores round-trip exactly through page cursors
+                COALESCE(%(semantic_weight)s::float8 / (%(rrf_k)s + semantic.rank), 0)
+                    + COALESCE(%(lexical_weight)s::float8 / (%(rrf_k)s + lexical.rank), 0) AS score
+            FROM semantic
+            FULL OUTER JOIN lexical ON semantic.id = lexical.id
+        ),
+        page AS (
+            SELECT id, score
+            FROM fused
+            WHERE {keyset}
+            ORDER BY score DESC, id
+            LIMIT %(limit)s
+        )
+        SELECT doc.id, doc.file_name, doc.metadata, LEFT(doc.content, %(preview)s),
+               1 - ({vector} <=> %(embedding)s::vector) AS similarity, page.score
+        FROM page
+        JOIN {table} doc ON doc.id = page.id
+        ORDER BY page.score DESC, page.id
+    """
+    return sql, params
+
+
+def rrf_search_candidates(
+    query_text: str,
+    query_embedding: list[float],
+    limit: int = 10,
+    candidate_pool: int = 50,
+    rrf_k: int = 60,
+    semantic_weight: float = 1.0,
+    lexical_weight: float = 1.0,
+    after: PageCursor | None = None,
+    filters: dict[str, Any] | None = None,
+    embedding_model: EmbeddingModel | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Hybrid search fused inside Postgres with Reciprocal Rank Fusion.
+
+    The ANN and full-text candidate sets (each `candidate_pool` deep) are computed as CTEs and
+    fused with weight / (rrf_k + rank); only the final `limit` rows, and only the columns the
+    result needs, are returned. `similarity` is the cosine similarity of each returned row and
+    `score` its fused RRF score. The pool depends only on the page size, so every page of a query
+    is cut from the same fused ranking and paging ends once both candidate sets are exhausted.
+    """
+    pool = max(candidate_pool, limit)
+    sql, params = _rrf_sql(
+        query_text,
+        query_embedding,
+        limit,
+        pool,
+        rrf_k,
+        semantic_weight,
+        lexical_weight,
+        after,
+        filters,
+        embedding_model,
+    )
+    with ann_search_session(_ann_depth(pool, embedding_model), filtered=bool(filters)):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    return [_format_rrf_row(row) for row in rows]
+
+
+def _format_rrf_row(row, html_format=True) -> dict[str, Any]:
+    candidate_id, file_name, metadata, preview, similarity, score = row
+    metadata_field = ResumeDocument._meta.get_field("metadata")
+    return _format_row(
+        candidate_id,
+        file_name,
+        metadata_field.from_db_value(metadata, None, connection),
+        preview,
+        float(similarity) if similarity is not None else None,
+        html_format=html_format,
+        score=float(score),
+    )
+
+
+def _passage_sql(
+    query_embedding: list[float],
+    limit: int | None,
+    pool: int,
+    aggregate: str,
+    top_k: int,
+    after: PageCursor | None,
+    filters: dict[str, Any] | None,
+) -> tuple[str, dict[str, Any]]:
+    if aggregate not in {"max", "sum"}:
+        raise ValueError(f"Unsupported passage aggregate {aggregate!r}")
+    score = "best" if aggregate == "max" else "top_sum"
+    chunk_table = connection.ops.quote_name(ResumeChunk._meta.db_table)
+    document_table = connection.ops.quote_name(ResumeDocument._meta.db_table)
+    params = {"embedding": Vector(query_embedding).to_text(), "pool": pool, "top_k": top_k, "limit": limit}
+    keyset = _keyset_sql(after, f"scored.{score}", "doc.id", params)
+    in_filtered = ""
+    if filters:
+        in_filtered = (
+            f"WHERE document_id IN (SELECT id FROM {document_table} "
+            f"WHERE {_metadata_filter_sql(filters, 'metadata', params)})"
+        )
+    sql = f"""
+        WITH hits AS (
+            SELECT document_id, content, 1 - (embedding <=> %(embedding)s::vector) AS similarity
+            FROM {chunk_table}
+            {in_filtered}
+            ORDER BY embedding <=> %(embedding)s::vector
+            LIMIT %(pool)s
+        ),
+        ranked AS (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY document_id ORDER BY similarity DESC) AS position
+            FROM hits
+        ),
+        scored AS (
+            SELECT
+                document_id,
+                MAX(similarity) AS best,
+                SUM(similarity) FILTER (WHERE position <= %(top_k)s) AS top_sum,
+                MAX(content) FILTER (WHERE position = 1) AS passage
+            FROM ranked
+            GROUP BY document_id
+        )
+        SELECT doc.id, doc.file_name, doc.metadata, scored.passage, scored.best, scored.{score}
+        FROM scored
+        JOIN {document_table} doc ON doc.id = scored.document_id
+        WHERE {keyset}
+        ORDER BY scored.{score} DESC, doc.id
+        LIMIT %(limit)s
+    """
+    return sql, params
+
+
+def passage_search_candidates(
+    query_embedding: list[float],
+    limit: int = 10,
+    candidate_pool: int | None = None,
+    aggregate: str = "max",
+    top_k: int = 3,
+    after: PageCursor | None = None,
+    filters: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Passage-level vector search over ResumeChunk embeddings.
+
+    The nearest `candidate_pool` passages are aggregated per resume, scoring either by the best
+    passage (`aggregate="max"`) or by the sum of its `top_k` best passages (`aggregate="sum"`).
+    The best-matching passage is returned as the preview and its cosine similarity as `similarity`.
+    """
+    pool = candidate_pool or max(((after.depth if after else 0) + limit) * 10, 100)
+    sql, params = _passage_sql(query_embedding, limit, pool, aggregate, top_k, after, filters)
+    with ann_search_session(pool, filtered=bool(filters)):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    return [_format_passage_row(row) for row in rows]
+
+
+def _format_passage_row(row, html_format=True) -> dict[str, Any]:
+    candidate_id, file_name, metadata, passage, similarity, score = row
+    metadata_field = ResumeDocument._meta.get_field("metadata")
+    return _format_row(
+        candidate_id,
+        file_name,
+        metadata_field.from_db_value(metadata, None, connection),
+        passage,
+        float(similarity),
+        html_format=html_format,
+        max_length=None,
+        score=float(score),
+    )
+
+
+def _stream_sql(sql: str, params: dict[str, Any]) -> Iterator[tuple]:
+    # chunked_cursor() is a named (server-side) cursor on PostgreSQL: rows arrive in batches.
+    with connection.chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while rows := cursor.fetchmany(STREAM_FETCH_SIZE):
+            yield from rows
+
+
+def stream_search_candidates(
+    method: str,
+    query_text: str,
+    query_embedding: list[float] | None,
+    limit: int,
+    filters: dict[str, Any] | None = None,
+    embedding_model: EmbeddingModel | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield up to `limit` results in ranking order from a server-side cursor, for exports too large
+    to build as a list. The pgvector session (and its transaction) stays open while the caller
+    consumes the generator. Hybrid re-ranks in Python and cannot stream; use rrf instead. Passages
+    are always searched with the primary model.
+    """
+    if method == "hybrid":
+        raise ValueError("The hybrid method re-ranks in Python and cannot be streamed; use rrf.")
+
+    if method == "bm25":
+        with ann_search_session():
+            for doc in _bm25_queryset(query_text, filters)[:limit].iterator(chunk_size=STREAM_FETCH_SIZE):
+                yield _format_result(doc, doc.rank, html_format=False)
+    elif method == "rrf":
+        pool = max(50, limit)
+        sql, params = _rrf_sql(query_text, query_embedding, limit, pool, 60, 1.0, 1.0, None, filters, embedding_model)
+        with ann_search_session(_ann_depth(pool, embedding_model), filtered=bool(filters)):
+            for row in _stream_sql(sql, params):
+                yield _format_rrf_row(row, html_format=False)
+    elif method == "passage":
+        pool = max(limit * 10, 100)
+        sql, params = _passage_sql(query_embedding, limit, pool, "max", 3, None, filters)
+        with ann_search_session(pool, filtered=bool(filters)):
+            for row in _stream_sql(sql, params):
+                yield _format_passage_row(row, html_format=False)
+    else:
+        documents = (
+            _vector_queryset(query_embedding, embedding_model)
+            .filter(metadata_filter(filters))
+            .order_by("distance", "id")[:limit]
+        )
+        with ann_search_session(limit, filtered=bool(filters)):
+            for doc in documents.iterator(chunk_size=STREAM_FETCH_SIZE):
+                yield _format_result(doc, float(doc.score), html_format=False)
@@ -0,0 +1,122 @@
+"""
+Streaming record sources for ingestion: JSONL dumps, zip archives and tar.gz archives are read one
+record at a time, so exports never have to be exploded onto disk.
+
+Every record carries its ordinal `offset` within the source (and, for JSONL, the byte position
+after its line), which is what ingestion checkpoints record so a failed run can resume where the
+last committed batch ended.
+"""
+from __future__ import annotations
+
+import json
+import os
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Iterator
+
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+TAR_SUFFIXES = (".tar.gz", ".tgz", ".tar")
+
+
+@dataclass
+class SourceRecord:
+    """One resume read from a stream source: raw file bytes from an archive, or a parsed JSONL object."""
+
+    name: str
+    offset: int
+    raw: bytes | None = None
+    payload: dict[str, object] | None = None
+    position: int | None = None
+
+
+def is_stream_source(path: Path) -> bool:
+    name = path.name.lower()
+    return path.is_file() and (name.endswith(JSONL_SUFFIXES) or name.endswith(TAR_SUFFIXES) or name.endswith(".zip"))
+
+
+def _jsonl_records(path: Path, start: int, position: int | None) -> Iterator[SourceRecord]:
+    with path.open("rb") as handle:
+        offset = 0
+        if position is not None:
+            handle.seek(position)
+            offset = start
+        for line in iter(handle.readline, b""):
+            if offset < start:
+                offset += 1
+                continue
+            if line.strip():
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise ValueError(f"Invalid JSON on line {offset + 1} of {path.name}: {exc}") from exc
+                name = payload.get("file_name") or payload.get("id") or f"{path.stem}-{offset}"
+                yield SourceRecord(name=str(name), offset=offset, payload=payload, position=handle.tell())
+            else:
+                # Blank lines still count, so offsets match line numbers of the dump.
+                yield SourceRecord(name="", offset=offset, position=handle.tell())
+            offset += 1
+
+
+def _zip_records(path: Path, start: int, suffixes: set[str]) -> Iterator[SourceRecord]:
+    with zipfile.ZipFile(path) as archive:
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        for offset, info in enumerate(members):
+            if offset < start:
+                continue
+            name = PurePosixPath(info.filename).name
+            raw = archive.read(info) if PurePosixPath(name).suffix.lower() in suffixes else None
+            yield SourceRecord(name=name, offset=offset, raw=raw)
+
+
+def _tar_records(path: Path, start: int, suffixes: set[str]) -> Iterator[SourceRecord]:
+    # Stream mode decompresses sequentially and never seeks, so memory stays bounded by one member.
+    with tarfile.open(path, mode="r|*") as archive:
+        offset = 0
+        for member in archive:
+            if not member.isfile():
+                continue
+            if offset >= start:
+                name = PurePosixPath(member.name).name
+                raw = None
+                if PurePosixPath(name).suffix.lower() in suffixes:
+                    raw = archive.extractfile(member).read()
+                yield SourceRecord(name=name, offset=offset, raw=raw)
+            offset += 1
+
+
+def iter_source(
+    path: Path, suffixes: set[str], start: int = 0, position: int | None = None
+) -> Iterator[SourceRecord]:
+    """
+    Yield records from `path` beginning at ordinal `start` (JSONL can seek straight to `position`).
+    Archive members with unsupported suffixes and blank JSONL lines are yielded without content so
+    offsets stay contiguous; callers skip them.
+    """
+    name = path.name.lower()
+    if name.endswith(JSONL_SUFFIXES):
+        return _jsonl_records(path, start, position)
+    if name.endswith(".zip"):
+        return _zip_records(path, start, suffixes)
+    if name.endswith(TAR_SUFFIXES):
+        return _tar_records(path, start, suffixes)
+    raise ValueError(f"Unsupported stream source {path.name}; expected JSONL, zip or tar.gz")
+
+
+def load_checkpoint(checkpoint: Path, source: Path) -> tuple[int, int | None]:
+    """Return (offset, position) stored for `source`, or (0, None) when there is no checkpoint yet."""
+    if not checkpoint.exists():
+        return 0, None
+    state = json.loads(checkpoint.read_text(encoding="utf-8"))
+    if state.get("source") != str(source.resolve()):
+        raise ValueError(f"Checkpoint {checkpoint} belongs to {state.get('source')}, not {source}")
+    return int(state["offset"]), state.get("position")
+
+
+def save_checkpoint(checkpoint: Path, source: Path, offset: int, position: int | None) -> None:
+    temporary = checkpoint.with_name(f"{checkpoint.name}.tmp")
+    temporary.write_text(
+        json.dumps({"source": str(source.resolve()), "offset": offset, "position": position}), encoding="utf-8"
+    )
+    os.replace(temporary, checkpoint)
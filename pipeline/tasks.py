@@ -1,19 +1,39 @@
+import hashlib
+import io
 import json
 import logging
-from pathlib import Path
-from typing import Iterable
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Callable, Iterable, Iterator
 
-import requests
+import django
 from PyPDF2 import PdfReader
-from celery import shared_task
+from celery import chord, shared_task
 from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 
-from .models import ResumeDocument
+from .metrics import record_ingestion
+from .cache import bump_corpus_version
+from .embedding_client import get_embedding_client
+from .embedding_models import build_model_index, pending_documents
+from .models import EmbeddingModel, ResumeChunk, ResumeDocument, ResumeEmbedding
+from .profiling import IngestionStats, merge_stats
+from .search_utils import binary_quantize
+from .sources import SourceRecord, iter_source, load_checkpoint, save_checkpoint
+from .text_cache import get_text, put_text
 
 logger = logging.getLogger(__name__)
 SUPPORTED_EXTENSIONS = {".txt", ".md", ".json", ".pdf"}
-EMBEDDINGS_ENDPOINT = "/api/embeddings"
+FINGERPRINT_FIELDS = ("content_hash", "file_size", "file_mtime")
+MANIFEST_BATCH_SIZE = 500
+UPSERT_FIELDS = ["content", "metadata", "embedding", "embedding_binary", *FINGERPRINT_FIELDS, "updated_at"]
 
 
 def list_resume_files(directory: Path) -> Iterable[Path]:
@@ -22,11 +42,100 @@ def list_resume_files(directory: Path) -> Iterable[Path]:
             yield path
 
 
-def extract_pdf_content(file_path: Path) -> tuple[str, dict[str, object]]:
+def fingerprint_file(file_path: Path, stat: os.stat_result | None = None) -> dict[str, object]:
+    stat = stat or file_path.stat()
+    digest = hashlib.sha256()
+    with file_path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return {"content_hash": digest.hexdigest(), "file_size": stat.st_size, "file_mtime": stat.st_mtime}
+
+
+def _copy_duplicate(original: ResumeDocument, file_path: Path, fingerprint: dict[str, object]) -> None:
+    metadata = dict(original.metadata or {})
+    if "source" in metadata:
+        metadata["source"] = file_path.name
+    with transaction.atomic():
+        duplicate = ResumeDocument.objects.create(
+            file_name=file_path.name,
+            content=original.content,
+            metadata=metadata,
+            embedding=original.embedding,
+            embedding_binary=original.embedding_binary,
+            **fingerprint,
+        )
+        replace_chunks([(duplicate, [(chunk.content, chunk.embedding) for chunk in original.chunks.all()])])
+        transaction.on_commit(bump_corpus_version)
+
+
+def select_changed_files(
+    file_paths: Iterable[Path],
+    fingerprints: dict[Path, dict[str, object]],
+    result: dict[str, object],
+    stats: IngestionStats | None = None,
+) -> Iterator[Path]:
+    """
+    Pre-pass against the manifest stored on ResumeDocument that yields only new or changed files,
+    recording their fingerprints in `fingerprints`. Files whose size and mtime match are skipped
+    without being read, touched files with identical bytes only refresh the manifest, and new
+    byte-identical copies of an ingested file reuse its text and embedding.
+    """
+    stats = stats or IngestionStats()
+    remaining = iter(file_paths)
+    while batch := list(islice(remaining, MANIFEST_BATCH_SIZE)):
+        with stats.timer("manifest"):
+            manifest = {
+                row["file_name"]: row
+                for row in ResumeDocument.objects.filter(file_name__in=[path.name for path in batch]).values(
+                    "file_name", *FINGERPRINT_FIELDS
+                )
+            }
+
+            candidates: list[tuple[Path, dict[str, object], bool]] = []
+            for file_path in batch:
+                known = manifest.get(file_path.name)
+                try:
+                    stat = file_path.stat()
+                    if known and known["file_size"] == stat.st_size and known["file_mtime"] == stat.st_mtime:
+                        result["skipped"] += 1
+                        continue
+                    fingerprint = fingerprint_file(file_path, stat)
+                except OSError as exc:
+                    error_msg = f"Failed to ingest {file_path.name}: {exc}"
+                    logger.error(error_msg)
+                    result["errors"].append(error_msg)
+                    continue
+
+                if known and known["content_hash"] == fingerprint["content_hash"]:
+                    ResumeDocument.objects.filter(file_name=file_path.name).update(**fingerprint)
+                    result["skipped"] += 1
+                    continue
+                candidates.append((file_path, fingerprint, known is None))
+
+            new_hashes = [fingerprint["content_hash"] for _, fingerprint, is_new in candidates if is_new]
+            originals = (
+                {doc.content_hash: doc for doc in ResumeDocument.objects.filter(content_hash__in=new_hashes)}
+                if new_hashes
+                else {}
+            )
+        for file_path, fingerprint, is_new in candidates:
+            original = originals.get(fingerprint["content_hash"]) if is_new else None
+            if original is not None:
+                logger.info("Reusing embedding of %s for identical file %s", original.file_name, file_path.name)
+                _copy_duplicate(original, file_path, fingerprint)
+                result["processed"] += 1
+                continue
+            fingerprints[file_path] = fingerprint
+            yield file_path
+
+
+def extract_pdf_content(source: Path | BinaryIO, name: str | None = None) -> tuple[str, dict[str, object]]:
+    """Extract text from a PDF on disk or in a binary stream; `name` labels streams in metadata and errors."""
+    name = name or source.name
     try:
-        reader = PdfReader(str(file_path))
+        reader = PdfReader(str(source) if isinstance(source, Path) else source)
     except Exception as exc:
-        raise ValueError(f"Could not read PDF {file_path.name}: {exc}") from exc
+        raise ValueError(f"Could not read PDF {name}: {exc}") from exc
 
     pages: list[str] = []
     for page_number, page in enumerate(reader.pages, start=1):
@@ -36,97 +145,775 @@ def extract_pdf_content(file_path: Path) -> tuple[str, dict[str, object]]:
 
     content = "\n".join(pages).strip()
     if not content:
-        raise ValueError(f"No extractable text found in PDF {file_path.name}")
+        raise ValueError(f"No extractable text found in PDF {name}")
 
-    metadata: dict[str, object] = {"source": file_path.name, "page_count": len(reader.pages)}
+    metadata: dict[str, object] = {"source": name, "page_count": len(reader.pages)}
     return content, metadata
 
 
-def gather_resume_data(file_path: Path) -> dict[str, object]:
-    suffix = file_path.suffix.lower()
+def extract_pdf_bytes(raw: bytes, name: str) -> tuple[str, dict[str, object]]:
+    """extract_pdf_content through the extracted-text cache, so identical bytes are parsed only once."""
+    content_hash = hashlib.sha256(raw).hexdigest()
+    cached = get_text(content_hash)
+    if cached is not None:
+        content, metadata = cached
+        return content, {"source": name, **metadata}
+    content, metadata = extract_pdf_content(io.BytesIO(raw), name)
+    # The source name is per file, not per content; it is filled back in on a hit.
+    put_text(content_hash, content, {key: value for key, value in metadata.items() if key != "source"})
+    return content, metadata
+
+
+def resume_from_payload(file_name: str, payload: dict[str, object]) -> dict[str, object]:
+    content = payload.get("content") or payload.get("resume_text") or json.dumps(payload, indent=2)
+    metadata = {k: v for k, v in payload.items() if k not in {"content", "resume_text"}}
+    return {"file_name": file_name, "content": content, "metadata": metadata}
+
+
+def parse_resume_bytes(file_name: str, raw: bytes) -> dict[str, object]:
+    """Same parsing as gather_resume_data for file contents that were never written to disk."""
+    suffix = PurePosixPath(file_name).suffix.lower()
+    if suffix == ".pdf":
+        content, metadata = extract_pdf_bytes(raw, file_name)
+        return {"file_name": file_name, "content": content, "metadata": metadata}
+
+    # TextIOWrapper applies the same universal-newline decoding as Path.read_text.
+    text = io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8", errors="strict" if suffix == ".json" else "ignore")
     if suffix == ".json":
-        payload = json.loads(file_path.read_text(encoding="utf-8"))
-        content = payload.get("content") or payload.get("resume_text") or json.dumps(payload, indent=2)
-        metadata = {k: v for k, v in payload.items() if k not in {"content", "resume_text"}}
-    elif suffix == ".pdf":
-        content, metadata = extract_pdf_content(file_path)
-    else:
-        content = file_path.read_text(encoding="utf-8", errors="ignore")
-        metadata = {"source": file_path.name}
+        return resume_from_payload(file_name, json.loads(text.read()))
+    return {"file_name": file_name, "content": text.read(), "metadata": {"source": file_name}}
 
-    return {
-        "file_name": file_path.name,
-        "content": content,
-        "metadata": metadata,
-    }
 
+def gather_resume_data(file_path: Path) -> dict[str, object]:
+    return parse_resume_bytes(file_path.name, file_path.read_bytes())
 
-def generate_embedding(text: str) -> list[float]:
-    base_url = settings.OLLAMA_BASE_URL.rstrip("/")
-    url = f"{base_url}{EMBEDDINGS_ENDPOINT}"
-    payload = {"model": settings.OLLAMA_EMBED_MODEL, "prompt": text}
-    response = requests.post(url, json=payload, timeout=settings.OLLAMA_REQUEST_TIMEOUT)
-    response.raise_for_status()
-    body = response.json()
-    embedding = body.get("embedding")
+
+def warm_text_cache_file(file_path: Path) -> dict[str, object]:
+    """Extract a PDF into the text cache unless it is already there; reports which it was."""
+    raw = file_path.read_bytes()
+    if get_text(hashlib.sha256(raw).hexdigest()) is not None:
+        return {"cached": True}
+    extract_pdf_bytes(raw, file_path.name)
+    return {"cached": False}
+
+
+def gather_record(record: SourceRecord) -> dict[str, object]:
+    """Parse a streamed record and fingerprint it from its bytes, as fingerprint_file does for files."""
+    if record.payload is not None:
+        data = resume_from_payload(record.name, record.payload)
+        raw = json.dumps(record.payload, sort_keys=True).encode("utf-8")
+    else:
+        data = parse_resume_bytes(record.name, record.raw)
+        raw = record.raw
+    data.update(content_hash=hashlib.sha256(raw).hexdigest(), file_size=len(raw))
+    return data
+
+
+def _validate_embedding(
+    embedding: list[float] | None, model: str | None = None, dimensions: int | None = None
+) -> list[float]:
+    model = model or settings.OLLAMA_EMBED_MODEL
+    dimensions = dimensions or settings.EMBEDDING_DIMENSION
     if not embedding:
-        raise ValueError(f"No embedding returned from Ollama for model {settings.OLLAMA_EMBED_MODEL}")
+        raise ValueError(f"No embedding returned from Ollama for model {model}")
 
-    if len(embedding) != settings.EMBEDDING_DIMENSION:
-        raise ValueError(
-            f"Embedding dimension mismatch: received {len(embedding)} but settings specify {settings.EMBEDDING_DIMENSION}"
-        )
+    if len(embedding) != dimensions:
+        raise ValueError(f"Embedding dimension mismatch: received {len(embedding)} but {model} specifies {dimensions}")
 
     return [float(value) for value in embedding]
 
 
+def _gather_with_timeout(
+    file_path: Path, timeout: int, gather: Callable[..., dict[str, object]] = gather_resume_data
+) -> dict[str, object]:
+    """Run `gather`, aborting with TimeoutError after `timeout` seconds where SIGALRM is usable."""
+    if timeout <= 0 or not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        return gather(file_path)
+
+    def _on_timeout(signum, frame):
+        raise TimeoutError(f"Extraction exceeded {timeout}s")
+
+    previous_handler = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.alarm(timeout)
+    try:
+        return gather(file_path)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def extract_resumes(
+    file_paths: Iterable[Path],
+    workers: int | None = None,
+    gather: Callable[..., dict[str, object]] = gather_resume_data,
+) -> Iterator[tuple[Path, dict[str, object] | None, Exception | None]]:
+    """
+    Yield (path, resume_data, error) in completion order, parsing files in a process pool so
+    PyPDF2 can use every core. Only a small window of files is submitted ahead of the consumer,
+    and each file is bounded by INGESTION_EXTRACT_TIMEOUT. Pass `gather=gather_record` to parse
+    streamed SourceRecords instead of paths.
+    """
+    workers = settings.INGESTION_EXTRACT_WORKERS if workers is None else workers
+    timeout = settings.INGESTION_EXTRACT_TIMEOUT
+
+    # Celery prefork children are daemonic and may not start processes of their own.
+    if workers <= 1 or multiprocessing.current_process().daemon:
+        for file_path in file_paths:
+            try:
+                yield file_path, _gather_with_timeout(file_path, timeout, gather), None
+            except Exception as exc:
+                yield file_path, None, exc
+        return
+
+    remaining = iter(file_paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+        in_flight = {
+            executor.submit(_gather_with_timeout, file_path, timeout, gather): file_path
+            for file_path in islice(remaining, workers * 2)
+        }
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_path = in_flight.pop(future)
+                next_path = next(remaining, None)
+                if next_path is not None:
+                    in_flight[executor.submit(_gather_with_timeout, next_path, timeout, gather)] = next_path
+                try:
+                    yield file_path, future.result(), None
+                except Exception as exc:
+                    yield file_path, None, exc
+
+
+def generate_embedding(text: str) -> list[float]:
+    return _validate_embedding(get_embedding_client("ingestion").embed_one(text))
+
+
+def generate_embeddings(
+    texts: list[str], model: str | None = None, dimensions: int | None = None
+) -> list[list[float]]:
+    """Embed a batch of texts with one request to Ollama's multi-input endpoint."""
+    embeddings = get_embedding_client("ingestion").embed(texts, model)
+    return [_validate_embedding(embedding, model, dimensions) for embedding in embeddings]
+
+
+def chunk_text(text: str, size: int | None = None, overlap: int | None = None) -> list[str]:
+    """Split text into windows of `size` words, each overlapping the previous one by `overlap` words."""
+    size = max(1, size or settings.RESUME_CHUNK_WORDS)
+    overlap = min(size - 1, settings.RESUME_CHUNK_OVERLAP_WORDS if overlap is None else overlap)
+    words = text.split()
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    step = size - overlap
+    return [" ".join(words[start : start + size]) for start in range(0, len(words) - overlap, step)]
+
+
+def _timed_embeddings(
+    texts: list[str], stats: IngestionStats, model: str | None = None, dimensions: int | None = None
+) -> list[list[float]]:
+    started = time.perf_counter()
+    try:
+        return generate_embeddings(texts, model, dimensions)
+    finally:
+        stats.observe_embedding(time.perf_counter() - started, len(texts))
+
+
+def embed_texts(
+    texts: list[str], stats: IngestionStats | None = None, model: str | None = None, dimensions: int | None = None
+) -> list[list[float] | Exception]:
+    """
+    Embed texts in OLLAMA_EMBED_BATCH_SIZE batches, keeping up to OLLAMA_EMBED_CONCURRENCY batches
+    in flight. Each position holds the vector, or the exception that failed its batch. `model` and
+    `dimensions` default to OLLAMA_EMBED_MODEL and EMBEDDING_DIMENSION.
+    """
+    batch_size = max(1, settings.OLLAMA_EMBED_BATCH_SIZE)
+    starts = range(0, len(texts), batch_size)
+    if not starts:
+        return []
+
+    stats = stats or IngestionStats()
+    results: list[list[float] | Exception] = [None] * len(texts)
+    workers = max(1, min(settings.OLLAMA_EMBED_CONCURRENCY, len(starts)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as executor:
+        futures = {
+            executor.submit(_timed_embeddings, texts[start : start + batch_size], stats, model, dimensions): start
+            for start in starts
+        }
+        for future in as_completed(futures):
+            start = futures[future]
+            try:
+                vectors = future.result()
+            except Exception as exc:
+                vectors = [exc] * len(texts[start : start + batch_size])
+            results[start : start + len(vectors)] = vectors
+    return results
+
+
+def embed_resumes(
+    records: list[dict[str, object]], errors: list[str], stats: IngestionStats | None = None
+) -> list[dict[str, object]]:
+    """
+    Attach an "embedding" to each record, plus "chunks" of (passage, embedding) when
+    RESUME_CHUNKS_ENABLED. Documents and passages share the same batched requests. Records with a
+    failed embedding are reported in `errors` and left out of the returned list.
+    """
+    texts = [record["content"] for record in records]
+    passages: list[list[str]] = []
+    if settings.RESUME_CHUNKS_ENABLED:
+        passages = [chunk_text(record["content"]) for record in records]
+        for record_passages in passages:
+            texts.extend(record_passages)
+    vectors = embed_texts(texts, stats)
+
+    embedded: list[dict[str, object]] = []
+    offset = len(records)
+    for position, record in enumerate(records):
+        record_vectors = [vectors[position]]
+        if passages:
+            record_vectors += vectors[offset : offset + len(passages[position])]
+            offset += len(passages[position])
+        failure = next((vector for vector in record_vectors if isinstance(vector, Exception)), None)
+        if failure is not None:
+            error_msg = f"Failed to embed {record['file_name']}: {failure}"
+            logger.error(error_msg)
+            errors.append(error_msg)
+            continue
+        record["embedding"] = record_vectors[0]
+        if passages:
+            record["chunks"] = list(zip(passages[position], record_vectors[1:]))
+        embedded.append(record)
+    return embedded
+
+
+def replace_chunks(documents: Iterable[tuple[ResumeDocument, list[tuple[str, list[float]]]]]) -> None:
+    """Swap the stored passages of each document for `chunks`; call inside a transaction."""
+    documents = list(documents)
+    ResumeChunk.objects.filter(document__in=[document for document, _ in documents]).delete()
+    ResumeChunk.objects.bulk_create(
+        [
+            ResumeChunk(document=document, chunk_index=index, content=passage, embedding=embedding)
+            for document, chunks in documents
+            for index, (passage, embedding) in enumerate(chunks)
+        ],
+        batch_size=settings.INGESTION_DB_BATCH_SIZE,
+    )
+
+
+def _refresh_if_unchanged(data: dict[str, object]) -> bool:
+    """
+    Return True when the stored text already matches, refreshing the manifest instead of re-embedding.
+    Metadata that changed without the text (e.g. a JSON resume's location or skills) is saved as well.
+    """
+    metadata = data.get("metadata", {})
+    with transaction.atomic():
+        stored = (
+            ResumeDocument.objects.select_for_update()
+            .filter(file_name=data["file_name"], content=data["content"])
+            .values("id", "metadata", "updated_at")
+            .first()
+        )
+        if stored is None:
+            return False
+        updates = {field: data[field] for field in FINGERPRINT_FIELDS if field in data}
+        if stored["metadata"] != metadata:
+            # updated_at moves so the local index picks the row up; vectors of other embedding models
+            # still match the unchanged text, so they move with it instead of being re-embedded.
+            now = timezone.now()
+            updates.update(metadata=metadata, updated_at=now)
+            ResumeEmbedding.objects.filter(document_id=stored["id"], document_updated_at=stored["updated_at"]).update(
+                document_updated_at=now
+            )
+            transaction.on_commit(bump_corpus_version)
+            logger.info("Updated metadata of %s; content unchanged", data["file_name"])
+        if updates:
+            ResumeDocument.objects.filter(pk=stored["id"]).update(**updates)
+    return True
+
+
 def store_resume(data: dict[str, object]) -> bool:
-    if ResumeDocument.objects.filter(file_name=data["file_name"]).exists():
-        logger.info("Skipping %s; file already ingested", data["file_name"])
+    if "embedding" not in data and _refresh_if_unchanged(data):
+        logger.info("Skipping %s; content unchanged", data["file_name"])
         return False
 
-    embedding = generate_embedding(data["content"])
+    embedding = data.get("embedding") or generate_embedding(data["content"])
+    chunks = data.get("chunks")
+    if chunks is None and settings.RESUME_CHUNKS_ENABLED:
+        passages = chunk_text(data["content"])
+        chunks = list(zip(passages, generate_embeddings(passages))) if passages else []
+    defaults = {
+        "content": data["content"],
+        "metadata": data.get("metadata", {}),
+        "embedding": embedding,
+        "embedding_binary": binary_quantize(embedding),
+    }
+    defaults.update({field: data[field] for field in FINGERPRINT_FIELDS if field in data})
     with transaction.atomic():
-        ResumeDocument.objects.create(
+        document, _ = ResumeDocument.objects.update_or_create(file_name=data["file_name"], defaults=defaults)
+        if chunks is not None:
+            replace_chunks([(document, chunks)])
+        transaction.on_commit(bump_corpus_version)
+    return True
+
+
+def prune_missing_resumes(present_file_names: set[str]) -> int:
+    stale_ids = [
+        pk
+        for pk, file_name in ResumeDocument.objects.values_list("id", "file_name").iterator()
+        if file_name not in present_file_names
+    ]
+    for start in range(0, len(stale_ids), MANIFEST_BATCH_SIZE):
+        ResumeDocument.objects.filter(id__in=stale_ids[start : start + MANIFEST_BATCH_SIZE]).delete()
+    if stale_ids:
+        logger.info("Deleted %s resumes whose source files were removed", len(stale_ids))
+        transaction.on_commit(bump_corpus_version)
+    return len(stale_ids)
+
+
+class ResumeWriter:
+    """
+    Buffers embedded resumes and writes them with one INSERT ... ON CONFLICT (file_name) DO UPDATE
+    per INGESTION_DB_BATCH_SIZE rows, so each document no longer costs its own round-trips and commit.
+    A later resume with the same file name replaces a buffered one, since one statement cannot upsert
+    the same row twice.
+    """
+
+    def __init__(self, errors: list[str], batch_size: int | None = None, stats: IngestionStats | None = None):
+        self.errors = errors
+        self.stats = stats or IngestionStats()
+        self.batch_size = max(1, batch_size or settings.INGESTION_DB_BATCH_SIZE)
+        self.written = 0
+        self._buffer: dict[str, ResumeDocument] = {}
+        self._chunks: dict[str, list[tuple[str, list[float]]]] = {}
+
+    def __enter__(self) -> "ResumeWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+    def add(self, data: dict[str, object]) -> None:
+        if data["file_name"] in self._buffer:
+            logger.warning("Duplicate file name %s; the later resume replaces the earlier one", data["file_name"])
+        self._buffer[data["file_name"]] = ResumeDocument(
             file_name=data["file_name"],
             content=data["content"],
             metadata=data.get("metadata", {}),
-            embedding=embedding,
+            embedding=data["embedding"],
+            embedding_binary=binary_quantize(data["embedding"]),
+            **{field: data[field] for field in FINGERPRINT_FIELDS if field in data},
+        )
+        self._chunks.pop(data["file_name"], None)
+        if "chunks" in data:
+            self._chunks[data["file_name"]] = data["chunks"]
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        batch, self._buffer = list(self._buffer.values()), {}
+        chunks, self._chunks = self._chunks, {}
+        if not batch:
+            return 0
+        try:
+            with self.stats.timer("db_write"), transaction.atomic():
+                # With update_conflicts the primary keys are returned, so passages can reference them.
+                ResumeDocument.objects.bulk_create(
+                    batch,
+                    update_conflicts=True,
+                    unique_fields=["file_name"],
+                    update_fields=UPSERT_FIELDS,
+                )
+                if chunks:
+                    replace_chunks((doc, chunks[doc.file_name]) for doc in batch if doc.file_name in chunks)
+                transaction.on_commit(bump_corpus_version)
+        except Exception as exc:
+            logger.exception("Bulk write of %s resumes failed", len(batch))
+            self.errors.extend(f"Failed to store {doc.file_name}: {exc}" for doc in batch)
+            return 0
+        self.written += len(batch)
+        return len(batch)
+
+
+def _drop_unchanged(
+    pending: list[dict[str, object]], result: dict[str, object], stats: IngestionStats
+) -> list[dict[str, object]]:
+    """Filter out documents whose stored text already matches, using one query for the whole batch."""
+    with stats.timer("existence_check"):
+        stored = dict(
+            ResumeDocument.objects.filter(file_name__in=[data["file_name"] for data in pending]).values_list(
+                "file_name", "content"
+            )
         )
+    changed = []
+    for data in pending:
+        if stored.get(data["file_name"]) == data["content"]:
+            logger.info("Skipping %s; content unchanged", data["file_name"])
+            _refresh_if_unchanged(data)
+            result["skipped"] += 1
+        else:
+            changed.append(data)
+    return changed
+
+
+def _embed_and_write(
+    pending: list[dict[str, object]], writer: ResumeWriter, result: dict[str, object], stats: IngestionStats
+) -> None:
+    changed = _drop_unchanged(pending, result, stats)
+    with stats.timer("embedding"):
+        embedded = embed_resumes(changed, result["errors"], stats)
+    for resume_data in embedded:
+        writer.add(resume_data)
+
+
+def ingest_files(file_paths: Iterable[Path], stats: IngestionStats | None = None) -> dict[str, object]:
+    stats = stats or IngestionStats()
+    result: dict[str, object] = {"processed": 0, "skipped": 0, "errors": []}
+    errors = result["errors"]
+
+    # Enough documents to keep every concurrent embedding batch full.
+    flush_size = max(1, settings.OLLAMA_EMBED_BATCH_SIZE * settings.OLLAMA_EMBED_CONCURRENCY)
+    fingerprints: dict[Path, dict[str, object]] = {}
+    changed_files = select_changed_files(file_paths, fingerprints, result, stats)
+    pending: list[dict[str, object]] = []
+    with ResumeWriter(errors, stats=stats) as writer:
+        for file_path, resume_data, extract_error in stats.timed(extract_resumes(changed_files), "extraction"):
+            fingerprint = fingerprints.pop(file_path, {})
+            try:
+                logger.debug(f"Ingest file - {file_path}")
+                if extract_error is not None:
+                    raise extract_error
+                resume_data.update(fingerprint)
+                stats.count_document(resume_data)
+                pending.append(resume_data)
+            except Exception as exc:
+                error_msg = f"Failed to ingest {file_path.name}: {exc}"
+                logger.exception(error_msg)
+                errors.append(error_msg)
+
+            if len(pending) >= flush_size:
+                _embed_and_write(pending, writer, result, stats)
+                pending = []
+
+        if pending:
+            _embed_and_write(pending, writer, result, stats)
+
+    result["processed"] += writer.written
+    result["stats"] = stats.as_dict()
+    record_ingestion(result)
+    return result
+
+
+def ingest_directory(directory: Path, prune_missing: bool = False) -> dict[str, object]:
+    if not directory.exists():
+        msg = f"Data directory {directory} does not exist"
+        logger.error(msg)
+        return {"processed": 0, "skipped": 0, "errors": [msg]}
+
+    stats = IngestionStats()
+    with stats.timer("listing"):
+        file_paths = list(list_resume_files(directory))
+    result = ingest_files(file_paths, stats)
+    if prune_missing:
+        result["deleted"] = prune_missing_resumes({file_path.name for file_path in file_paths})
+    return result
+
+
+def ingest_source(source: Path, checkpoint: Path | None = None, batch_size: int | None = None) -> dict[str, object]:
+    """
+    Stream records from a JSONL, zip or tar.gz export through the same extraction, embedding and
+    bulk write stages as directory ingestion, holding at most `batch_size` parsed records at once.
+    After each batch commits, `checkpoint` records the offset up to which every record is done, and
+    a rerun with the same checkpoint resumes there. A failed embedding or database write stops the
+    run before the checkpoint moves past it.
+    """
+    stats = IngestionStats()
+    result: dict[str, object] = {"processed": 0, "skipped": 0, "errors": []}
+    errors = result["errors"]
+    batch_size = max(1, batch_size or settings.INGESTION_DB_BATCH_SIZE)
+    start, position = load_checkpoint(checkpoint, source) if checkpoint else (0, None)
+    result["start_offset"] = start
+
+    # Offsets finished out of order (extraction completes out of order) wait here for the watermark.
+    done: dict[int, int | None] = {}
+    watermark = {"offset": start, "position": position}
+
+    def with_content(records: Iterable[SourceRecord]) -> Iterator[SourceRecord]:
+        for record in records:
+            if record.raw is None and record.payload is None:
+                done[record.offset] = record.position
+                continue
+            yield record
+
+    def advance() -> None:
+        while watermark["offset"] in done:
+            watermark["position"] = done.pop(watermark["offset"])
+            watermark["offset"] += 1
+        if checkpoint:
+            save_checkpoint(checkpoint, source, watermark["offset"], watermark["position"])
+
+    def commit(pending: list[dict[str, object]], records: list[SourceRecord], writer: ResumeWriter) -> bool:
+        # A later record with the same name wins, as it would when the export is exploded onto disk.
+        unique = list({data["file_name"]: data for data in pending}.values())
+        changed = _drop_unchanged(unique, result, stats)
+        with stats.timer("embedding"):
+            embedded = embed_resumes(changed, errors, stats)
+        written_before = writer.written
+        for resume_data in embedded:
+            writer.add(resume_data)
+        writer.flush()
+        # A failed embedding or write stops the run before the checkpoint passes the batch, so a rerun
+        # retries it; records that did get written are skipped as unchanged then.
+        if len(embedded) != len(changed) or writer.written - written_before != len(embedded):
+            return False
+        for record in records:
+            done[record.offset] = record.position
+        advance()
+        return True
+
+    records = with_content(iter_source(source, SUPPORTED_EXTENSIONS, start, position))
+    pending: list[dict[str, object]] = []
+    pending_records: list[SourceRecord] = []
+    with ResumeWriter(errors, batch_size=batch_size, stats=stats) as writer:
+        for record, resume_data, extract_error in stats.timed(
+            extract_resumes(records, gather=gather_record), "extraction"
+        ):
+            if extract_error is not None:
+                error_msg = f"Failed to ingest {record.name}: {extract_error}"
+                logger.error(error_msg)
+                errors.append(error_msg)
+                done[record.offset] = record.position
+                continue
+            stats.count_document(resume_data)
+            pending.append(resume_data)
+            pending_records.append(record)
+            if len(pending) >= batch_size:
+                if not commit(pending, pending_records, writer):
+                    break
+                pending, pending_records = [], []
+        else:
+            if pending:
+                commit(pending, pending_records, writer)
+            else:
+                advance()
+
+    result["processed"] += writer.written
+    result["offset"] = watermark["offset"]
+    result["stats"] = stats.as_dict()
+    record_ingestion(result)
+    return result
+
+
+def reembed_documents(embedding_model: EmbeddingModel, document_ids: Iterable[int]) -> dict[str, object]:
+    """
+    Embed the stored content of the given resumes with `embedding_model` and upsert their
+    ResumeEmbedding rows. Source files are never read again.
+    """
+    documents = list(
+        ResumeDocument.objects.filter(id__in=list(document_ids)).only("id", "file_name", "content", "updated_at")
+    )
+    vectors = embed_texts(
+        [document.content for document in documents], model=embedding_model.name, dimensions=embedding_model.dimensions
+    )
+    rows = []
+    errors: list[str] = []
+    for document, vector in zip(documents, vectors):
+        if isinstance(vector, Exception):
+            errors.append(f"Failed to embed {document.file_name} with {embedding_model.name}: {vector}")
+            continue
+        rows.append(
+            ResumeEmbedding(
+                document=document,
+                model=embedding_model,
+                embedding=vector,
+                document_updated_at=document.updated_at,
+            )
+        )
+    # A resume re-ingested meanwhile keeps its newer updated_at, so it stays pending for the next run.
+    ResumeEmbedding.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["document", "model"],
+        update_fields=["embedding", "document_updated_at"],
+        batch_size=settings.INGESTION_DB_BATCH_SIZE,
+    )
+    if rows:
+        transaction.on_commit(bump_corpus_version)
+    return {"processed": len(rows), "errors": errors}
+
+
+def finish_backfill(embedding_model: EmbeddingModel) -> bool:
+    """Build the model's ANN index and mark the backfill done once no resume is pending."""
+    if pending_documents(embedding_model).exists():
+        return False
+    build_model_index(embedding_model)
+    EmbeddingModel.objects.filter(pk=embedding_model.pk).update(backfilled_at=timezone.now())
     return True
 
 
-def ingest_directory(directory: Path) -> dict[str, object]:
+def backfill_embedding_model(
+    embedding_model: EmbeddingModel, batch_size: int | None = None, progress: Callable[[int], None] | None = None
+) -> dict[str, object]:
+    """
+    Re-embed every pending resume inline, `batch_size` at a time. Progress is the stored vectors
+    themselves, so an interrupted run resumes where it stopped.
+    """
+    batch_size = max(1, batch_size or settings.EMBEDDING_BACKFILL_CHUNK_SIZE)
+    pending = pending_documents(embedding_model).order_by("id").values_list("id", flat=True)
+    result: dict[str, object] = {"processed": 0, "errors": []}
+    last_id = 0
+    while batch := list(pending.filter(id__gt=last_id)[:batch_size]):
+        last_id = batch[-1]
+        batch_result = reembed_documents(embedding_model, batch)
+        result["processed"] += batch_result["processed"]
+        result["errors"].extend(batch_result["errors"])
+        if progress:
+            progress(result["processed"])
+    result["complete"] = finish_backfill(embedding_model)
+    return result
+
+
+def merge_ingestion_results(results: Iterable[dict[str, object]], elapsed: float | None = None) -> dict[str, object]:
     processed = 0
+    skipped = 0
     errors: list[str] = []
+    stats: list[dict[str, object]] = []
+    for result in results:
+        processed += result["processed"]
+        skipped += result.get("skipped", 0)
+        errors.extend(result["errors"])
+        if "stats" in result:
+            stats.append(result["stats"])
+    return {"processed": processed, "skipped": skipped, "errors": errors, "stats": merge_stats(stats, elapsed)}
+
+
+@shared_task(bind=True, name="pipeline.ingest_resume_chunk")
+def ingest_resume_chunk_task(self, file_paths: list[str]) -> dict[str, object]:
+    result = ingest_files(Path(file_path) for file_path in file_paths)
+    logger.debug(
+        "Chunk task %s processed %s of %s files with %s errors",
+        self.request.id,
+        result["processed"],
+        len(file_paths),
+        len(result["errors"]),
+    )
+    return result
+
+
+@shared_task(bind=True, name="pipeline.summarize_ingestion")
+def summarize_ingestion_task(
+    self, results: list[dict[str, object]], started_at: float | None = None, listing_seconds: float = 0.0
+) -> dict[str, object]:
+    """Merge the chunk summaries; throughput is computed over wall time since the coordinator started."""
+    result = merge_ingestion_results(results, time.time() - started_at if started_at else None)
+    result["stats"]["stages"]["listing"] += listing_seconds
+    logger.info(
+        "Ingestion completed by task %s with %s processed and %s errors across %s chunks",
+        self.request.id,
+        result["processed"],
+        len(result["errors"]),
+        len(results),
+    )
+    # New and changed resumes still need vectors from every re-embedding model.
+    for model_id in EmbeddingModel.objects.values_list("id", flat=True):
+        reembed_resumes_task.delay(model_id)
+    return result
+
+
+@shared_task(bind=True, name="pipeline.ingest_resumes")
+def ingest_resumes_task(self, data_directory: str | None = None, prune_missing: bool = False) -> dict[str, object]:
+    """
+    Coordinator: list the files once and fan them out as a chord of chunk tasks so every worker
+    process takes a share and no single task runs into CELERY_TASK_TIME_LIMIT. The chord callback
+    returns the usual {"processed", "errors"} summary.
+    """
+    directory = Path(data_directory) if data_directory else settings.DATA_DIRECTORY
     if not directory.exists():
         msg = f"Data directory {directory} does not exist"
         logger.error(msg)
-        return {"processed": processed, "errors": [msg]}
+        return {"processed": 0, "skipped": 0, "errors": [msg]}
 
-    for file_path in list_resume_files(directory):
-        try:
-            logger.debug(f"Ingest file - {file_path}")
-            resume_data = gather_resume_data(file_path)
-            created = store_resume(resume_data)
-            if created:
-                processed += 1
-        except Exception as exc:
-            error_msg = f"Failed to ingest {file_path.name}: {exc}"
-            logger.exception(error_msg)
-            errors.append(error_msg)
+    started_at = time.time()
+    stats = IngestionStats()
+    with stats.timer("listing"):
+        file_paths = [str(file_path) for file_path in list_resume_files(directory)]
+    listing_seconds = stats.stages["listing"]
+    deleted = prune_missing_resumes({Path(file_path).name for file_path in file_paths}) if prune_missing else 0
+    chunk_size = max(1, settings.INGESTION_CHUNK_SIZE)
+    chunks = [file_paths[start : start + chunk_size] for start in range(0, len(file_paths), chunk_size)]
+    if not chunks:
+        return {"processed": 0, "skipped": 0, "errors": [], "deleted": deleted}
 
-    return {"processed": processed, "errors": errors}
+    summary = chord([ingest_resume_chunk_task.s(chunk) for chunk in chunks])(
+        summarize_ingestion_task.s(started_at=started_at, listing_seconds=listing_seconds)
+    )
+    logger.info(
+        "Task %s dispatched %s files from %s in %s chunks; summary task %s",
+        self.request.id,
+        len(file_paths),
+        directory,
+        len(chunks),
+        summary.id,
+    )
+    return {
+        "summary_task_id": summary.id,
+        "files": len(file_paths),
+        "chunks": len(chunks),
+        "deleted": deleted,
+        "listing_seconds": round(listing_seconds, 3),
+    }
 
 
-@shared_task(bind=True, name="pipeline.ingest_resumes")
-def ingest_resumes_task(self, data_directory: str | None = None) -> dict[str, object]:
-    directory = Path(data_directory) if data_directory else settings.DATA_DIRECTORY
-    result = ingest_directory(directory)
+@shared_task(bind=True, name="pipeline.reembed_resume_chunk")
+def reembed_resume_chunk_task(self, model_id: int, document_ids: list[int]) -> dict[str, object]:
+    return reembed_documents(EmbeddingModel.objects.get(pk=model_id), document_ids)
+
+
+@shared_task(bind=True, name="pipeline.finish_reembedding")
+def finish_reembedding_task(self, results: list[dict[str, object]], model_id: int) -> dict[str, object]:
+    embedding_model = EmbeddingModel.objects.get(pk=model_id)
+    result = {
+        "model": embedding_model.name,
+        "processed": sum(chunk["processed"] for chunk in results),
+        "errors": [error for chunk in results for error in chunk["errors"]],
+        "complete": finish_backfill(embedding_model),
+    }
     logger.info(
-        "Ingestion completed by task %s with %s processed and %s errors",
+        "Re-embedding with %s finished by task %s: %s processed, %s errors, complete=%s",
+        embedding_model.name,
         self.request.id,
         result["processed"],
         len(result["errors"]),
+        result["complete"],
     )
     return result
+
+
+@shared_task(bind=True, name="pipeline.reembed_resumes")
+def reembed_resumes_task(self, model_id: int) -> dict[str, object]:
+    """
+    Coordinator: fan the resumes pending for an embedding model out to chunk tasks that re-embed
+    their stored content. Re-running it only picks up what is still pending.
+    """
+    embedding_model = EmbeddingModel.objects.get(pk=model_id)
+    document_ids = list(pending_documents(embedding_model).order_by("id").values_list("id", flat=True))
+    chunk_size = max(1, settings.EMBEDDING_BACKFILL_CHUNK_SIZE)
+    chunks = [document_ids[start : start + chunk_size] for start in range(0, len(document_ids), chunk_size)]
+    if not chunks:
+        return {"model": embedding_model.name, "documents": 0, "complete": finish_backfill(embedding_model)}
+
+    summary = chord([reembed_resume_chunk_task.s(model_id, chunk) for chunk in chunks])(
+        finish_reembedding_task.s(model_id)
+    )
+    logger.info(
+        "Task %s dispatched %s resumes for %s in %s chunks; summary task %s",
+        self.request.id,
+        len(document_ids),
+        embedding_model.name,
+        len(chunks),
+        summary.id,
+    )
+    return {
+        "model": embedding_model.name,
+        "summary_task_id": summary.id,
+        "documents": len(document_ids),
+        "chunks": len(chunks),
+    }
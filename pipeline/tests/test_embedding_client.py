@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from pipeline.embedding_client import (
+    DECREASE_INTERVAL,
+    AdaptiveLimit,
+    CircuitBreaker,
+    EmbeddingClient,
+    EmbeddingUnavailable,
+    Profile,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@override_settings(OLLAMA_LATENCY_TOLERANCE=2.0)
+class AdaptiveLimitTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("pipeline.embedding_client.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fail_fast_acquire_refuses_at_the_limit(self):
+        limit = AdaptiveLimit(2)
+        self.assertTrue(limit.acquire(block=False))
+        self.assertTrue(limit.acquire(block=False))
+        self.assertFalse(limit.acquire(block=False))
+        limit.cancel()
+        self.assertTrue(limit.acquire(block=False))
+
+    def test_slow_release_halves_the_limit_once_per_interval(self):
+        limit = AdaptiveLimit(8)
+        for latency in (0.1, 0.5, 0.5):
+            limit.acquire(block=False)
+            limit.release(latency)
+        # The first observation sets the baseline; only the first slow one within the interval counts.
+        self.assertEqual(int(limit.limit), 4)
+        self.clock.now += DECREASE_INTERVAL
+        limit.acquire(block=False)
+        limit.release(None)
+        self.assertEqual(int(limit.limit), 2)
+
+    def test_never_drops_below_the_minimum(self):
+        limit = AdaptiveLimit(2)
+        for _ in range(4):
+            limit.acquire(block=False)
+            limit.release(None)
+            self.clock.now += DECREASE_INTERVAL
+        self.assertEqual(limit.limit, 1)
+
+    def test_fast_release_grows_back_to_the_maximum(self):
+        limit = AdaptiveLimit(4)
+        limit.acquire(block=False)
+        limit.release(None)
+        self.assertEqual(limit.limit, 2)
+        for _ in range(10):
+            limit.acquire(block=False)
+            limit.release(0.1)
+        self.assertEqual(limit.limit, 4)
+        self.assertEqual(limit.in_flight, 0)
+
+
+@override_settings(OLLAMA_BREAKER_THRESHOLD=3, OLLAMA_BREAKER_RESET_SECONDS=10)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        patcher = mock.patch("pipeline.embedding_client.time.monotonic", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open_breaker(self) -> CircuitBreaker:
+        breaker = CircuitBreaker()
+        with self.assertLogs("pipeline.embedding_client", "WARNING"):
+            for _ in range(3):
+                self.assertEqual(breaker.wait_time(), 0)
+                breaker.record_failure()
+        return breaker
+
+    def test_opens_after_the_threshold(self):
+        breaker = self.open_breaker()
+        self.assertEqual(breaker.wait_time(), 10)
+        self.clock.now += 4
+        self.assertEqual(breaker.wait_time(), 6)
+
+    def test_success_resets_the_failure_count(self):
+        breaker = CircuitBreaker()
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertEqual(breaker.wait_time(), 0)
+
+    def test_half_open_allows_a_single_trial(self):
+        breaker = self.open_breaker()
+        self.clock.now += 10
+        self.assertEqual(breaker.wait_time(), 0)
+        self.assertEqual(breaker.wait_time(), 1)
+
+    def test_failed_trial_reopens(self):
+        breaker = self.open_breaker()
+        self.clock.now += 10
+        breaker.wait_time()
+        breaker.record_failure()
+        self.assertEqual(breaker.wait_time(), 10)
+
+    def test_successful_trial_closes(self):
+        breaker = self.open_breaker()
+        self.clock.now += 10
+        breaker.wait_time()
+        with self.assertLogs("pipeline.embedding_client", "INFO"):
+            breaker.record_success()
+        self.assertEqual(breaker.wait_time(), 0)
+        self.assertEqual(breaker.wait_time(), 0)
+
+
+@override_settings(OLLAMA_BREAKER_THRESHOLD=1, OLLAMA_BREAKER_RESET_SECONDS=10)
+class FailFastClientTests(SimpleTestCase):
+    def test_open_breaker_refuses_without_holding_a_slot(self):
+        breaker = CircuitBreaker()
+        with self.assertLogs("pipeline.embedding_client", "WARNING"):
+            breaker.record_failure()
+        limit = AdaptiveLimit(1)
+        client = EmbeddingClient(Profile("search", timeout=1, attempts=1, block=False), limit, breaker)
+        send = mock.Mock()
+        with self.assertRaises(EmbeddingUnavailable) as raised:
+            client.call(send)
+        self.assertGreater(raised.exception.retry_after, 0)
+        send.assert_not_called()
+        self.assertEqual(limit.in_flight, 0)
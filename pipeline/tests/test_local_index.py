@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import TestCase
+
+from pipeline.local_index import LocalVectorIndex, write_snapshot
+from pipeline.models import ResumeDocument
+
+
+def axis(position: int) -> list[float]:
+    embedding = [0.0] * settings.EMBEDDING_DIMENSION
+    embedding[position] = 1.0
+    return embedding
+
+
+class LocalVectorIndexTests(TestCase):
+    def setUp(self):
+        self.documents = [
+            ResumeDocument.objects.create(
+                file_name=f"r{position}.txt", content=f"resume {position}", embedding=axis(position)
+            )
+            for position in range(3)
+        ]
+
+    def nearest(self, index: LocalVectorIndex, position: int, limit: int = 1) -> list[int]:
+        return [candidate_id for candidate_id, _, _ in index.search(axis(position), limit)]
+
+    def test_search_ranks_by_cosine_similarity(self):
+        index = LocalVectorIndex()
+        index.load()
+        first, second, _ = self.documents
+        results = index.search([1.0, 0.5] + [0.0] * (settings.EMBEDDING_DIMENSION - 2), 2)
+        self.assertEqual([candidate_id for candidate_id, _, _ in results], [first.id, second.id])
+        self.assertEqual(results[0][2], ("r0.txt", {}, "resume 0"))
+
+    def test_pages_continue_after_the_cursor(self):
+        index = LocalVectorIndex()
+        index.load()
+        query = [1.0] * 3 + [0.0] * (settings.EMBEDDING_DIMENSION - 3)
+        first_page = index.search(query, 2)
+        candidate_id, score, _ = first_page[-1]
+        second_page = index.search(query, 2, after=(score, candidate_id))
+        # Equal scores are ordered by id, so the pages together hold every resume once.
+        served = [row[0] for row in first_page + second_page]
+        self.assertEqual(served, sorted(document.id for document in self.documents))
+
+    def test_refresh_picks_up_updates_and_inserts(self):
+        index = LocalVectorIndex()
+        index.load()
+        moved = self.documents[0]
+        moved.embedding = axis(5)
+        moved.save()
+        added = ResumeDocument.objects.create(file_name="r6.txt", content="resume 6", embedding=axis(6))
+
+        index.refresh(force=True)
+
+        self.assertEqual(self.nearest(index, 5), [moved.id])
+        self.assertEqual(self.nearest(index, 6), [added.id])
+        # The superseded snapshot row no longer scores against its old direction.
+        scores = {candidate_id: score for candidate_id, score, _ in index.search(axis(0), 10)}
+        self.assertEqual(len(scores), 4)
+        self.assertEqual(scores[moved.id], 0.0)
+
+    def test_refresh_detects_deletions(self):
+        index = LocalVectorIndex()
+        index.load()
+        deleted = self.documents[1]
+        deleted.delete()
+
+        index.refresh(force=True)
+
+        served = self.nearest(index, 1, limit=10)
+        self.assertNotIn(deleted.id, served)
+        self.assertEqual(len(served), 2)
+
+    def test_snapshot_is_overlaid_with_later_changes(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.assertEqual(write_snapshot(directory), 3)
+        self.documents[2].delete()
+        added = ResumeDocument.objects.create(file_name="r7.txt", content="resume 7", embedding=axis(7))
+
+        index = LocalVectorIndex(directory)
+        index.load()
+
+        served = self.nearest(index, 7, limit=10)
+        self.assertEqual(served[0], added.id)
+        self.assertEqual(sorted(served), sorted([self.documents[0].id, self.documents[1].id, added.id]))
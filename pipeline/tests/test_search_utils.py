@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import base64
+import json
+
+from django.test import SimpleTestCase
+
+from pipeline.search_utils import PageCursor, next_cursor
+
+
+class PageCursorTests(SimpleTestCase):
+    def test_round_trip(self):
+        cursor = PageCursor(0.8125, 42, 20)
+        self.assertEqual(PageCursor.decode(cursor.encode("rrf"), "rrf"), cursor)
+
+    def test_rejects_cursor_of_another_method(self):
+        token = PageCursor(0.5, 7, 10).encode("vector")
+        with self.assertRaisesMessage(ValueError, "'vector', not 'bm25'"):
+            PageCursor.decode(token, "bm25")
+
+    def test_rejects_malformed_tokens(self):
+        malformed = [
+            "not base64!",
+            base64.urlsafe_b64encode(b"not json").decode("ascii"),
+            base64.urlsafe_b64encode(json.dumps(["vector", 0.5]).encode("utf-8")).decode("ascii"),
+            base64.urlsafe_b64encode(json.dumps(["vector", "high", 1, 10]).encode("utf-8")).decode("ascii"),
+        ]
+        for token in malformed:
+            with self.subTest(token=token), self.assertRaisesMessage(ValueError, "Invalid cursor."):
+                PageCursor.decode(token, "vector")
+
+    def test_next_cursor_points_after_the_last_row(self):
+        results = [{"candidate_id": 3, "score": 0.9}, {"candidate_id": 8, "score": 0.7}]
+        self.assertEqual(next_cursor(results, 2), PageCursor(0.7, 8, 2))
+        self.assertEqual(next_cursor(results, 2, after=PageCursor(0.95, 1, 4)), PageCursor(0.7, 8, 6))
+
+    def test_short_page_is_the_last(self):
+        self.assertIsNone(next_cursor([{"candidate_id": 3, "score": 0.9}], 2))
+        self.assertIsNone(next_cursor([], 2))
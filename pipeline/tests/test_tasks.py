@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from pipeline import tasks
+from pipeline.models import ResumeDocument
+from pipeline.profiling import IngestionStats
+from pipeline.sources import load_checkpoint
+
+
+def vector(value: float = 0.1) -> list[float]:
+    return [value] * settings.EMBEDDING_DIMENSION
+
+
+class ChunkTextTests(SimpleTestCase):
+    def test_short_text_is_one_chunk(self):
+        self.assertEqual(tasks.chunk_text("one  two\nthree", size=4, overlap=1), ["one two three"])
+        self.assertEqual(tasks.chunk_text("   ", size=4, overlap=1), [])
+
+    def test_windows_overlap_and_cover_every_word(self):
+        text = " ".join(f"w{index}" for index in range(10))
+        self.assertEqual(
+            tasks.chunk_text(text, size=4, overlap=1),
+            ["w0 w1 w2 w3", "w3 w4 w5 w6", "w6 w7 w8 w9"],
+        )
+
+    def test_overlap_is_capped_below_the_window(self):
+        self.assertEqual(tasks.chunk_text("a b c", size=2, overlap=5), ["a b", "b c"])
+
+
+class DropUnchangedTests(TestCase):
+    def test_unchanged_text_is_skipped_and_its_metadata_refreshed(self):
+        stored = ResumeDocument.objects.create(
+            file_name="same.json", content="Python developer", metadata={"location": "Paris"}, embedding=vector()
+        )
+        ResumeDocument.objects.create(file_name="edited.txt", content="old text", embedding=vector())
+        pending = [
+            {"file_name": "same.json", "content": "Python developer", "metadata": {"location": "Remote"}},
+            {"file_name": "edited.txt", "content": "new text"},
+            {"file_name": "new.txt", "content": "Go developer"},
+        ]
+        result = {"processed": 0, "skipped": 0, "errors": []}
+
+        changed = tasks._drop_unchanged(pending, result, IngestionStats())
+
+        self.assertEqual([data["file_name"] for data in changed], ["edited.txt", "new.txt"])
+        self.assertEqual(result["skipped"], 1)
+        stored.refresh_from_db()
+        self.assertEqual(stored.metadata, {"location": "Remote"})
+
+
+@override_settings(INGESTION_EXTRACT_WORKERS=1, RESUME_CHUNKS_ENABLED=False, TEXT_CACHE_ENABLED=False)
+class IngestSourceTests(TestCase):
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.source = directory / "export.jsonl"
+        self.checkpoint = directory / "export.checkpoint"
+        self.embedded: list[str] = []
+        self.failing: set[str] = set()
+
+    def write_source(self, names: list[str]) -> None:
+        self.source.write_text(
+            "".join(json.dumps({"file_name": name, "content": f"{name} knows Python"}) + "\n" for name in names)
+        )
+
+    def embed_texts(self, texts, stats=None, model=None, dimensions=None):
+        self.embedded.extend(texts)
+        return [ValueError("Ollama is down") if text in self.failing else vector() for text in texts]
+
+    def ingest(self) -> dict[str, object]:
+        with mock.patch.object(tasks, "embed_texts", self.embed_texts):
+            return tasks.ingest_source(self.source, self.checkpoint, batch_size=2)
+
+    def test_checkpoint_reaches_the_end(self):
+        self.write_source([f"r{index}.json" for index in range(5)])
+        result = self.ingest()
+        self.assertEqual((result["processed"], result["offset"], result["errors"]), (5, 5, []))
+        self.assertEqual(load_checkpoint(self.checkpoint, self.source)[0], 5)
+
+        self.embedded.clear()
+        result = self.ingest()
+        self.assertEqual((result["start_offset"], result["processed"]), (5, 0))
+        self.assertEqual(self.embedded, [])
+
+    def test_failed_embedding_keeps_the_checkpoint_before_its_batch(self):
+        self.write_source([f"r{index}.json" for index in range(6)])
+        self.failing = {"r2.json knows Python"}
+
+        with self.assertLogs("pipeline.tasks", "ERROR"):
+            result = self.ingest()
+        self.assertEqual(result["offset"], 2)
+        self.assertEqual(load_checkpoint(self.checkpoint, self.source)[0], 2)
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertFalse(ResumeDocument.objects.filter(file_name="r2.json").exists())
+
+        self.failing.clear()
+        self.embedded.clear()
+        result = self.ingest()
+        self.assertEqual((result["start_offset"], result["offset"], result["errors"]), (2, 6, []))
+        # r3 was written by the first run, so only the failed record and the rest are embedded again.
+        self.assertEqual(result["skipped"], 1)
+        self.assertNotIn("r3.json knows Python", self.embedded)
+        self.assertEqual(ResumeDocument.objects.count(), 6)
+
+    def test_later_record_with_the_same_name_wins(self):
+        self.source.write_text(
+            json.dumps({"file_name": "dup.json", "content": "first version"})
+            + "\n"
+            + json.dumps({"file_name": "dup.json", "content": "second version"})
+            + "\n"
+        )
+        result = self.ingest()
+        self.assertEqual((result["processed"], result["offset"]), (1, 2))
+        self.assertEqual(ResumeDocument.objects.get(file_name="dup.json").content, "second version")
+        self.assertEqual(self.embedded, ["second version"])
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from pipeline import text_cache
+
+
+class TextCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        overrides = override_settings(TEXT_CACHE_ENABLED=True, TEXT_CACHE_PATH=directory / "text.sqlite3")
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+        # Connections are cached per thread; each test gets one to its own file.
+        text_cache._local.__dict__.clear()
+        self.addCleanup(text_cache._local.__dict__.clear)
+
+    def rows(self) -> dict[str, tuple[int, float]]:
+        return {
+            key.split(":", 1)[1]: (size, accessed_at)
+            for key, size, accessed_at in text_cache._connection().execute(
+                "SELECT key, size, accessed_at FROM extracted_text"
+            )
+        }
+
+    def set_accessed_at(self, content_hash: str, accessed_at: float) -> None:
+        text_cache._connection().execute(
+            "UPDATE extracted_text SET accessed_at = ? WHERE key = ?", (accessed_at, text_cache._key(content_hash))
+        )
+
+    def test_round_trip(self):
+        text_cache.put_text("a", "Jane Doe, Python developer", {"pages": 2})
+        self.assertEqual(text_cache.get_text("a"), ("Jane Doe, Python developer", {"pages": 2}))
+        self.assertIsNone(text_cache.get_text("b"))
+
+    def test_replacing_an_entry_keeps_the_running_total(self):
+        text_cache.put_text("a", "short", {})
+        text_cache.put_text("a", "a much longer text " * 50, {})
+        self.assertEqual(text_cache.text_cache_stats(), {"entries": 1, "bytes": self.rows()["a"][0]})
+
+    def test_evicts_least_recently_read_entries(self):
+        # Identical payloads, so every entry has the same size.
+        for content_hash in "abc":
+            text_cache.put_text(content_hash, "same text", {})
+        size = self.rows()["a"][0]
+        for accessed_at, content_hash in enumerate("abc", start=1):
+            self.set_accessed_at(content_hash, accessed_at)
+        # Reading "a" makes "b" the least recently read entry.
+        self.assertIsNotNone(text_cache.get_text("a"))
+
+        with override_settings(TEXT_CACHE_MAX_BYTES=int(size * 3.5)):
+            text_cache.put_text("d", "same text", {})
+
+        self.assertEqual(sorted(self.rows()), ["a", "c", "d"])
+        self.assertEqual(text_cache.text_cache_stats(), {"entries": 3, "bytes": 3 * size})
+
+    def test_reads_refresh_the_access_time_at_most_once_per_interval(self):
+        text_cache.put_text("a", "text", {})
+        recent = self.rows()["a"][1] - 1
+        self.set_accessed_at("a", recent)
+        text_cache.get_text("a")
+        self.assertEqual(self.rows()["a"][1], recent)
+
+        self.set_accessed_at("a", recent - text_cache.TOUCH_INTERVAL)
+        text_cache.get_text("a")
+        self.assertGreater(self.rows()["a"][1], recent)
+
+    def test_corrupt_entry_is_a_miss_and_is_deleted(self):
+        text_cache.put_text("a", "text", {})
+        text_cache.put_text("b", "other text", {})
+        text_cache._connection().execute(
+            "UPDATE extracted_text SET payload = ? WHERE key = ?", (b"not zlib", text_cache._key("a"))
+        )
+        with self.assertLogs("pipeline.text_cache", "WARNING"):
+            self.assertIsNone(text_cache.get_text("a"))
+        self.assertEqual(list(self.rows()), ["b"])
+        self.assertEqual(text_cache.text_cache_stats(), {"entries": 1, "bytes": self.rows()["b"][0]})
+
+    @override_settings(TEXT_CACHE_ENABLED=False)
+    def test_disabled_cache_stores_nothing(self):
+        text_cache.put_text("a", "text", {})
+        self.assertIsNone(text_cache.get_text("a"))
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django.test import SimpleTestCase
+
+from pipeline.views import parse_method
+
+
+class ParseMethodTests(SimpleTestCase):
+    def test_known_methods_are_kept(self):
+        self.assertEqual(parse_method({"method": "RRF"}), "rrf")
+        self.assertEqual(parse_method({"method": "bm25"}), "bm25")
+
+    def test_missing_or_unknown_method_is_vector_search(self):
+        for payload in ({}, {"method": None}, {"method": ""}, {"method": "cosine"}):
+            with self.subTest(payload=payload):
+                self.assertEqual(parse_method(payload), "vector")
@@ -0,0 +1,167 @@
+"""
+Content-addressed cache of text extracted from PDFs, so a file whose bytes were parsed once is never
+handed to PyPDF2 again, whichever name or source it arrives under.
+
+Entries live in one SQLite file (TEXT_CACHE_PATH) shared by every ingestion process, keyed by the
+SHA-256 of the file bytes and stored as zlib-compressed JSON. A one-row table keeps the running
+payload total, and once it exceeds TEXT_CACHE_MAX_BYTES the least recently read entries are
+evicted. The cache is optional at runtime: SQLite errors are logged and extraction simply runs
+uncached, and an entry that no longer decodes is deleted and treated as a miss.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Bump when extraction changes, so entries written by the previous extractor are no longer read.
+EXTRACTOR_VERSION = 1
+# Eviction trims down to this share of TEXT_CACHE_MAX_BYTES, so it does not run on every write.
+EVICT_TO_RATIO = 0.9
+# A read refreshes an entry's access time at most once per this many seconds, so hits rarely take the
+# write lock; eviction order only needs to be roughly least recently used.
+TOUCH_INTERVAL = 3600
+
+_local = threading.local()
+
+
+def _connection() -> sqlite3.Connection:
+    # One connection per thread and process; pool workers fork and must not share the parent's.
+    connection = getattr(_local, "connection", None)
+    if connection is not None and _local.pid == os.getpid():
+        return connection
+    path = Path(settings.TEXT_CACHE_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS extracted_text ("
+        "key TEXT PRIMARY KEY, payload BLOB NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    connection.execute("CREATE INDEX IF NOT EXISTS extracted_text_accessed_idx ON extracted_text (accessed_at)")
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS extracted_text_size (id INTEGER PRIMARY KEY CHECK (id = 1), total INTEGER NOT NULL)"
+    )
+    connection.execute(
+        "INSERT OR IGNORE INTO extracted_text_size (id, total) SELECT 1, COALESCE(SUM(size), 0) FROM extracted_text"
+    )
+    _local.connection, _local.pid = connection, os.getpid()
+    return connection
+
+
+def _key(content_hash: str) -> str:
+    return f"{EXTRACTOR_VERSION}:{content_hash}"
+
+
+def get_text(content_hash: str) -> tuple[str, dict[str, object]] | None:
+    """The cached (content, metadata) extracted from the file with this hash, or None."""
+    if not settings.TEXT_CACHE_ENABLED:
+        return None
+    key = _key(content_hash)
+    try:
+        connection = _connection()
+        row = connection.execute("SELECT payload, accessed_at FROM extracted_text WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        payload, accessed_at = row
+        now = time.time()
+        if now - accessed_at >= TOUCH_INTERVAL:
+            connection.execute("UPDATE extracted_text SET accessed_at = ? WHERE key = ?", (now, key))
+    except sqlite3.Error as exc:
+        logger.warning("Extracted-text cache unavailable: %s", exc)
+        return None
+    try:
+        entry = json.loads(zlib.decompress(payload))
+        return entry["content"], entry["metadata"]
+    except (zlib.error, ValueError, KeyError, TypeError) as exc:
+        logger.warning("Discarding corrupt extracted-text cache entry %s: %s", content_hash, exc)
+        _discard(key)
+        return None
+
+
+def _discard(key: str) -> None:
+    try:
+        connection = _connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT size FROM extracted_text WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                connection.execute("DELETE FROM extracted_text WHERE key = ?", (key,))
+                connection.execute("UPDATE extracted_text_size SET total = total - ? WHERE id = 1", (row[0],))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    except sqlite3.Error as exc:
+        logger.warning("Extracted-text cache unavailable: %s", exc)
+
+
+def put_text(content_hash: str, content: str, metadata: dict[str, object]) -> None:
+    if not settings.TEXT_CACHE_ENABLED:
+        return
+    payload = zlib.compress(json.dumps({"content": content, "metadata": metadata}).encode("utf-8"))
+    try:
+        connection = _connection()
+        # IMMEDIATE takes the write lock up front, so concurrent writers cannot both miss each other's size.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT size FROM extracted_text WHERE key = ?", (_key(content_hash),)).fetchone()
+            replaced = row[0] if row else 0
+            connection.execute(
+                "INSERT OR REPLACE INTO extracted_text (key, payload, size, accessed_at) VALUES (?, ?, ?, ?)",
+                (_key(content_hash), payload, len(payload), time.time()),
+            )
+            connection.execute(
+                "UPDATE extracted_text_size SET total = total + ? WHERE id = 1", (len(payload) - replaced,)
+            )
+            _evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+    except sqlite3.Error as exc:
+        logger.warning("Extracted-text cache unavailable: %s", exc)
+
+
+def _evict(connection: sqlite3.Connection) -> None:
+    (total,) = connection.execute("SELECT total FROM extracted_text_size WHERE id = 1").fetchone()
+    if total <= settings.TEXT_CACHE_MAX_BYTES:
+        return
+    excess = total - int(settings.TEXT_CACHE_MAX_BYTES * EVICT_TO_RATIO)
+    # Oldest first, up to and including the entry that brings the total under the target.
+    connection.execute(
+        """
+        DELETE FROM extracted_text WHERE key IN (
+            SELECT key FROM (
+                SELECT key, SUM(size) OVER (ORDER BY accessed_at, key) - size AS freed_before
+                FROM extracted_text
+            ) WHERE freed_before < ?
+        )
+        """,
+        (excess,),
+    )
+    # Eviction is rare (it trims below the cap), so the total is simply recounted afterwards.
+    connection.execute(
+        "UPDATE extracted_text_size SET total = (SELECT COALESCE(SUM(size), 0) FROM extracted_text) WHERE id = 1"
+    )
+
+
+def text_cache_stats() -> dict[str, int]:
+    try:
+        connection = _connection()
+        (entries,) = connection.execute("SELECT COUNT(*) FROM extracted_text").fetchone()
+        (size,) = connection.execute("SELECT total FROM extracted_text_size WHERE id = 1").fetchone()
+    except sqlite3.Error as exc:
+        logger.warning("Extracted-text cache unavailable: %s", exc)
+        return {"entries": 0, "bytes": 0}
+    return {"entries": entries, "bytes": size}
@@ -1,15 +1,235 @@
+import json
+import math
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from pipeline.async_search import agenerate_embedding, run_db
+from pipeline.cache import acached_results, cached_results, result_cache_key
+from pipeline.embedding_client import EmbeddingUnavailable
+from pipeline.embedding_models import active_embedding_model
+from pipeline.metrics import SEARCH_QUERY_SECONDS, SEARCH_REQUEST_SECONDS
+from pipeline.models import EmbeddingModel
 from pipeline.search_utils import (
+    PageCursor,
+    batch_search_candidates,
     generate_embedding,
+    generate_embeddings,
+    next_cursor,
     search_candidates,
     hybrid_search_candidates,
     bm25_search_candidates,
+    rrf_search_candidates,
+    passage_search_candidates,
+    stream_search_candidates,
 )
 
+EMBEDDING_METHODS = {"vector", "hybrid", "rrf", "passage"}
+# Methods that follow the active EmbeddingModel; passages only carry primary-model embeddings.
+VERSIONED_METHODS = EMBEDDING_METHODS - {"passage"}
+SEARCH_METHODS = EMBEDDING_METHODS | {"bm25"}
+# Lines handed to the event loop per hop when an NDJSON export is streamed under ASGI.
+STREAM_LINES_PER_CHUNK = 100
+
+
+def unavailable_response(exc: EmbeddingUnavailable, response_class=Response):
+    """503 for a query Ollama cannot embed right now; search fails fast instead of queueing."""
+    headers = {"Retry-After": str(max(1, math.ceil(exc.retry_after)))}
+    return response_class({"error": str(exc)}, status=503, headers=headers)
+
+
+def run_search(
+    method: str,
+    query: str,
+    embedding: list[float] | None,
+    limit: int = 10,
+    after: PageCursor | None = None,
+    filters: dict | None = None,
+    embedding_model: EmbeddingModel | None = None,
+) -> list[dict]:
+    with SEARCH_QUERY_SECONDS.labels(method if method in SEARCH_METHODS else "vector").time():
+        return _dispatch_search(method, query, embedding, limit, after, filters, embedding_model)
+
+
+def _dispatch_search(
+    method: str,
+    query: str,
+    embedding: list[float] | None,
+    limit: int,
+    after: PageCursor | None,
+    filters: dict | None,
+    embedding_model: EmbeddingModel | None,
+) -> list[dict]:
+    if method == "bm25":
+        return bm25_search_candidates(query, limit, after=after, filters=filters)
+    if method == "hybrid":
+        return hybrid_search_candidates(
+            query, embedding, limit, after=after, filters=filters, embedding_model=embedding_model
+        )
+    if method == "rrf":
+        return rrf_search_candidates(
+            query, embedding, limit, after=after, filters=filters, embedding_model=embedding_model
+        )
+    if method == "passage":
+        return passage_search_candidates(embedding, limit, after=after, filters=filters)
+    return search_candidates(embedding, limit, after=after, filters=filters, embedding_model=embedding_model)
+
+
+def search_embedding_model(method: str) -> EmbeddingModel | None:
+    """The re-embedding model a request searches with, resolved once so its query and vectors agree."""
+    return active_embedding_model() if method in VERSIONED_METHODS else None
+
+
+def search_cache_key(
+    method: str,
+    query: str,
+    limit: int,
+    after: PageCursor | None,
+    filters: dict,
+    embedding_model: EmbeddingModel | None,
+) -> str:
+    return result_cache_key(
+        method,
+        query,
+        {
+            "limit": limit,
+            "cursor": after.encode(method) if after else None,
+            "filters": filters,
+            "model": embedding_model.name if embedding_model else settings.OLLAMA_EMBED_MODEL,
+            "precision": settings.EMBEDDING_PRECISION,
+        },
+    )
+
+
+def parse_filters(payload) -> dict:
+    """
+    Metadata filters from a search request body: {"location": "Austin", "skills": ["python"]} keeps
+    resumes whose metadata has that location and lists python among its skills.
+    Raises ValueError with a client-facing message on bad input.
+    """
+    filters = payload.get("filters") or {}
+    if not isinstance(filters, dict):
+        raise ValueError("filters must be an object mapping metadata keys to values.")
+    for key, value in filters.items():
+        values = value if isinstance(value, list) else [value]
+        if not all(isinstance(item, (str, int, float, bool)) for item in values):
+            raise ValueError(f"Filter {key!r} must be a string, number, boolean or a list of those.")
+    return filters
+
+
+def parse_batch(payload) -> tuple[list[str], int]:
+    """
+    Read (queries, top_k) from a batch search body: up to SEARCH_BATCH_MAX_QUERIES non-empty query
+    strings and `top_k` results for each (default SEARCH_DEFAULT_PAGE_SIZE, capped at
+    SEARCH_MAX_PAGE_SIZE). Raises ValueError with a client-facing message on bad input.
+    """
+    queries = payload.get("queries")
+    if not isinstance(queries, list) or not queries:
+        raise ValueError("queries must be a non-empty list of strings.")
+    if len(queries) > settings.SEARCH_BATCH_MAX_QUERIES:
+        raise ValueError(f"At most {settings.SEARCH_BATCH_MAX_QUERIES} queries can be sent in one batch.")
+    if not all(isinstance(query, str) and query.strip() for query in queries):
+        raise ValueError("Every query must be a non-empty string.")
+    try:
+        limit = int(payload.get("top_k", settings.SEARCH_DEFAULT_PAGE_SIZE))
+    except (TypeError, ValueError):
+        raise ValueError("top_k must be an integer.") from None
+    if limit < 1:
+        raise ValueError("top_k must be positive.")
+    return [query.strip() for query in queries], min(limit, settings.SEARCH_MAX_PAGE_SIZE)
+
+
+def parse_method(payload) -> str:
+    """The requested search method; unrecognised names are served as vector search, as they always were."""
+    method = (payload.get("method") or "vector").lower()
+    return method if method in SEARCH_METHODS else "vector"
+
+
+def parse_paging(payload, method: str) -> tuple[bool, int, PageCursor | None]:
+    """
+    Read (stream, limit, cursor) from a search request body. JSON pages hold `page_size` rows (capped
+    at SEARCH_MAX_PAGE_SIZE) after `cursor`; `"stream": true` exports up to `limit` rows as NDJSON.
+    Raises ValueError with a client-facing message on bad input.
+    """
+    stream = str(payload.get("stream", "")).lower() in {"1", "true", "yes"}
+    if stream:
+        if method == "hybrid":
+            raise ValueError("The hybrid method cannot be streamed; use rrf.")
+        if payload.get("cursor"):
+            raise ValueError("Streaming exports start from the top; cursor is not supported.")
+        raw_limit, maximum = payload.get("limit", settings.SEARCH_EXPORT_MAX_ROWS), settings.SEARCH_EXPORT_MAX_ROWS
+    else:
+        raw_limit, maximum = payload.get("page_size", settings.SEARCH_DEFAULT_PAGE_SIZE), settings.SEARCH_MAX_PAGE_SIZE
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise ValueError("page_size and limit must be integers.") from None
+    if limit < 1:
+        raise ValueError("page_size and limit must be positive.")
+    cursor = payload.get("cursor")
+    after = PageCursor.decode(str(cursor), method) if cursor else None
+    return stream, min(limit, maximum), after
+
+
+def page_response(method: str, matches: list[dict], limit: int, after: PageCursor | None) -> dict:
+    cursor = next_cursor(matches, limit, after)
+    return {"results": matches, "method": method, "next_cursor": cursor.encode(method) if cursor else None}
+
+
+def _ndjson_lines(
+    method: str,
+    query: str,
+    embedding: list[float] | None,
+    limit: int,
+    filters: dict,
+    embedding_model: EmbeddingModel | None,
+):
+    for result in stream_search_candidates(method, query, embedding, limit, filters, embedding_model):
+        yield json.dumps(result, cls=DjangoJSONEncoder) + "\n"
+
+
+def _next_chunk(lines) -> str:
+    return "".join(islice(lines, STREAM_LINES_PER_CHUNK))
+
+
+async def _aiter_lines(lines):
+    # The generator holds a server-side cursor, so every step must run on the request's sync thread.
+    try:
+        while chunk := await sync_to_async(_next_chunk, thread_sensitive=True)(lines):
+            yield chunk
+    finally:
+        await sync_to_async(lines.close, thread_sensitive=True)()
+
+
+def ndjson_response(
+    request,
+    method: str,
+    query: str,
+    embedding: list[float] | None,
+    limit: int,
+    filters: dict,
+    embedding_model: EmbeddingModel | None = None,
+):
+    """
+    Stream up to `limit` results as newline-delimited JSON. Under ASGI Django would otherwise buffer
+    a synchronous iterator in full, so it is wrapped in an async generator there.
+    """
+    lines = _ndjson_lines(method, query, embedding, limit, filters, embedding_model)
+    content = _aiter_lines(lines) if isinstance(request, ASGIRequest) else lines
+    return StreamingHttpResponse(content, content_type="application/x-ndjson")
+
+
 class CandidateSearchView(APIView):
     authentication_classes = []
     permission_classes = []
@@ -17,26 +237,115 @@ class CandidateSearchView(APIView):
     def get(self, request):
         return render(request, "search.html")
 
+    @SEARCH_REQUEST_SECONDS.labels("search").time()
     def post(self, request):
         query = request.data.get("query") or ""
         query = query.strip()
         if not query:
             return Response({"error": "Query is required."}, status=400)
 
-        method = (request.data.get("method") or "vector").lower()
+        method = parse_method(request.data)
+        try:
+            stream, limit, after = parse_paging(request.data, method)
+            filters = parse_filters(request.data)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        embedding_model = search_embedding_model(method)
+        model_name = embedding_model.name if embedding_model else None
+
+        # A cached page skips the embedding call as well as the ranking query.
+        def search() -> list[dict]:
+            embedding = generate_embedding(query, model_name) if method in EMBEDDING_METHODS else None
+            return run_search(method, query, embedding, limit, after, filters, embedding_model)
 
-        if method == "bm25":
-            matches = bm25_search_candidates(query)
-        elif method == "hybrid":
-            embedding = generate_embedding(query)
-            matches = hybrid_search_candidates(query, embedding)
-        else:
-            embedding = generate_embedding(query)
-            matches = search_candidates(embedding)
+        try:
+            if stream:
+                embedding = generate_embedding(query, model_name) if method in EMBEDDING_METHODS else None
+                return ndjson_response(request._request, method, query, embedding, limit, filters, embedding_model)
+            matches = cached_results(search_cache_key(method, query, limit, after, filters, embedding_model), search)
+        except EmbeddingUnavailable as exc:
+            return unavailable_response(exc)
+
+        return Response(page_response(method, matches, limit, after))
+
+
+class BatchCandidateSearchView(APIView):
+    """
+    Vector search for many queries per request: batched embedding requests and one SQL statement return
+    the `top_k` nearest resumes of every query, in the order the queries were sent.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+
+    @SEARCH_REQUEST_SECONDS.labels("search_batch").time()
+    def post(self, request):
+        try:
+            queries, limit = parse_batch(request.data)
+            filters = parse_filters(request.data)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=400)
+
+        embedding_model = search_embedding_model("vector")
+        try:
+            embeddings = generate_embeddings(queries, embedding_model.name if embedding_model else None)
+        except EmbeddingUnavailable as exc:
+            return unavailable_response(exc)
+        with SEARCH_QUERY_SECONDS.labels("batch").time():
+            matches = batch_search_candidates(embeddings, limit, filters, embedding_model)
 
         return Response(
             {
-                "results": matches,
-                "method": method,
+                "method": "vector",
+                "results": [{"query": query, "results": results} for query, results in zip(queries, matches)],
             }
         )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncCandidateSearchView(View):
+    """
+    Same contract as CandidateSearchView, served natively on the ASGI event loop: the embedding
+    call goes through a shared keep-alive httpx client and the ORM query runs on a bounded pool.
+    """
+
+    async def post(self, request):
+        # The prometheus_client decorator cannot time coroutines, so time the awaited call instead.
+        with SEARCH_REQUEST_SECONDS.labels("search_async").time():
+            return await self._search(request)
+
+    async def _search(self, request):
+        try:
+            payload = json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Request body must be JSON."}, status=400)
+
+        query = (payload.get("query") or "").strip()
+        if not query:
+            return JsonResponse({"error": "Query is required."}, status=400)
+
+        method = parse_method(payload)
+        try:
+            stream, limit, after = parse_paging(payload, method)
+            filters = parse_filters(payload)
+        except ValueError as exc:
+            return JsonResponse({"error": str(exc)}, status=400)
+
+        embedding_model = await run_db(search_embedding_model, method)
+        model_name = embedding_model.name if embedding_model else None
+
+        async def search() -> list[dict]:
+            embedding = await agenerate_embedding(query, model_name) if method in EMBEDDING_METHODS else None
+            return await run_db(run_search, method, query, embedding, limit, after, filters, embedding_model)
+
+        try:
+            if stream:
+                embedding = await agenerate_embedding(query, model_name) if method in EMBEDDING_METHODS else None
+                return ndjson_response(request, method, query, embedding, limit, filters, embedding_model)
+            key = search_cache_key(method, query, limit, after, filters, embedding_model)
+            matches = await acached_results(key, search)
+        except EmbeddingUnavailable as exc:
+            return unavailable_response(exc, JsonResponse)
+
+        return JsonResponse(page_response(method, matches, limit, after))